@@ -0,0 +1,341 @@
+import os
+import json
+import asyncio
+import functools
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import aiohttp
+from utils.logger_util import LoggerUtil
+from utils.api_util import ApiError
+from utils.circuit_breaker import CircuitOpenError
+from publish_status import DEFAULT_BOARD, DEFAULT_INSTAGRAM
+
+class AsyncWisdomPipeline:
+    """
+    생성 → 업로드 → 게시 흐름을 asyncio로 동시에 처리하는 파이프라인
+
+    게시판 업로드는 aiohttp로 처리하고, 렌더링/압축/DB 작업(회로 차단기/속도 제한 상태 기록 포함)은
+    스레드 풀에서 실행해 이벤트 루프를 막지 않는다. 인스타그램 게시는 업로드가 끝난 카드를 모아
+    Graph API 배치 요청(InstagramAPI.post_images_batch)으로 한꺼번에 보낸다.
+    전체 동시 처리 카드 수와 호스트별 연결 수를 각각 제한한다.
+    render_processes를 지정하면 카드 렌더링을 워커 프로세스로 분산하며, 인물 이미지는
+    공유 메모리 저장소(PortraitStore)에서 한 번만 디코딩해 모든 워커가 함께 사용한다.
+    """
+
+    def __init__(self, generator, max_concurrency=None, per_host_limit=None, render_workers=None, publish_instagram=False, render_processes=None):
+        """
+        Args:
+            generator (WisdomCardGenerator): 렌더링/DB/클라이언트 설정을 제공하는 생성기
+            max_concurrency (int): 동시에 처리할 최대 카드 수 (기본값: PIPELINE_MAX_CONCURRENCY 또는 8)
+            per_host_limit (int): 호스트별 최대 동시 연결 수 (기본값: PIPELINE_PER_HOST_LIMIT 또는 4)
+            render_workers (int): 렌더링용 스레드 수 (기본값: CPU 코어 수)
+            publish_instagram (bool): 업로드 후 인스타그램 게시까지 진행할지 여부
+            render_processes (int): 렌더링 워커 프로세스 수, 0이면 스레드에서 렌더링
+                                    (기본값: PIPELINE_RENDER_PROCESSES 또는 0)
+        """
+        self.generator = generator
+        self.max_concurrency = max_concurrency or int(os.getenv("PIPELINE_MAX_CONCURRENCY", "8"))
+        self.per_host_limit = per_host_limit or int(os.getenv("PIPELINE_PER_HOST_LIMIT", "4"))
+        self.render_workers = render_workers or os.cpu_count() or 1
+        self.publish_instagram = publish_instagram
+        if render_processes is None:
+            render_processes = int(os.getenv("PIPELINE_RENDER_PROCESSES", "0"))
+        self.render_processes = render_processes
+        self._render_fn = None
+        self.timeout = aiohttp.ClientTimeout(total=60)
+        self.logger = LoggerUtil().get_logger()
+
+    async def run(self, count):
+        """
+        명언 카드 count장을 동시에 처리
+
+        Args:
+            count (int): 처리할 카드 수
+
+        Returns:
+            list: 카드별 처리 결과 dict 목록
+        """
+        loop = asyncio.get_running_loop()
+        scheduler = self.generator.scheduler
+        # 업스트림이 죽어 있으면 작업을 선점하지 않고 대기열에 남겨둠
+        blocked = await loop.run_in_executor(None, self.generator.blocked_upstream, self.publish_instagram)
+        if blocked:
+            self.logger.warning(f"[{blocked}] 회로 차단 중 - 작업을 대기열에 남겨두고 종료합니다.")
+            return []
+
+        wisdoms = await loop.run_in_executor(None, scheduler.claim_next, count)
+        if not wisdoms:
+            return []
+
+        self.logger.info(f"비동기 파이프라인 시작 - 카드 {len(wisdoms)}장 (동시 {self.max_concurrency}, 호스트별 {self.per_host_limit})")
+
+        store = None
+        process_pool = None
+        if self.render_processes > 0:
+            from portrait_store import PortraitStore, init_render_worker, render_card_bytes
+
+            card_size = self.generator.image_processor.card_size
+            store = PortraitStore.build(size=card_size)
+            process_pool = ProcessPoolExecutor(
+                max_workers=self.render_processes,
+                initializer=init_render_worker,
+                initargs=(store.name, self.generator.get_font_texts(), card_size)
+            )
+            self._render_fn = lambda *args: process_pool.submit(render_card_bytes, *args).result()
+
+        try:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit)
+            with ThreadPoolExecutor(max_workers=self.render_workers) as executor:
+                async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+                    with scheduler.heartbeat(wisdoms):
+                        results = await asyncio.gather(*[
+                            self._process(session, semaphore, executor, wisdom_data)
+                            for wisdom_data in wisdoms
+                        ])
+                        if self.publish_instagram:
+                            results = await self._publish_batch(executor, wisdoms, results)
+        finally:
+            self._render_fn = None
+            if process_pool is not None:
+                process_pool.shutdown()
+            if store is not None:
+                store.close()
+                store.unlink()
+
+        success_count = sum(1 for result in results if result["success"])
+        self.logger.info(f"비동기 파이프라인 완료 - 성공 {success_count}/{len(results)}")
+        return results
+
+    async def _process(self, session, semaphore, executor, wisdom_data):
+        async with semaphore:
+            try:
+                result = await self._process_one(session, executor, wisdom_data)
+            except Exception as e:
+                self.logger.error(f"카드 처리 중 오류 발생 (idx: {wisdom_data.idx}): {e}")
+                result = {"idx": wisdom_data.idx, "success": False, "error": str(e)}
+
+            # 인스타그램에 게시할 카드는 배치 게시 후에 반영
+            if not (self.publish_instagram and result["success"]):
+                await self._finish(executor, wisdom_data, result)
+            return result
+
+    async def _finish(self, executor, wisdom_data, result):
+        """게시 계획 상태 반영 (실패 항목은 다음 실행에서 재시도)"""
+        loop = asyncio.get_running_loop()
+        scheduler = self.generator.scheduler
+        if result["success"]:
+            await loop.run_in_executor(executor, scheduler.complete, wisdom_data)
+            await loop.run_in_executor(executor, self.generator.prerender_pool.discard, wisdom_data.plan_seq)
+        else:
+            await loop.run_in_executor(executor, scheduler.release, wisdom_data)
+
+    async def _process_one(self, session, executor, wisdom_data):
+        loop = asyncio.get_running_loop()
+        generator = self.generator
+        history = generator.post_history
+        author = wisdom_data.author
+
+        # 게시 이력은 목적지별로 기록 (게시판 업로드, 인스타그램 게시)
+        attempt = history.start(wisdom_data.idx, "batch", generator.api_util.upstream)
+
+        # 게시판 업로드 후 인스타그램 게시만 실패했던 명언은 게시판에 다시 올리지 않음
+        uploaded = None
+        if self.publish_instagram:
+            uploaded = await loop.run_in_executor(executor, generator.uploaded_board_card, wisdom_data)
+        if uploaded:
+            if not await loop.run_in_executor(executor, generator.scheduler.mark_rendered, wisdom_data):
+                return {"idx": wisdom_data.idx, "success": False, "error": "임대 만료"}
+            attempt.file_name, attempt.image_url = uploaded
+            result = {"idx": wisdom_data.idx, "success": True, "file_name": uploaded[0], "image_url": uploaded[1]}
+        else:
+            try:
+                result = await self._render_and_upload(session, executor, wisdom_data, author, attempt)
+            except Exception as e:
+                history.record(attempt, False, str(e))
+                raise
+            history.record(attempt, result["success"], result.get("error"))
+            if not result["success"]:
+                return result
+            if self.publish_instagram:
+                await loop.run_in_executor(executor, generator.publish_status.record, wisdom_data.idx, DEFAULT_BOARD, result["file_name"], {
+                    "success": True, "image_url": result["image_url"], "remote_id": attempt.remote_id
+                })
+        if self.publish_instagram:
+            result["attempt"] = attempt
+            return result
+
+        # DB 업데이트
+        updated = await loop.run_in_executor(executor, generator.db_manager.update_wisdom_file, wisdom_data.idx, result["file_name"])
+        if not updated:
+            return dict(result, success=False, error="DB 업데이트 실패")
+
+        return result
+
+    async def _publish_batch(self, executor, wisdoms, results):
+        """
+        게시판 업로드가 끝난 카드를 Graph API 배치 요청으로 한꺼번에 인스타그램에 게시
+
+        Args:
+            executor (ThreadPoolExecutor): DB/게시 요청을 실행할 스레드 풀
+            wisdoms (list): 처리한 PlanItem 목록
+            results (list): wisdoms와 같은 순서의 업로드 결과 목록
+
+        Returns:
+            list: 게시 결과를 반영한 카드별 처리 결과 목록
+        """
+        loop = asyncio.get_running_loop()
+        generator = self.generator
+        instagram_api = generator.instagram_api
+        history = generator.post_history
+        output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), generator.output_dir)
+
+        ready = [i for i, result in enumerate(results) if result["success"]]
+        if not ready:
+            return results
+        attempts = {i: results[i].pop("attempt").fork(instagram_api.upstream) for i in ready}
+
+        # 스토리지가 설정되어 있으면 저장 완료된 스토리지 URL을 사용 (접근성 테스트 생략)
+        posts = []
+        with ExitStack() as stack:
+            for i in ready:
+                stack.enter_context(attempts[i].stage("publish"))
+            for i in ready:
+                image_url = await loop.run_in_executor(executor, generator.publish_to_storage, os.path.join(output_dir, results[i]["file_name"]))
+                if image_url:
+                    instagram_api.mark_committed(image_url)
+                attempts[i].image_url = image_url or results[i]["image_url"]
+                posts.append((attempts[i].image_url, generator._build_caption(wisdoms[i])))
+            try:
+                post_results = await loop.run_in_executor(executor, instagram_api.post_images_batch, posts)
+            except Exception as e:
+                post_results = [{"success": False, "error": f"Instagram 포스팅 중 오류 발생: {e}"}] * len(posts)
+
+        for i, post_result in zip(ready, post_results):
+            wisdom_data = wisdoms[i]
+            attempts[i].remote_id = post_result.get("post_id")
+            history.record(attempts[i], post_result["success"], post_result.get("error"))
+            await loop.run_in_executor(executor, generator.publish_status.record, wisdom_data.idx, DEFAULT_INSTAGRAM, results[i]["file_name"], {
+                "success": post_result["success"], "error": post_result.get("error"),
+                "image_url": attempts[i].image_url, "remote_id": post_result.get("post_id")
+            })
+            if not post_result["success"]:
+                self.logger.error(f"❌ 인스타그램 포스팅 실패 (idx: {wisdom_data.idx}): {post_result['error']}")
+                results[i] = dict(results[i], success=False, error=post_result["error"])
+            elif not await loop.run_in_executor(executor, generator.db_manager.update_wisdom_file, wisdom_data.idx, results[i]["file_name"]):
+                results[i] = dict(results[i], success=False, error="DB 업데이트 실패")
+            else:
+                self.logger.info(f"✨ 인스타그램 포스팅 완료! (Post ID: {post_result['post_id']})")
+                results[i]["post_id"] = post_result["post_id"]
+            await self._finish(executor, wisdom_data, results[i])
+
+        return results
+
+    async def _render_and_upload(self, session, executor, wisdom_data, author, attempt):
+        """카드를 렌더링(또는 사전 렌더링 풀에서 가져와)해 게시판에 업로드"""
+        loop = asyncio.get_running_loop()
+        generator = self.generator
+
+        # 미리 렌더링된 카드가 없으면 렌더링 (CPU 작업은 스레드 풀에서 실행, 이미지는 게시 계획에서 지정)
+        prepared = await loop.run_in_executor(executor, generator.prerender_pool.take, wisdom_data.plan_seq)
+        destination = await loop.run_in_executor(executor, generator.board_image_destination, self.publish_instagram)
+        if prepared:
+            output_filename, compressed = prepared
+            compressed = generator.usable_compressed(compressed, destination)
+        else:
+            render_card = functools.partial(self._render_card, render_fn=self._render_fn)
+            with attempt.stage("render"):
+                output_filename = await loop.run_in_executor(executor, render_card, wisdom_data, author)
+            if not output_filename:
+                return {"idx": wisdom_data.idx, "success": False, "error": "이미지 저장 실패"}
+            compressed = None
+        attempt.file_name = output_filename
+        output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), generator.output_dir, output_filename)
+
+        # 임대를 잃었으면 다른 워커가 게시할 수 있으므로 업로드하지 않음
+        if not await loop.run_in_executor(executor, generator.scheduler.mark_rendered, wisdom_data):
+            return {"idx": wisdom_data.idx, "success": False, "error": "임대 만료"}
+
+        # 업로드
+        upload_result = await self._upload(session, executor, output_path, wisdom_data, author, compressed, attempt, destination)
+        if not upload_result["success"]:
+            self.logger.error(f"이미지 업로드 실패 (idx: {wisdom_data.idx}): {upload_result['error']}")
+            return {"idx": wisdom_data.idx, "success": False, "error": upload_result["error"]}
+        attempt.image_url = upload_result["image_url"]
+        attempt.remote_id = upload_result.get("post_id")
+
+        return {
+            "idx": wisdom_data.idx,
+            "success": True,
+            "file_name": output_filename,
+            "image_url": upload_result["image_url"],
+        }
+
+    def _render_card(self, wisdom_data, author, render_fn=None):
+        """스레드 풀에서 카드 렌더링 (프로파일링 시 카드별 프로파일 저장)"""
+        generator = self.generator
+        image_path = wisdom_data.image_path
+        with generator.profiler.session("render", trace_memory=False, idx=wisdom_data.idx, portrait=image_path):
+            return generator._render_card(wisdom_data, image_path, author, render_fn=render_fn)
+
+    async def _upload(self, session, executor, output_path, wisdom_data, author, compressed, attempt, destination="board"):
+        """
+        ApiUtil과 같은 형식의 요청을 aiohttp로 전송 (압축/업로드 시간과 업로드 크기를 attempt에 기록)
+
+        destination이 instagram이면 게시판 이미지 URL을 인스타그램이 읽어가므로 JPEG로 압축한다.
+        """
+        loop = asyncio.get_running_loop()
+        api_util = self.generator.api_util
+        url = f"{api_util.api_base_url}/board-content"
+
+        try:
+            # 이미지 압축은 CPU 작업이므로 스레드 풀에서 실행 (사전 렌더링 풀의 카드는 압축되어 있음)
+            with attempt.stage("compress" if compressed is None else "upload"):
+                title, form_data = await loop.run_in_executor(
+                    executor,
+                    api_util.build_wisdom_card_request,
+                    output_path,
+                    author,
+                    wisdom_data.wisdom_kr,
+                    wisdom_data.wisdom_en,
+                    wisdom_data.name_kr,
+                    wisdom_data.name_en,
+                    compressed,
+                    destination
+                )
+            attempt.bytes = len(form_data['image[0]'][1])
+
+            # 업로드 시간에는 속도 제한/회로 차단 대기도 포함
+            with attempt.stage("upload"):
+                form = aiohttp.FormData()
+                for key, value in form_data.items():
+                    if value[0] is None:
+                        form.add_field(key, value[1])
+                    else:
+                        form.add_field(key, value[1], filename=value[0], content_type=value[2])
+                form_data.clear()
+
+                await loop.run_in_executor(None, api_util.circuit_breaker.before_call, api_util.upstream)
+                await loop.run_in_executor(None, api_util.rate_limiter.acquire, api_util.upstream)
+                async with session.post(url, data=form, headers=api_util.headers) as response:
+                    await loop.run_in_executor(None, api_util.circuit_breaker.record_response, api_util.upstream, response.status)
+                    await loop.run_in_executor(None, api_util.rate_limiter.update_from_headers, api_util.upstream, response.headers, response.status)
+                    response_text = await response.text(encoding='utf-8')
+                    try:
+                        response_data = json.loads(response_text)
+                    except ValueError:
+                        error_msg = f"JSON 응답 파싱 실패\n제목: {title}\n응답: {response_text}"
+                        self.logger.error(error_msg)
+                        raise ApiError(response.status, error_msg)
+                    return api_util.handle_wisdom_card_response(title, response.status, response_data, response_text)
+
+        except CircuitOpenError as e:
+            self.logger.error(str(e))
+            return {"success": False, "error": str(e)}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await loop.run_in_executor(None, api_util.circuit_breaker.record_failure, api_util.upstream, str(e) or type(e).__name__)
+            error_msg = f"API 요청 중 오류 발생\n저자: {author}\n오류: {str(e) or type(e).__name__}"
+            self.logger.error(error_msg)
+            return {"success": False, "error": error_msg}
+        except ApiError as e:
+            return {"success": False, "error": str(e)}
@@ -1,8 +1,38 @@
 import sqlite3
 import csv
 import os
+import re
+import math
 from datetime import datetime
 from utils.logger_util import LoggerUtil
+from wisdom_snapshot import WisdomSnapshot
+
+# 명언 작업 상태: pending(대기) → claimed(선점) → rendered(렌더링 완료) → uploaded(업로드 완료), 실패 시 failed
+WISDOM_STATUSES = ('pending', 'claimed', 'rendered', 'uploaded', 'failed')
+
+# 유사 명언 판정: 글자 3-gram 자카드 유사도가 기준 이상이면 중복 의심 (WISDOM_DUP_THRESHOLD로 변경)
+DUPLICATE_THRESHOLD = 0.6
+# 유사도를 직접 계산할 FTS 검색 상위 후보 수 (WISDOM_DUP_CANDIDATES로 변경)
+DUPLICATE_CANDIDATES = 20
+
+def normalize_text(text):
+    """비교용 정규화 (소문자, 문장 부호 제거, 공백 하나로)"""
+    return " ".join(re.sub(r'[\W_]+', ' ', (text or '').lower()).split())
+
+def text_trigrams(text):
+    """정규화한 텍스트의 글자 3-gram 집합"""
+    normalized = normalize_text(text)
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+def trigram_similarity(a, b):
+    """두 3-gram 집합의 자카드 유사도 (0~1)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+# 지금부터 ?초 뒤의 시각 (SQL 식). 여러 호스트가 같은 DB를 쓰므로 임대/재시도 시각은 호스트의
+# 로컬 시간대와 관계없이 SQLite의 UTC 시각으로 기록하고 datetime('now')와 비교한다.
+LEASE_DEADLINE_SQL = "datetime('now', '+' || ? || ' seconds')"
 
 class DatabaseManager:
     def __init__(self, db_path='sqlite.db'):
@@ -13,7 +43,12 @@ class DatabaseManager:
             self.db_path = db_path
             
         self.logger = LoggerUtil().get_logger()
+        self.duplicate_threshold = float(os.getenv("WISDOM_DUP_THRESHOLD", str(DUPLICATE_THRESHOLD)))
+        self.duplicate_candidates = int(os.getenv("WISDOM_DUP_CANDIDATES", str(DUPLICATE_CANDIDATES)))
+        self.fts_enabled = False
         self._initialize_database()
+        # 명언 텍스트 조회는 DB 대신 메모리 스냅샷 사용 (명언이 바뀐 경우에만 다시 읽음)
+        self.snapshot = WisdomSnapshot(self.db_path)
 
     def _initialize_database(self):
         """데이터베이스와 테이블 초기화"""
@@ -35,9 +70,17 @@ class DatabaseManager:
                 if cursor.fetchone()[0] == 0:
                     self.logger.info("wisdom_list 테이블 생성 중...")
                     self._create_wisdom_table(cursor)
+                    self._create_fts_index(cursor)
                     self._import_csv_data(cursor)
                     conn.commit()
                     self.logger.info("테이블 생성 및 데이터 임포트 완료")
+                else:
+                    self._create_fts_index(cursor)
+
+                self._migrate_work_status(cursor)
+                self._create_output_counter_table(cursor)
+                self._create_revision_table(cursor)
+                conn.commit()
         
         except sqlite3.Error as e:
             self.logger.error(f"데이터베이스 초기화 중 오류 발생: {e}")
@@ -54,75 +97,422 @@ class DatabaseManager:
             wisdom_kr TEXT,
             file_name TEXT,
             open_yn INTEGER DEFAULT 1,
-            reg_date TEXT
+            reg_date TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            lease_owner TEXT,
+            lease_expires TEXT
         )
         ''')
 
-    def _import_csv_data(self, cursor):
-        """CSV 파일에서 데이터 임포트"""
-        csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wisdom.csv')
+    def _create_fts_index(self, cursor):
+        """
+        명언(한글/영문) 글자 3-gram 전문 검색 색인 (FTS5 trigram) 생성
+
+        wisdom_list를 원본으로 쓰는 외부 콘텐츠 테이블이며 트리거로 동기화한다.
+        SQLite가 FTS5 trigram(3.34 이상)을 지원하지 않으면 경고 후 유사 명언 검사를 끈다.
+        """
+        cursor.execute("SELECT count(name) FROM sqlite_master WHERE type='table' AND name='wisdom_fts'")
+        exists = cursor.fetchone()[0] > 0
+        try:
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS wisdom_fts USING fts5(
+                wisdom_kr, wisdom_en,
+                content='wisdom_list', content_rowid='idx', tokenize='trigram'
+            )
+            ''')
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"FTS5 trigram 색인을 사용할 수 없어 유사 명언 검사를 건너뜁니다: {e}")
+            return
+
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS wisdom_list_fts_insert AFTER INSERT ON wisdom_list BEGIN
+            INSERT INTO wisdom_fts (rowid, wisdom_kr, wisdom_en) VALUES (new.idx, new.wisdom_kr, new.wisdom_en);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS wisdom_list_fts_delete AFTER DELETE ON wisdom_list BEGIN
+            INSERT INTO wisdom_fts (wisdom_fts, rowid, wisdom_kr, wisdom_en) VALUES ('delete', old.idx, old.wisdom_kr, old.wisdom_en);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS wisdom_list_fts_update AFTER UPDATE OF wisdom_kr, wisdom_en ON wisdom_list BEGIN
+            INSERT INTO wisdom_fts (wisdom_fts, rowid, wisdom_kr, wisdom_en) VALUES ('delete', old.idx, old.wisdom_kr, old.wisdom_en);
+            INSERT INTO wisdom_fts (rowid, wisdom_kr, wisdom_en) VALUES (new.idx, new.wisdom_kr, new.wisdom_en);
+        END
+        ''')
+        # 3-gram별 명언 수 (검색할 드문 3-gram 선택용)
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS wisdom_fts_terms USING fts5vocab(wisdom_fts, 'row')")
+        if not exists:
+            # 색인 도입 이전에 쌓인 명언 색인
+            cursor.execute("INSERT INTO wisdom_fts (wisdom_fts) VALUES ('rebuild')")
+        self.fts_enabled = True
+
+    def _migrate_work_status(self, cursor):
+        """작업 상태/임대 컬럼이 없는 기존 wisdom_list에 컬럼과 인덱스 추가"""
+        cursor.execute("PRAGMA table_info(wisdom_list)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'status' not in columns:
+            self.logger.info("wisdom_list에 작업 상태 컬럼 추가 중...")
+            cursor.execute("ALTER TABLE wisdom_list ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'")
+            cursor.execute("ALTER TABLE wisdom_list ADD COLUMN lease_owner TEXT")
+            cursor.execute("ALTER TABLE wisdom_list ADD COLUMN lease_expires TEXT")
+            cursor.execute("UPDATE wisdom_list SET status = 'uploaded' WHERE file_name IS NOT NULL")
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_wisdom_list_status_lease
+        ON wisdom_list (status, lease_expires)
+        ''')
+
+    def _create_output_counter_table(self, cursor):
+        """일자별 출력 파일 번호 테이블 생성"""
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS output_counter (
+            day TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+        ''')
+
+    def _create_revision_table(self, cursor):
+        """
+        명언 변경 번호 테이블과 트리거 생성 (WisdomSnapshot이 다시 읽을지 판단하는 데 사용)
+
+        작업 상태/임대/파일명 변경에는 올라가지 않고, 스냅샷에 담기는 명언 텍스트와 공개 여부가
+        바뀔 때만 올라간다.
+        """
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wisdom_revision (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO wisdom_revision (id, revision) VALUES (1, 0)")
+        for name, event in (
+            ("insert", "INSERT"),
+            ("delete", "DELETE"),
+            ("update", "UPDATE OF name_en, name_kr, wisdom_kr, wisdom_en, open_yn"),
+        ):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS wisdom_list_revision_{name} AFTER {event} ON wisdom_list BEGIN
+                UPDATE wisdom_revision SET revision = revision + 1 WHERE id = 1;
+            END
+            ''')
+
+    def _import_csv_data(self, cursor, csv_path=None):
+        """
+        CSV 파일에서 데이터 임포트
+
+        이미 임포트된 명언(저자와 정규화한 텍스트가 같은 명언)은 건너뛰고, 다른 명언과 유사도가
+        duplicate_threshold 이상인 명언(저자만 다른 같은 명언 포함)은 open_yn = 0(비공개)으로 넣어
+        검토 전까지 게시하지 않는다.
+
+        Args:
+            cursor (sqlite3.Cursor): 트랜잭션 중인 커서
+            csv_path (str): CSV 경로 (기본값: 프로젝트의 wisdom.csv)
+
+        Returns:
+            dict: {"inserted": 추가 수, "skipped": 이미 있어 건너뛴 수,
+                   "flagged": [{"idx", "duplicate_of", "similarity"}, ...] 비공개로 추가한 유사 명언}
+        """
+        csv_path = csv_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wisdom.csv')
+        result = {"inserted": 0, "skipped": 0, "flagged": []}
         if not os.path.exists(csv_path):
             self.logger.warning(f"경고: {csv_path} 파일을 찾을 수 없습니다.")
-            return
+            return result
         
         try:
             with open(csv_path, 'r', encoding='utf-8') as file:
                 csv_reader = csv.reader(file, quoting=csv.QUOTE_MINIMAL)
                 next(csv_reader)  # 헤더 건너뛰기
                 
-                insert_count = 0
                 for row in csv_reader:
-                    if len(row) == 4:  # 모든 필드가 있는 경우에만 삽입
-                        cursor.execute('''
-                        INSERT INTO wisdom_list (name_en, name_kr, wisdom_en, wisdom_kr)
-                        VALUES (?, ?, ?, ?)
-                        ''', (row[0], row[1], row[2], row[3]))
-                        insert_count += 1
+                    if len(row) != 4:  # 모든 필드가 있는 경우에만 삽입
+                        continue
+
+                    # 같은 파일 안의 앞선 행도 트리거로 색인되므로 함께 비교됨
+                    similar = self.find_similar_wisdoms(row[3], row[2], cursor=cursor)
+                    if any(match["exact"] and match["name_en"] == row[0] for match in similar):
+                        result["skipped"] += 1
+                        continue
+
+                    cursor.execute('''
+                    INSERT INTO wisdom_list (name_en, name_kr, wisdom_en, wisdom_kr, open_yn)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''', (row[0], row[1], row[2], row[3], 0 if similar else 1))
+                    result["inserted"] += 1
+                    if similar:
+                        match = similar[0]
+                        result["flagged"].append({"idx": cursor.lastrowid, "duplicate_of": match["idx"], "similarity": match["similarity"]})
+                        self.logger.warning(
+                            f"유사 명언 - 비공개로 추가 (idx: {cursor.lastrowid}, 기존 idx: {match['idx']}, 유사도 {match['similarity']:.2f}): {row[3]}"
+                        )
                 
-                self.logger.info(f"{insert_count}개의 데이터가 임포트되었습니다.")
+                self.logger.info(f"{result['inserted']}개의 데이터가 임포트되었습니다. (중복 {result['skipped']}개 건너뜀, 유사 명언 {len(result['flagged'])}개 비공개)")
+                return result
         
         except Exception as e:
             self.logger.error(f"CSV 데이터 임포트 중 오류 발생: {e}")
             raise
 
+    def import_csv(self, csv_path=None):
+        """
+        CSV에 새로 추가된 명언을 기존 DB에 임포트 (중복은 건너뛰고 유사 명언은 비공개로 추가)
+
+        Args:
+            csv_path (str): CSV 경로 (기본값: 프로젝트의 wisdom.csv)
+
+        Returns:
+            dict: _import_csv_data와 같은 결과, 실패 시 None
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                result = self._import_csv_data(conn.cursor(), csv_path)
+                conn.commit()
+                return result
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"CSV 임포트 오류: {e}")
+            return None
+
+    def find_similar_wisdoms(self, wisdom_kr, wisdom_en=None, threshold=None, limit=None, cursor=None):
+        """
+        기존 명언 중 유사한 명언 검색
+
+        FTS5 trigram 색인에서 입력 명언의 3-gram을 많이(드문 3-gram일수록 높게) 포함한 상위
+        duplicate_candidates개만 가져와 자카드 유사도를 계산하므로, 전체 명언과 일일이 비교하지 않는다.
+        한글/영문 중 더 높은 유사도를 사용한다.
+
+        Args:
+            wisdom_kr (str): 명언(한글)
+            wisdom_en (str): 명언(영문)
+            threshold (float): 유사 판정 기준 (기본값: duplicate_threshold)
+            limit (int): 최대 반환 개수
+            cursor (sqlite3.Cursor): 진행 중인 트랜잭션의 커서 (없으면 새 연결 사용)
+
+        Returns:
+            list: 유사도 내림차순 [{"idx", "similarity", "exact", "name_en", "name_kr", "wisdom_kr", "wisdom_en"}, ...]
+                  (exact는 정규화한 한글 또는 영문 텍스트가 같은 경우), 색인을 쓸 수 없으면 빈 목록
+        """
+        if not self.fts_enabled:
+            return []
+        threshold = self.duplicate_threshold if threshold is None else threshold
+        grams_kr = text_trigrams(wisdom_kr)
+        grams_en = text_trigrams(wisdom_en)
+        if not grams_kr and not grams_en:
+            return []
+
+        if cursor is None:
+            try:
+                with sqlite3.connect(self.db_path, timeout=30) as conn:
+                    return self.find_similar_wisdoms(wisdom_kr, wisdom_en, threshold, limit, conn.cursor())
+            except sqlite3.Error as e:
+                self.logger.error(f"유사 명언 검색 오류: {e}")
+                return []
+
+        # 접두 필터: 유사도가 threshold 이상인 명언은 입력 3-gram 중 가장 드문
+        # len - ceil(threshold * len) + 1개 안에서 반드시 하나 이상을 공유하므로 그것만 검색
+        all_grams = sorted(grams_kr | grams_en)
+        cursor.execute(
+            f"SELECT term, doc FROM wisdom_fts_terms WHERE term IN ({','.join('?' * len(all_grams))})",
+            all_grams
+        )
+        doc_counts = dict(cursor.fetchall())
+        terms = set()
+        for grams in (grams_kr, grams_en):
+            prefix = len(grams) - math.ceil(threshold * len(grams)) + 1
+            terms.update(sorted(grams, key=lambda gram: (doc_counts.get(gram, 0), gram))[:prefix])
+        terms = [gram for gram in terms if doc_counts.get(gram)]
+        if not terms:
+            return []
+        query = " OR ".join(f'"{gram}"' for gram in sorted(terms))
+
+        cursor.execute("""
+            SELECT w.idx, w.name_en, w.name_kr, w.wisdom_kr, w.wisdom_en
+            FROM (SELECT rowid FROM wisdom_fts WHERE wisdom_fts MATCH ? ORDER BY rank LIMIT ?) AS f
+            JOIN wisdom_list AS w ON w.idx = f.rowid
+        """, (query, self.duplicate_candidates))
+        normalized_kr = normalize_text(wisdom_kr)
+        normalized_en = normalize_text(wisdom_en)
+        similar = []
+        for idx, name_en, name_kr, candidate_kr, candidate_en in cursor.fetchall():
+            similarity = max(
+                trigram_similarity(grams_kr, text_trigrams(candidate_kr)),
+                trigram_similarity(grams_en, text_trigrams(candidate_en))
+            )
+            exact = (bool(normalized_kr) and normalized_kr == normalize_text(candidate_kr)) or \
+                    (bool(normalized_en) and normalized_en == normalize_text(candidate_en))
+            if exact or similarity >= threshold:
+                similar.append({
+                    "idx": idx, "similarity": 1.0 if exact else similarity, "exact": exact,
+                    "name_en": name_en, "name_kr": name_kr, "wisdom_kr": candidate_kr, "wisdom_en": candidate_en
+                })
+        similar.sort(key=lambda item: item["similarity"], reverse=True)
+        return similar[:limit] if limit else similar
+
+    def get_wisdom(self, idx):
+        """
+        명언 조회 (메모리 스냅샷)
+
+        Args:
+            idx (int): 명언 번호
+
+        Returns:
+            WisdomRecord: 명언, 없으면 None
+        """
+        return self.snapshot.get(idx)
+
     def get_random_wisdom(self):
+        wisdoms = self.get_random_wisdoms(1)
+        return wisdoms[0] if wisdoms else None
+
+    def get_random_wisdoms(self, limit):
+        """
+        아직 사용되지 않은 명언을 중복 없이 여러 개 조회
+
+        Args:
+            limit (int): 최대 조회 개수
+
+        Returns:
+            list: WisdomRecord 목록 (텍스트는 메모리 스냅샷에서 가져옴)
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT idx, name_en, name_kr, wisdom_kr, wisdom_en
+                    SELECT idx
                     FROM wisdom_list 
-                    WHERE open_yn = 1 AND file_name IS NULL 
+                    WHERE open_yn = 1 AND file_name IS NULL AND status IN ('pending', 'failed')
                     ORDER BY RANDOM() 
-                    LIMIT 1
-                """)
-                result = cursor.fetchone()
-                
-                if result:
-                    return {
-                        'idx': result[0],
-                        'name_en': result[1],
-                        'name_kr': result[2],
-                        'wisdom_kr': result[3],
-                        'wisdom_en': result[4]
-                    }
-                self.logger.warning("조건에 맞는 데이터가 없습니다.")
-                return None
-                
+                    LIMIT ?
+                """, (limit,))
+                rows = cursor.fetchall()
         except sqlite3.Error as e:
             self.logger.error(f"데이터베이스 오류: {e}")
-            return None
+            return []
+
+        if not rows:
+            self.logger.warning("조건에 맞는 데이터가 없습니다.")
+        records = (self.snapshot.get(row[0]) for row in rows)
+        return [record for record in records if record is not None]
+
+    def get_wisdom_texts(self):
+        """
+        카드에 그려질 수 있는 모든 텍스트 조회 (폰트 서브셋 생성용)
+
+        Returns:
+            list: 명언(한글)과 저자 이름 텍스트 목록
+        """
+        return [
+            text
+            for record in self.snapshot.records()
+            for text in (record.wisdom_kr, record.name_kr, record.name_en)
+            if text
+        ]
 
     def update_wisdom_file(self, idx, filename):
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "UPDATE wisdom_list SET file_name = ?, reg_date = ? WHERE idx = ?",
+                    """
+                    UPDATE wisdom_list
+                    SET file_name = ?, reg_date = ?, status = 'uploaded', lease_owner = NULL, lease_expires = NULL
+                    WHERE idx = ?
+                    """,
                     (filename, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), idx)
                 )
                 conn.commit()
                 return True
         except sqlite3.Error as e:
             self.logger.error(f"데이터베이스 업데이트 오류: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def set_wisdom_status(self, idx, status, lease_owner):
+        """
+        임대 중인 명언의 작업 상태 변경 (임대를 가진 워커만 변경 가능)
+
+        Args:
+            idx (int): 명언 번호
+            status (str): 변경할 상태 ('rendered', 'failed' 또는 처리하지 못하고 돌려줄 때 'pending')
+            lease_owner (str): 임대를 가진 워커 ID
+
+        Returns:
+            bool: 변경 성공 여부 (임대가 만료되어 다른 워커가 가져간 경우 False)
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                if status in ('failed', 'pending'):
+                    # 실패했거나 돌려주는 명언은 임대를 풀어 다른 워커가 다시 가져갈 수 있게 함
+                    cursor.execute("""
+                        UPDATE wisdom_list
+                        SET status = ?, lease_owner = NULL, lease_expires = NULL
+                        WHERE idx = ? AND lease_owner = ? AND status IN ('claimed', 'rendered')
+                    """, (status, idx, lease_owner))
+                else:
+                    cursor.execute("""
+                        UPDATE wisdom_list
+                        SET status = ?
+                        WHERE idx = ? AND lease_owner = ? AND status IN ('claimed', 'rendered')
+                    """, (status, idx, lease_owner))
+                conn.commit()
+                return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            self.logger.error(f"작업 상태 변경 오류: {e}")
+            return False
+
+    def renew_leases(self, idx_list, lease_owner, lease_seconds):
+        """
+        임대 중인 명언들의 만료 시각 연장 (하트비트)
+
+        Args:
+            idx_list (list): 명언 번호 목록
+            lease_owner (str): 임대를 가진 워커 ID
+            lease_seconds (int): 지금부터 연장할 시간(초)
+
+        Returns:
+            set: 연장에 성공한 명언 번호 (빠진 번호는 임대를 잃은 것)
+        """
+        if not idx_list:
+            return set()
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    UPDATE wisdom_list
+                    SET lease_expires = {LEASE_DEADLINE_SQL}
+                    WHERE idx IN ({",".join("?" * len(idx_list))})
+                      AND lease_owner = ? AND status IN ('claimed', 'rendered')
+                    RETURNING idx
+                """, (lease_seconds, *idx_list, lease_owner))
+                renewed = {row[0] for row in cursor.fetchall()}
+                conn.commit()
+                return renewed
+        except sqlite3.Error as e:
+            self.logger.error(f"임대 연장 오류: {e}")
+            return set()
+
+    def next_output_sequence(self, day):
+        """
+        일자별 출력 파일 번호를 원자적으로 발급
+
+        여러 프로세스가 동시에 호출해도 같은 번호가 두 번 발급되지 않는다.
+
+        Args:
+            day (str): YYYYMMDD 형식의 날짜
+
+        Returns:
+            int: 0부터 시작하는 일련번호, 실패 시 None
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO output_counter (day, seq) VALUES (?, 0)
+                    ON CONFLICT(day) DO UPDATE SET seq = seq + 1
+                    RETURNING seq
+                ''', (day,))
+                seq = cursor.fetchone()[0]
+                conn.commit()
+                return seq
+        except sqlite3.Error as e:
+            self.logger.error(f"출력 파일 번호 발급 오류: {e}")
+            return None
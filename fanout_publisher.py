@@ -0,0 +1,313 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.image_encoder import is_jpeg_url
+from utils.logger_util import LoggerUtil
+
+# 기존 단일 목적지 설정(BASE_URL, INSTAGRAM_ACCOUNT_ID, INSTAGRAM_ACCESS_TOKEN)을 쓰는 목적지 이름
+DEFAULT_DESTINATION = "default"
+
+def _names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def load_destinations():
+    """
+    환경 변수로 게시 목적지 목록 구성
+
+    FANOUT_BOARDS(기본값 default)의 게시판마다 BOARD_<이름>_URL을, FANOUT_INSTAGRAM_ACCOUNTS
+    (기본값 없음)의 계정마다 INSTAGRAM_<이름>_ACCOUNT_ID, INSTAGRAM_<이름>_ACCESS_TOKEN을 읽는다.
+    default는 기존 BASE_URL, INSTAGRAM_ACCOUNT_ID, INSTAGRAM_ACCESS_TOKEN을 사용한다.
+
+    Returns:
+        list: [{"key": "board:default", "kind": "board", "name": "default", "settings": {...}}, ...]
+
+    Raises:
+        ValueError: 목적지의 주소나 자격 증명이 설정되지 않은 경우
+    """
+    destinations = []
+    for name in _names(os.getenv("FANOUT_BOARDS", DEFAULT_DESTINATION)):
+        if name == DEFAULT_DESTINATION:
+            base_url = os.getenv("BASE_URL")
+        else:
+            base_url = os.getenv(f"BOARD_{name.upper()}_URL")
+        if not base_url:
+            raise ValueError(f"게시판 '{name}'의 주소가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        destinations.append({"key": f"board:{name}", "kind": "board", "name": name, "settings": {"base_url": base_url}})
+
+    for name in _names(os.getenv("FANOUT_INSTAGRAM_ACCOUNTS", "")):
+        prefix = "INSTAGRAM" if name == DEFAULT_DESTINATION else f"INSTAGRAM_{name.upper()}"
+        account_id = os.getenv(f"{prefix}_ACCOUNT_ID")
+        access_token = os.getenv(f"{prefix}_ACCESS_TOKEN")
+        if not account_id or not access_token:
+            raise ValueError(f"인스타그램 계정 '{name}'의 자격 증명이 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        destinations.append({
+            "key": f"instagram:{name}", "kind": "instagram", "name": name,
+            "settings": {"account_id": account_id, "access_token": access_token}
+        })
+    return destinations
+
+class FanoutPublisher:
+    """
+    카드 한 장을 한 번만 렌더링/압축해 설정된 모든 게시판과 인스타그램 계정에 동시에 게시
+
+    게시판 업로드는 같은 압축 바이트를 공유해 동시에 보내고, 인스타그램 계정은 스토리지 URL이 있으면
+    바로, 없으면 처음 성공한 게시판의 이미지 URL로 게시한다. 목적지별 결과는 SQLite
+    publish_status 테이블에 기록되어, 일부 목적지만 실패한 명언을 다시 처리할 때는 이미 게시된
+    목적지를 건너뛴다(단일/배치 모드의 인스타그램 게시와 같은 기록 사용). 모든 목적지가 완료되어야
+    명언을 게시 완료로 처리한다.
+    """
+
+    def __init__(self, generator, destinations=None):
+        """
+        Args:
+            generator (WisdomCardGenerator): 렌더링, 게시 계획, 사전 렌더링 풀을 가진 생성기
+            destinations (list): 게시 목적지 목록 (기본값: load_destinations())
+        """
+        self.generator = generator
+        self.destinations = load_destinations() if destinations is None else destinations
+        self.output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), generator.output_dir)
+        self.logger = LoggerUtil().get_logger()
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+    def _client(self, destination):
+        """목적지 클라이언트 (default는 생성기의 클라이언트를 그대로 사용, 첫 사용 시 생성)"""
+        with self._clients_lock:
+            client = self._clients.get(destination["key"])
+            if client is not None:
+                return client
+
+            default = destination["name"] == DEFAULT_DESTINATION
+            if destination["kind"] == "board":
+                if default:
+                    client = self.generator.api_util
+                else:
+                    from utils.api_util import ApiUtil
+                    client = ApiUtil(base_url=destination["settings"]["base_url"], name=destination["name"])
+            else:
+                if default:
+                    client = self.generator.instagram_api
+                else:
+                    from instagram_post import InstagramAPI
+                    client = InstagramAPI(name=destination["name"], **destination["settings"])
+            self._clients[destination["key"]] = client
+            return client
+
+    def blocked_destinations(self):
+        """회로가 열려 있어 지금 게시할 수 없는 목적지 키 목록"""
+        blocked = []
+        for destination in self.destinations:
+            client = self._client(destination)
+            if client.circuit_breaker.is_open(client.upstream):
+                blocked.append(destination["key"])
+        return blocked
+
+    def _record(self, wisdom_idx, destination_key, file_name, result, attempt):
+        """목적지별 게시 결과 기록 (시도 횟수 누적, 게시 이력에도 시도 한 건으로 기록)"""
+        attempt.image_url = result.get("image_url")
+        attempt.remote_id = result.get("remote_id")
+        self.generator.post_history.record(attempt, result["success"], result.get("error"))
+        self.generator.publish_status.record(wisdom_idx, destination_key, file_name, result)
+
+    def summary(self):
+        """
+        목적지별 게시 상태 집계
+
+        Returns:
+            dict: {목적지 키: {"done": 건수, "failed": 건수}}
+        """
+        return self.generator.publish_status.summary([destination["key"] for destination in self.destinations])
+
+    def publish_next(self):
+        """
+        게시 계획의 다음 명언을 모든 목적지에 게시
+
+        Returns:
+            dict: {"idx": .., "success": 모든 목적지 완료 여부, "destinations": {목적지 키: {"success": .., "error": ..}}},
+                  게시할 항목이 없거나 모든 목적지의 회로가 열려 있으면 None
+        """
+        if not self.destinations:
+            self.logger.error("게시 목적지가 설정되지 않았습니다.")
+            return None
+
+        # 모든 목적지가 죽어 있으면 선점하지 않고 작업을 대기열에 남겨둠
+        blocked = self.blocked_destinations()
+        if len(blocked) == len(self.destinations):
+            self.logger.warning(f"모든 목적지의 회로가 차단 중입니다 ({', '.join(blocked)}) - 작업을 대기열에 남겨둡니다.")
+            return None
+
+        items = self.generator.scheduler.claim_next()
+        if not items:
+            return None
+        wisdom = items[0]
+
+        with self.generator.scheduler.heartbeat(items):
+            with self.generator.profiler.session("fanout", idx=wisdom.idx, portrait=wisdom.image_path) as tags:
+                output_filename, results = self._publish_item(wisdom)
+                success = bool(results) and all(result["success"] for result in results.values())
+                if success and not self.generator.db_manager.update_wisdom_file(wisdom.idx, output_filename):
+                    self.logger.error("DB 업데이트 실패")
+                    success = False
+                tags['success'] = success
+
+        if success:
+            self.generator.scheduler.complete(wisdom)
+            self.generator.prerender_pool.discard(wisdom.plan_seq)
+            self.generator.start_background_refill()
+        else:
+            self.generator.scheduler.release(wisdom)
+        return {"idx": wisdom.idx, "success": success, "destinations": results}
+
+    def _publish_item(self, wisdom):
+        """
+        명언 카드를 한 번 렌더링/압축하고 아직 게시되지 않은 목적지에 동시에 게시
+
+        Returns:
+            tuple: (output 기준 카드 경로, {목적지 키: 결과 dict}), 렌더링 실패 시 (None, {})
+        """
+        previous = self.generator.publish_status.load(wisdom.idx)
+        results = {}
+        pending = []
+        for destination in self.destinations:
+            if previous.get(destination["key"], {}).get("status") == 'done':
+                results[destination["key"]] = {"success": True, "error": None}
+            else:
+                pending.append(destination)
+
+        if not pending:
+            self.logger.info(f"모든 목적지에 이미 게시된 명언입니다 (idx: {wisdom.idx})")
+            file_name = next((row["file_name"] for row in previous.values() if row["file_name"]), None)
+            return file_name, results
+        if results:
+            self.logger.info(f"이미 게시된 목적지는 건너뜁니다: {', '.join(results)}")
+
+        # 카드는 목적지 수와 관계없이 한 번만 렌더링 (미리 렌더링된 카드가 있으면 사용)
+        # 게시 이력은 목적지별로 남기며, 렌더링/압축 시간은 모든 목적지가 공유
+        card = self.generator.post_history.start(wisdom.idx, "fanout", "card")
+        author = wisdom.author
+        prepared = self.generator.prerender_pool.take(wisdom.plan_seq)
+        # 스토리지 없이 인스타그램 계정에도 게시하면 게시판 이미지 URL을 넘기므로 게시판 업로드를 JPEG로 압축
+        destination = self.generator.board_image_destination(any(d["kind"] == "instagram" for d in pending))
+        if prepared:
+            output_filename, compressed = prepared
+            compressed = self.generator.usable_compressed(compressed, destination)
+        else:
+            if not os.path.exists(wisdom.image_path):
+                self.logger.error(f"이미지를 찾을 수 없습니다: {wisdom.image_path}")
+                return None, {}
+            with card.stage("render"):
+                output_filename = self.generator._render_card(wisdom, wisdom.image_path, author)
+            if not output_filename:
+                return None, {}
+            compressed = None
+        card.file_name = output_filename
+        output_path = os.path.join(self.output_path, output_filename)
+
+        # 임대를 잃었으면 다른 워커가 게시할 수 있으므로 업로드하지 않음
+        if not self.generator.scheduler.mark_rendered(wisdom):
+            return None, {}
+
+        boards = [destination for destination in pending if destination["kind"] == "board"]
+        accounts = [destination for destination in pending if destination["kind"] == "instagram"]
+
+        # 게시판 업로드용 압축도 한 번만 (모든 게시판이 같은 바이트를 공유)
+        compress_error = None
+        if boards and compressed is None:
+            try:
+                with card.stage("compress"):
+                    compressed = self.generator.api_util._compress_image(output_path, destination)
+            except Exception as e:
+                compress_error = f"이미지 압축 실패: {e}"
+
+        attempts = {destination["key"]: card.fork(destination["key"]) for destination in pending}
+        for destination in boards:
+            attempts[destination["key"]].bytes = len(compressed[0]) if compressed else None
+        if compress_error:
+            for destination in boards:
+                results[destination["key"]] = {"success": False, "error": compress_error}
+                self._record(wisdom.idx, destination["key"], output_filename, results[destination["key"]], attempts[destination["key"]])
+            boards = []
+
+        # 인스타그램이 읽어갈 URL: 스토리지 URL > 이전에 게시한 게시판의 URL > 이번에 처음 성공한 게시판의 URL
+        image_url = None
+        verified = False
+        if accounts:
+            image_url = self.generator.publish_to_storage(output_path)
+            verified = image_url is not None
+            if not image_url:
+                image_url = next((
+                    row["image_url"] for row in previous.values()
+                    if row["status"] == 'done' and row["image_url"] and is_jpeg_url(row["image_url"])
+                ), None)
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="fanout") as pool:
+            futures = {
+                pool.submit(self._upload_board, destination, wisdom, author, output_path, compressed, attempts[destination["key"]]): destination
+                for destination in boards
+            }
+            waiting = accounts
+            if image_url:
+                futures.update({
+                    pool.submit(self._post_instagram, destination, wisdom, image_url, verified, attempts[destination["key"]]): destination
+                    for destination in accounts
+                })
+                waiting = []
+
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    destination = futures.pop(future)
+                    result = future.result()
+                    results[destination["key"]] = result
+                    self._record(wisdom.idx, destination["key"], output_filename, result, attempts[destination["key"]])
+                    if result["success"]:
+                        self.logger.info(f"[{destination['key']}] 게시 완료")
+                    else:
+                        self.logger.error(f"[{destination['key']}] 게시 실패: {result['error']}")
+
+                    if waiting and result["success"] and result.get("image_url"):
+                        futures.update({
+                            pool.submit(self._post_instagram, account, wisdom, result["image_url"], False, attempts[account["key"]]): account
+                            for account in waiting
+                        })
+                        waiting = []
+
+        for destination in waiting:
+            results[destination["key"]] = {"success": False, "error": "인스타그램에 전달할 JPEG 이미지 URL이 없습니다 (게시판 업로드 실패 또는 이전 게시판 이미지가 JPEG가 아님)."}
+            self._record(wisdom.idx, destination["key"], output_filename, results[destination["key"]], attempts[destination["key"]])
+            self.logger.error(f"[{destination['key']}] 게시 실패: {results[destination['key']]['error']}")
+
+        return output_filename, results
+
+    def _upload_board(self, destination, wisdom, author, output_path, compressed, attempt):
+        """게시판 한 곳에 업로드 (워커 스레드에서 실행)"""
+        try:
+            with attempt.stage("upload"):
+                result = self._client(destination).upload_wisdom_card(
+                    image_path=output_path,
+                    author=author,
+                    wisdom_kr=wisdom.wisdom_kr,
+                    wisdom_en=wisdom.wisdom_en,
+                    name_kr=wisdom.name_kr,
+                    name_en=wisdom.name_en,
+                    compressed=compressed
+                )
+        except Exception as e:
+            return {"success": False, "error": f"게시판 업로드 중 오류 발생: {e}"}
+        if not result["success"]:
+            return {"success": False, "error": result["error"]}
+        return {"success": True, "image_url": result.get("image_url"), "remote_id": result.get("post_id"), "error": None}
+
+    def _post_instagram(self, destination, wisdom, image_url, verified, attempt):
+        """인스타그램 계정 한 곳에 게시 (워커 스레드에서 실행, verified면 URL 접근성 테스트 생략)"""
+        try:
+            client = self._client(destination)
+            if verified:
+                client.mark_committed(image_url)
+            with attempt.stage("publish"):
+                result = client.post_image(image_url, self.generator._build_caption(wisdom))
+        except Exception as e:
+            return {"success": False, "error": f"인스타그램 포스팅 중 오류 발생: {e}"}
+        if not result["success"]:
+            return {"success": False, "error": result["error"]}
+        return {"success": True, "image_url": image_url, "remote_id": result.get("post_id"), "error": None}
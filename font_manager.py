@@ -0,0 +1,173 @@
+import io
+import os
+import string
+import threading
+from collections import OrderedDict
+from PIL import ImageFont
+from utils.logger_util import LoggerUtil
+
+# 명언 외에 카드에 항상 그려지는 문자 (따옴표, 저자 구분자 등)
+BASE_CHARSET = set(string.printable) | set('"“”‘’·…')
+
+# 파일 경로로 연 폰트 객체 하나의 대략적인 메모리 사용량 (FreeType 테이블 로딩분)
+PATH_FONT_COST = 1024 * 1024
+
+class _SharedFontBuffer:
+    """
+    read()가 항상 같은 bytes 객체를 돌려주는 파일 객체
+
+    BytesIO.read()처럼 호출할 때마다 폰트 전체를 복사하지 않도록 한다.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def read(self, *args):
+        return self._data
+
+class FontManager:
+    """
+    크기별 폰트 객체를 재사용하고 필요하면 서브셋 폰트를 메모리에서 제공하는 폰트 관리자
+
+    charset이 주어지면 폰트 파일을 한 번만 읽어 fontTools로 해당 글자만 포함한 서브셋을 만들고,
+    모든 크기의 폰트를 이 데이터로 생성한다. Pillow는 메모리 폰트를 객체마다 복사하므로
+    수 MB짜리 원본 폰트는 파일 경로로 열어 FreeType이 파일을 직접 매핑하도록 둔다.
+    fontTools가 설치되어 있지 않으면 원본 폰트를 사용한다.
+
+    크기별 폰트 캐시는 FONT_CACHE_MB(기본 16MB) 안에서 가장 오래 쓰이지 않은 것부터 정리한다.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FontManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if FontManager._initialized:
+            return
+
+        self.logger = LoggerUtil().get_logger()
+        self.charset = None
+        self._font_bytes = {}
+        self._fonts = OrderedDict()
+        self._fonts_size = 0
+        self.max_cache_bytes = int(os.getenv("FONT_CACHE_MB", "16")) * 1024 * 1024
+        self._lock = threading.Lock()
+
+        FontManager._initialized = True
+
+    def set_charset(self, texts):
+        """
+        서브셋에 포함할 문자 지정 (이미 만들어진 폰트 캐시는 초기화)
+
+        Args:
+            texts (iterable): 카드에 그려질 수 있는 텍스트 목록
+        """
+        charset = set(BASE_CHARSET)
+        for text in texts:
+            if text:
+                charset.update(text)
+
+        with self._lock:
+            if charset == self.charset:
+                return
+            self.charset = charset
+            self._font_bytes.clear()
+            self._fonts.clear()
+            self._fonts_size = 0
+        self.logger.info(f"폰트 서브셋 문자 수: {len(charset)}")
+
+    def get_font(self, font_path, size):
+        """
+        (폰트, 크기)에 해당하는 ImageFont 반환
+
+        Args:
+            font_path (str): 폰트 파일 경로
+            size (int): 폰트 크기
+
+        Returns:
+            ImageFont.FreeTypeFont: 폰트 객체
+        """
+        key = (font_path, size)
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self._fonts.move_to_end(key)
+                return entry[0]
+
+        if self.charset:
+            data = self.get_font_bytes(font_path)
+            font = ImageFont.truetype(_SharedFontBuffer(data), size)
+            cost = len(data)
+        else:
+            font = ImageFont.truetype(font_path, size)
+            cost = PATH_FONT_COST
+
+        with self._lock:
+            if key not in self._fonts:
+                self._fonts[key] = (font, cost)
+                self._fonts_size += cost
+                # 용량 초과 시 오래된 크기부터 정리 (방금 추가한 폰트는 유지)
+                while self._fonts_size > self.max_cache_bytes and len(self._fonts) > 1:
+                    _, (_, old_cost) = self._fonts.popitem(last=False)
+                    self._fonts_size -= old_cost
+            return self._fonts[key][0]
+
+    def get_font_bytes(self, font_path):
+        """
+        폰트 파일 내용 (charset이 지정되어 있으면 서브셋) 반환 (파일당 한 번만 읽음)
+
+        Args:
+            font_path (str): 폰트 파일 경로
+
+        Returns:
+            bytes: 폰트 데이터
+        """
+        data = self._font_bytes.get(font_path)
+        if data is not None:
+            return data
+
+        with self._lock:
+            data = self._font_bytes.get(font_path)
+            if data is None:
+                with open(font_path, 'rb') as f:
+                    data = f.read()
+                if self.charset:
+                    data = self._subset(font_path, data)
+                self._font_bytes[font_path] = data
+        return data
+
+    def _subset(self, font_path, data):
+        """charset에 포함된 글자만 남긴 폰트 생성"""
+        try:
+            from fontTools import subset
+            from fontTools.ttLib import TTFont
+        except ImportError:
+            self.logger.warning("FONT_SUBSET=1이지만 fontTools가 설치되어 있지 않아 원본 폰트를 사용합니다. (pip install fonttools)")
+            return data
+
+        try:
+            options = subset.Options()
+            options.layout_features = ['*']
+            options.name_IDs = ['*']
+            options.notdef_outline = True
+            options.hinting = True
+
+            font = TTFont(io.BytesIO(data))
+            subsetter = subset.Subsetter(options=options)
+            subsetter.populate(unicodes=[ord(char) for char in self.charset])
+            subsetter.subset(font)
+
+            buffer = io.BytesIO()
+            font.save(buffer)
+            subset_data = buffer.getvalue()
+            self.logger.info(
+                f"폰트 서브셋 생성: {os.path.basename(font_path)} "
+                f"({len(data)/1024:.0f}KB -> {len(subset_data)/1024:.0f}KB)"
+            )
+            return subset_data
+        except Exception as e:
+            self.logger.warning(f"폰트 서브셋 생성 실패, 원본 폰트 사용: {font_path} - {e}")
+            return data
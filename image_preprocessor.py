@@ -1,8 +1,10 @@
 import os
-import cv2
-import numpy as np
+
+# OpenCV/NumPy는 임포트 비용이 크므로 실제 처리 함수 안에서 불러온다
 
 def get_edge_color(image):
+    import numpy as np
+
     # 이미지 가장자리 픽셀 추출
     edges = np.concatenate([
         image[0, :],  # 상단 가장자리
@@ -20,6 +22,9 @@ def get_edge_color(image):
     return darkened_color
 
 def maintain_aspect_ratio_resize(image, target_size):
+    import cv2
+    import numpy as np
+
     height, width = image.shape[:2]
     
     # 가로, 세로 중 긴 쪽을 target_size에 맞춤
@@ -32,8 +37,9 @@ def maintain_aspect_ratio_resize(image, target_size):
         new_width = target_size
         new_height = int(height * (target_size / width))
     
-    # 리사이징
-    resized = cv2.resize(image, (new_width, new_height))
+    # 리사이징 (한 번 디코딩한 큰 이미지에서 여러 단계를 만들므로 축소는 INTER_AREA로 계단 현상 방지)
+    interpolation = cv2.INTER_AREA if new_width < width else cv2.INTER_CUBIC
+    resized = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
     
     # 이미지 가장자리의 평균 색상 계산
     background_color = get_edge_color(resized)
@@ -48,7 +54,34 @@ def maintain_aspect_ratio_resize(image, target_size):
     
     return square_img
 
+def build_pyramid(image, sizes):
+    """
+    한 번 디코딩한 이미지로 크기별 흑백 정사각형 이미지를 생성
+
+    Args:
+        image (numpy.ndarray): BGR 원본 이미지
+        sizes (iterable): 정사각형 크기 목록
+
+    Returns:
+        dict: 크기별 BGR(흑백 3채널) 이미지
+    """
+    import cv2
+
+    levels = {}
+    for size in sizes:
+        # 비율 유지하면서 리사이징 (긴 쪽을 size에 맞춤)
+        resized_img = maintain_aspect_ratio_resize(image, size)
+
+        # 흑백 변환 후 3채널로 다시 변환
+        gray_img = cv2.cvtColor(resized_img, cv2.COLOR_BGR2GRAY)
+        levels[size] = cv2.cvtColor(gray_img, cv2.COLOR_GRAY2BGR)
+    return levels
+
 def process_images():
+    import cv2
+    from utils.image_decode import imread_reduced
+    from portrait_pyramid import PortraitPyramid, PYRAMID_SIZES, level_file
+
     # 이미지 디렉토리 경로 설정
     img_dir = 'img'
     source_dir = os.path.join(img_dir, 'source')
@@ -67,6 +100,9 @@ def process_images():
         print(f"'{source_dir}' 디렉토리가 생성되었습니다.")
         return
     
+    pyramid = PortraitPyramid(img_dir)
+    manifest_entries = {}
+
     # 각 인물별로 처리
     for name in target_names:
         # source 디렉토리에서 해당 인물의 이미지 찾기
@@ -75,30 +111,39 @@ def process_images():
                 # 이미지 파일 경로
                 img_path = os.path.join(source_dir, filename)
                 
-                # 이미지 읽기
-                img = cv2.imread(img_path)
+                # 이미지 읽기 (가장 큰 단계 이상이 남는 1/2~1/8 배율로 한 번만 디코딩)
+                img = imread_reduced(img_path, max(PYRAMID_SIZES))
                 if img is None:
                     print(f"'{filename}' 파일을 읽을 수 없습니다.")
                     continue
-                
-                # 비율 유지하면서 리사이징 (긴 쪽을 600px에 맞춤)
-                resized_img = maintain_aspect_ratio_resize(img, 600)
-                
-                # 흑백 변환
-                gray_img = cv2.cvtColor(resized_img, cv2.COLOR_BGR2GRAY)
-                
-                # 3채널로 다시 변환
-                gray_img = cv2.cvtColor(gray_img, cv2.COLOR_GRAY2BGR)
-                
+
+                if max(img.shape[:2]) < max(PYRAMID_SIZES):
+                    print(f"'{filename}' 원본({img.shape[1]}x{img.shape[0]})이 {max(PYRAMID_SIZES)}px보다 작아 큰 단계는 확대됩니다.")
+
                 # 파일 번호 추출 (01, 02, 03)
                 file_num = filename[-6:-4]  # 확장자 제외하고 마지막 두 자리
-                
-                # 인물명으로 된 폴더에 저장
-                output_path = os.path.join(img_dir, name, f"{file_num}.jpg")
-                
-                # 처리된 이미지 저장
-                cv2.imwrite(output_path, gray_img, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                print(f"'{filename}' 처리 완료 -> {output_path}")
+
+                # 텍스트 위치 접미사를 붙여 이름을 바꾼 기존 파일(예: 01_m.jpg)이 있으면 그 이름을 유지
+                author_dir = os.path.join(img_dir, name)
+                existing = sorted(f for f in os.listdir(author_dir) if f.startswith(f"{file_num}_") and f.endswith('.jpg')) if os.path.isdir(author_dir) else []
+                key = f"{name}/{existing[0] if existing else f'{file_num}.jpg'}"
+
+                # 크기별로 저장 (600px은 img/<인물>/<번호>.jpg, 나머지는 img/<인물>/<크기>/<번호>.jpg)
+                levels = {}
+                for size, level_img in build_pyramid(img, PYRAMID_SIZES).items():
+                    relative_path = level_file(key, size)
+                    output_path = os.path.join(img_dir, *relative_path.split('/'))
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                    cv2.imwrite(output_path, level_img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                    levels[str(size)] = relative_path
+
+                manifest_entries[key] = {"source": filename, "levels": levels}
+                print(f"'{filename}' 처리 완료 -> {os.path.join(img_dir, name)} ({', '.join(levels)}px)")
+
+    # 크기별 파일 목록을 매니페스트에 기록
+    if manifest_entries:
+        pyramid.update(manifest_entries)
+        print(f"피라미드 매니페스트 갱신: {pyramid.manifest_path} ({len(manifest_entries)}장)")
 
 if __name__ == '__main__':
     process_images()
@@ -1,11 +1,28 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
 import textwrap
+from font_manager import FontManager
+from portrait_pyramid import PortraitPyramid, BASE_SIZE
 from utils.logger_util import LoggerUtil
 
 class ImageProcessor:
-    def __init__(self):
+    # 레이아웃(텍스트 위치, 줄 간격, 폰트 크기 등)을 바꾸면 올려야 하는 렌더러 버전
+    RENDERER_VERSION = "1"
+
+    def __init__(self, font_texts=None, portrait_store=None, card_size=None):
+        """
+        Args:
+            font_texts (iterable): 지정하면 이 텍스트의 글자만 담은 서브셋 폰트를 사용
+            portrait_store (PortraitStore): 지정하면 인물 이미지를 디코딩하지 않고 공유 메모리에서 사용
+            card_size (int): 카드 한 변 크기(px) (기본값: CARD_SIZE 또는 600)
+        """
         self.logger = LoggerUtil().get_logger()
+        self.portrait_store = portrait_store
+        self.card_size = card_size or int(os.getenv("CARD_SIZE", str(BASE_SIZE)))
+        # 기본 크기 대비 글꼴 크기와 여백 배율
+        self.scale = self.card_size / BASE_SIZE
+        self.pyramid = PortraitPyramid()
+        self._missing_levels = set()
         
         # 폰트 파일 경로 계산
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,13 +34,20 @@ class ImageProcessor:
         if not os.path.exists(self.author_font_path):
             raise FileNotFoundError(f"폰트 파일을 찾을 수 없습니다: {self.author_font_path}")
 
+        self.font_paths = [self.quote_font_path, self.author_font_path]
+
+        # 폰트 파일은 프로세스당 한 번만 읽고, 크기별 폰트 객체는 재사용
+        self.font_manager = FontManager()
+        if font_texts is not None:
+            self.font_manager.set_charset(font_texts)
+
     def get_optimal_font_size(self, text, max_width, max_height, font_path=None, initial_size=60):
         font_size = initial_size
         
         while font_size > 10:  # 최소 폰트 크기는 10
             try:
                 if font_path:
-                    font = ImageFont.truetype(font_path, font_size)
+                    font = self.font_manager.get_font(font_path, font_size)
                 else:
                     font = ImageFont.load_default()
                     return font
@@ -77,30 +101,59 @@ class ImageProcessor:
         font = ImageFont.load_default()
         return font, text
 
+    @property
+    def layout_version(self):
+        """렌더 캐시/매니페스트에 기록할 레이아웃 버전 (기본 크기가 아니면 카드 크기 포함)"""
+        if self.card_size == BASE_SIZE:
+            return self.RENDERER_VERSION
+        return f"{self.RENDERER_VERSION}@{self.card_size}"
+
     def create_card(self, image_path, wisdom_quote, author):
-        # 이미지 열기 및 기본 설정
-        img = Image.open(image_path)
-        filename = os.path.basename(image_path)
+        img = self.card_background(image_path)
+        draw = ImageDraw.Draw(img)
+        
+        # 텍스트 그리기
+        for text, font, position in self.layout_text(image_path, wisdom_quote, author):
+            self._draw_text(draw, text, font, position)
+        
+        return img.convert('RGB')
+
+    def card_background(self, image_path):
+        """인물 이미지에 반투명 검은 레이어를 합성한 카드 배경 (RGBA)"""
+        img = self._open_portrait(image_path)
         
         # 반투명 레이어 생성 및 합성
         overlay = Image.new('RGBA', img.size, (0, 0, 0, 128))
-        img = img.convert('RGBA')
-        img = Image.alpha_composite(img, overlay)
-        
-        draw = ImageDraw.Draw(img)
-        max_text_width = int(img.size[0] * 0.8)
-        max_text_height = int(img.size[1] * 0.5)
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        return Image.alpha_composite(img, overlay)
+
+    def layout_text(self, image_path, wisdom_quote, author):
+        """
+        카드에 그릴 텍스트 줄과 위치 계산 (스틸 카드와 영상 카드가 같은 배치를 사용)
+
+        Args:
+            image_path (str): 인물 이미지 경로 (파일명의 위치 접미사로 텍스트 위치 결정)
+            wisdom_quote (str): 명언
+            author (str): 저자 표기
+
+        Returns:
+            list: [(텍스트, 폰트, (x, y)), ...] 명언 줄 순서대로, 마지막 항목은 저자
+        """
+        filename = os.path.basename(image_path)
+        max_text_width = int(self.card_size * 0.8)
+        max_text_height = int(self.card_size * 0.5)
                 
         # 폰트 설정
         try:
             formatted_quote = f'{wisdom_quote}'
             quote_font, wrapped_quote = self.get_optimal_font_size(
                 formatted_quote, max_text_width, max_text_height, 
-                self.quote_font_path, 60
+                self.quote_font_path, int(60 * self.scale)
             )
             author_font, _ = self.get_optimal_font_size(
                 author, max_text_width, max_text_height, 
-                self.author_font_path, 20
+                self.author_font_path, int(20 * self.scale)
             )
         except Exception as e:
             print(f"폰트 로드 중 오류 발생: {e}")
@@ -111,8 +164,7 @@ class ImageProcessor:
                 author, max_text_width, max_text_height, initial_size=20
             )
 
-        # 텍스트 위치 계산 및 그리기
-        img_width, img_height = img.size
+        # 텍스트 위치 계산
         quote_lines = wrapped_quote.split('\n')
         line_spacing = quote_font.size * 0.3
         
@@ -120,13 +172,35 @@ class ImageProcessor:
         total_quote_height = self._calculate_total_height(quote_font, quote_lines, line_spacing)
         
         # 텍스트 위치 결정
-        quote_y = self._determine_text_position(filename, img_height, total_quote_height)
+        quote_y = self._determine_text_position(filename, self.card_size, total_quote_height)
         
-        # 텍스트 그리기
-        quote_y = self._draw_quote(draw, quote_lines, quote_font, img_width, quote_y, line_spacing)
-        self._draw_author(draw, author, author_font, img_width, quote_y)
-        
-        return img.convert('RGB')
+        items, quote_y = self._layout_quote(quote_lines, quote_font, self.card_size, quote_y, line_spacing)
+        items.append(self._layout_author(author, author_font, self.card_size, quote_y))
+        return items
+
+    def _open_portrait(self, image_path):
+        """
+        카드 크기와 같은 인물 이미지 열기
+
+        공유 메모리 저장소가 있으면 디코딩 없이 사용하고, 없으면 피라미드에서 카드 크기와
+        같은 단계 파일을 연다. 해당 단계가 없을 때만 기본 이미지를 리사이즈한다.
+        """
+        img = None
+        if self.portrait_store is not None:
+            img = self.portrait_store.get(image_path)
+        if img is None:
+            level_path = self.pyramid.resolve(image_path, self.card_size)
+            img = Image.open(level_path or image_path)
+
+        if img.size != (self.card_size, self.card_size):
+            if image_path not in self._missing_levels:
+                self._missing_levels.add(image_path)
+                self.logger.warning(
+                    f"{self.card_size}px 인물 이미지가 없어 리사이즈합니다: {image_path} "
+                    f"(image_preprocessor.py로 피라미드 생성 권장)"
+                )
+            img = img.resize((self.card_size, self.card_size), Image.Resampling.LANCZOS)
+        return img
 
     def _calculate_total_height(self, font, lines, line_spacing):
         total_height = 0
@@ -142,9 +216,11 @@ class ImageProcessor:
             return img_height - int(img_height * 0.8) - total_quote_height
         elif position == 'b':
             return img_height - int(img_height * 0.25) - total_quote_height
-        return (img_height - total_quote_height) // 2 - 30
+        return (img_height - total_quote_height) // 2 - int(30 * self.scale)
 
-    def _draw_quote(self, draw, lines, font, img_width, y_pos, line_spacing):
+    def _layout_quote(self, lines, font, img_width, y_pos, line_spacing):
+        """명언 줄별 (텍스트, 폰트, 위치) 목록과 마지막 줄 아래 y 좌표"""
+        items = []
         for i, line in enumerate(lines):
             # 첫 줄 시작에 쌍따옴표 추가
             if i == 0:
@@ -154,24 +230,25 @@ class ImageProcessor:
             if i == len(lines) - 1:
                 line = f'{line}"'
             
-            bbox = draw.textbbox((0, 0), line, font=font)
+            bbox = font.getbbox(line)
             line_width = bbox[2] - bbox[0]
             line_height = bbox[3] - bbox[1]
             line_x = (img_width - line_width) // 2
-            
-            # 그림자 및 메인 텍스트
-            draw.text((line_x + 2, y_pos + 2), line, fill=(0, 0, 0, 180), font=font)
-            draw.text((line_x, y_pos), line, fill=(255, 255, 255, 255), font=font)
+            items.append((line, font, (line_x, y_pos)))
             y_pos += line_height + line_spacing
-        return y_pos
+        return items, y_pos
 
-    def _draw_author(self, draw, author, font, img_width, quote_y):
+    def _layout_author(self, author, font, img_width, quote_y):
         formatted_author = f"- {author} -"
-        bbox = draw.textbbox((0, 0), formatted_author, font=font)
+        bbox = font.getbbox(formatted_author)
         author_width = bbox[2] - bbox[0]
         author_x = (img_width - author_width) // 2
-        author_y = quote_y + 20
-        
+        author_y = quote_y + int(20 * self.scale)
+        return formatted_author, font, (author_x, author_y)
+
+    def _draw_text(self, draw, text, font, position):
         # 그림자 및 메인 텍스트
-        draw.text((author_x + 2, author_y + 2), formatted_author, fill=(0, 0, 0, 180), font=font)
-        draw.text((author_x, author_y), formatted_author, fill=(255, 255, 255, 255), font=font) 
\ No newline at end of file
+        x, y = position
+        shadow = max(1, round(2 * self.scale))
+        draw.text((x + shadow, y + shadow), text, fill=(0, 0, 0, 180), font=font)
+        draw.text((x, y), text, fill=(255, 255, 255, 255), font=font)
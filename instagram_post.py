@@ -1,24 +1,52 @@
 import os
+import json
 import requests
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 from datetime import datetime
 import time
 from utils.logger_util import LoggerUtil
+from utils.rate_limiter import RateLimiter
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 load_dotenv()
 
+# Graph API 배치 요청 한 번에 담을 수 있는 최대 요청 수
+GRAPH_BATCH_LIMIT = 50
+
 class InstagramAPI:
-    def __init__(self):
-        """Initialize Instagram API with credentials from environment variables"""
-        self.access_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
-        self.account_id = os.getenv("INSTAGRAM_ACCOUNT_ID")
+    def __init__(self, access_token=None, account_id=None, name=None):
+        """
+        Initialize Instagram API with credentials from environment variables
+
+        Args:
+            access_token (str): 액세스 토큰 (기본값: INSTAGRAM_ACCESS_TOKEN 환경 변수)
+            account_id (str): 인스타그램 비즈니스 계정 ID (기본값: INSTAGRAM_ACCOUNT_ID 환경 변수)
+            name (str): 목적지 이름 (여러 계정에 게시할 때 계정별로 속도 제한/회로 차단 상태를 따로 관리)
+        """
+        self.access_token = access_token or os.getenv("INSTAGRAM_ACCESS_TOKEN")
+        self.account_id = account_id or os.getenv("INSTAGRAM_ACCOUNT_ID")
         self.logger = LoggerUtil().get_logger()
         
         if not self.access_token or not self.account_id:
             raise ValueError("Instagram 자격 증명이 설정되지 않았습니다. .env 파일을 확인해주세요.")
         
         self.api_version = "v18.0"
-        self.base_url = f"https://graph.facebook.com/{self.api_version}"
+        # 로컬 가짜 Graph API 서버로 테스트할 때 INSTAGRAM_GRAPH_URL로 변경
+        self.graph_url = os.getenv("INSTAGRAM_GRAPH_URL", "https://graph.facebook.com").rstrip("/")
+        self.base_url = f"{self.graph_url}/{self.api_version}"
+        # 속도 제한 버킷/회로 차단기 이름 (기본 계정은 instagram, 그 외는 instagram:<이름>)
+        self.upstream = f"instagram:{name}" if name else "instagram"
+        self.publish_bucket = f"instagram_publish:{name}" if name else "instagram_publish"
+        self.rate_limiter = RateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.timeout = float(os.getenv("GRAPH_TIMEOUT", "30"))
+        # 스토리지 저장이 끝나 바로 읽을 수 있는 URL (접근성 테스트 생략)
+        self.committed_urls = set()
+
+    def mark_committed(self, image_url):
+        """저장이 완료되어 접근 가능함이 보장된 이미지 URL 등록"""
+        self.committed_urls.add(image_url)
 
     def _test_image_url(self, image_url, max_retries=5, delay=2):
         """
@@ -32,9 +60,20 @@ class InstagramAPI:
         Returns:
             bool: 접근 가능하면 True, 아니면 False
         """
+        if image_url in self.committed_urls:
+            return True
+
         for attempt in range(max_retries):
             try:
-                test_response = requests.head(image_url)
+                # 이미지 호스트가 죽어 있으면 재시도로 시간을 보내지 않고 바로 실패
+                self.circuit_breaker.before_call("image_host")
+            except CircuitOpenError as e:
+                self.logger.error(str(e))
+                return False
+
+            try:
+                test_response = requests.head(image_url, timeout=10)
+                self.circuit_breaker.record_response("image_host", test_response.status_code)
                 self.logger.info(f"시도 {attempt + 1}/{max_retries} - HTTP 상태: {test_response.status_code}")
                 self.logger.info(f"Content-Type: {test_response.headers.get('content-type', 'unknown')}")
                 
@@ -46,6 +85,7 @@ class InstagramAPI:
                     time.sleep(delay)
                     
             except Exception as e:
+                self.circuit_breaker.record_failure("image_host", str(e))
                 self.logger.error(f"시도 {attempt + 1}/{max_retries} - 실패: {str(e)}")
                 if attempt < max_retries - 1:
                     self.logger.info(f"{delay}초 후 재시도...")
@@ -53,36 +93,61 @@ class InstagramAPI:
         
         return False
 
-    def _create_single_media(self, image_url, caption=""):
+    def _graph_request(self, method, url, buckets=None, timeout=None, **kwargs):
         """
-        단일 이미지 미디어 컨테이너 생성
-        
+        Graph API 요청 (회로 차단기, 속도 제한, 타임아웃 적용)
+
         Args:
-            image_url (str): 이미지 URL
-            caption (str): 이미지 설명
-            
+            method (str): HTTP 메서드
+            url (str): 요청 URL
+            buckets (iterable): 차감할 (버킷, 토큰 수) 목록 (기본값: 호출 한도 1회)
+            timeout (float): 요청 타임아웃(초) (기본값: GRAPH_TIMEOUT 또는 30)
+
+        Returns:
+            requests.Response: 응답
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있어 요청을 보내지 않은 경우 (RequestException 하위 클래스)
+            requests.exceptions.RequestException: 연결 오류, 타임아웃 등
+        """
+        # 회로가 열려 있으면 한도 대기도 하지 않고 바로 실패
+        self.circuit_breaker.before_call(self.upstream)
+        for bucket, tokens in buckets or [(self.upstream, 1)]:
+            self.rate_limiter.acquire(bucket, tokens)
+
+        try:
+            response = requests.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.circuit_breaker.record_failure(self.upstream, str(e))
+            raise
+        self.circuit_breaker.record_response(self.upstream, response.status_code)
+        self.rate_limiter.update_from_headers(self.upstream, response.headers, response.status_code)
+        return response
+
+    def _graph_post(self, url, params):
+        """
+        Graph API POST 요청 (액세스 토큰 자동 추가)
+
+        Args:
+            url (str): 요청 URL
+            params (dict): 요청 파라미터 (access_token 제외)
+
         Returns:
             dict: API 응답 데이터
         """
-        self.logger.info(f"이미지 URL 확인: {image_url}")
-        
-        # 이미지 URL 접근성 테스트 (재시도 로직 적용)
-        if not self._test_image_url(image_url):
-            raise Exception("이미지 URL에 접근할 수 없습니다.")
-        
-        container_url = f"{self.base_url}/{self.account_id}/media"
-        container_params = {
-            "access_token": self.access_token,
-            "image_url": image_url,
-            "caption": caption
-        }
-        
+        params = dict(params, access_token=self.access_token)
+
         self.logger.info("Instagram API 요청:")
-        self.logger.info(f"URL: {container_url}")
-        self.logger.info("Parameters:", {k: v if k != 'access_token' else '****' for k, v in container_params.items()})
+        self.logger.info(f"URL: {url}")
+        self.logger.info(f"Parameters: { {k: v if k != 'access_token' else '****' for k, v in params.items()} }")
         
+        # 요청 한도 확보 (게시 요청은 콘텐츠 게시 한도도 함께 차감)
+        buckets = [(self.upstream, 1)]
+        if url.endswith("/media_publish"):
+            buckets.append((self.publish_bucket, 1))
+
         try:
-            response = requests.post(container_url, params=container_params)
+            response = self._graph_request("POST", url, buckets=buckets, params=params)
             self.logger.info(f"\nAPI 응답 상태 코드: {response.status_code}")
             
             if response.status_code != 200:
@@ -99,12 +164,13 @@ class InstagramAPI:
                 self.logger.error(f"에러 응답: {e.response.text}")
             raise
 
-    def _create_carousel_item(self, image_url):
+    def _create_single_media(self, image_url, caption=""):
         """
-        캐러셀 아이템 생성
+        단일 이미지 미디어 컨테이너 생성
         
         Args:
             image_url (str): 이미지 URL
+            caption (str): 이미지 설명
             
         Returns:
             dict: API 응답 데이터
@@ -115,34 +181,10 @@ class InstagramAPI:
         if not self._test_image_url(image_url):
             raise Exception("이미지 URL에 접근할 수 없습니다.")
         
-        container_url = f"{self.base_url}/{self.account_id}/media"
-        container_params = {
-            "access_token": self.access_token,
+        return self._graph_post(f"{self.base_url}/{self.account_id}/media", {
             "image_url": image_url,
-            "is_carousel_item": True
-        }
-        
-        self.logger.info("Instagram API 요청:")
-        self.logger.info(f"URL: {container_url}")
-        self.logger.info("Parameters:", {k: v if k != 'access_token' else '****' for k, v in container_params.items()})
-        
-        try:
-            response = requests.post(container_url, params=container_params)
-            self.logger.info(f"\nAPI 응답 상태 코드: {response.status_code}")
-            
-            if response.status_code != 200:
-                self.logger.error(f"에러 응답: {response.text}")
-            else:
-                self.logger.info(f"성공 응답: {response.json()}")
-                
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"\nAPI 요청 실패: {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                self.logger.error(f"에러 응답: {e.response.text}")
-            raise
+            "caption": caption
+        })
 
     def _create_carousel_container(self, children_ids, caption=""):
         """
@@ -155,35 +197,11 @@ class InstagramAPI:
         Returns:
             dict: API 응답 데이터
         """
-        container_url = f"{self.base_url}/{self.account_id}/media"
-        container_params = {
-            "access_token": self.access_token,
+        return self._graph_post(f"{self.base_url}/{self.account_id}/media", {
             "media_type": "CAROUSEL",
             "children": ",".join(children_ids),
             "caption": caption
-        }
-        
-        self.logger.info("Instagram API 요청:")
-        self.logger.info(f"URL: {container_url}")
-        self.logger.info("Parameters:", {k: v if k != 'access_token' else '****' for k, v in container_params.items()})
-        
-        try:
-            response = requests.post(container_url, params=container_params)
-            self.logger.info(f"\nAPI 응답 상태 코드: {response.status_code}")
-            
-            if response.status_code != 200:
-                self.logger.error(f"에러 응답: {response.text}")
-            else:
-                self.logger.info(f"성공 응답: {response.json()}")
-                
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"\nAPI 요청 실패: {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                self.logger.error(f"에러 응답: {e.response.text}")
-            raise
+        })
 
     def _publish_media(self, creation_id):
         """
@@ -195,34 +213,147 @@ class InstagramAPI:
         Returns:
             dict: API 응답 데이터
         """
-        publish_url = f"{self.base_url}/{self.account_id}/media_publish"
-        publish_params = {
-            "access_token": self.access_token,
+        return self._graph_post(f"{self.base_url}/{self.account_id}/media_publish", {
             "creation_id": creation_id
-        }
-        
-        self.logger.info("Instagram API 요청:")
-        self.logger.info(f"URL: {publish_url}")
-        self.logger.info("Parameters:", {k: v if k != 'access_token' else '****' for k, v in publish_params.items()})
-        
+        })
+
+    def refresh_publishing_quota(self):
+        """
+        콘텐츠 게시 한도 사용량을 조회해 속도 제한기에 반영
+
+        Returns:
+            dict: {"quota_usage": 사용량, "quota_total": 한도}, 조회 실패 시 None
+        """
         try:
-            response = requests.post(publish_url, params=publish_params)
-            self.logger.info(f"\nAPI 응답 상태 코드: {response.status_code}")
-            
-            if response.status_code != 200:
-                self.logger.error(f"에러 응답: {response.text}")
-            else:
-                self.logger.info(f"성공 응답: {response.json()}")
-                
+            response = self._graph_request("GET", f"{self.base_url}/{self.account_id}/content_publishing_limit", params={
+                "access_token": self.access_token,
+                "fields": "quota_usage,config"
+            }, timeout=10)
             response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"\nAPI 요청 실패: {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                self.logger.error(f"에러 응답: {e.response.text}")
-            raise
-        
+            data = response.json().get("data", [])
+            if not data:
+                return None
+            quota_usage = int(data[0].get("quota_usage", 0))
+            quota_total = int(data[0].get("config", {}).get("quota_total", 0))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.warning(f"게시 한도 조회 실패: {str(e)}")
+            return None
+
+        if quota_total:
+            self.rate_limiter.sync_quota(self.publish_bucket, quota_usage, quota_total)
+        self.logger.info(f"콘텐츠 게시 한도: {quota_usage}/{quota_total}")
+        return {"quota_usage": quota_usage, "quota_total": quota_total}
+
+    def _execute_batch(self, batch_requests):
+        """
+        Graph API 배치 요청 실행 (최대 50개씩, 게시 요청은 게시 한도 버킷 용량 이하로 나누어 전송)
+
+        Args:
+            batch_requests (list): {"method": "POST", "relative_url": "...", "params": {...}} 목록
+
+        Returns:
+            list: 요청 순서와 같은 순서의 결과 목록.
+                  각 항목은 {"success": True, "data": {...}} 또는 {"success": False, "error": "..."}
+        """
+        # 한 배치의 요청 수만큼 한도를 한 번에 차감하므로 배치 크기는 버킷 용량을 넘지 않아야 함
+        chunk_limit = max(1, min(GRAPH_BATCH_LIMIT, self.rate_limiter.capacity(self.upstream)))
+        publish_limit = max(1, self.rate_limiter.capacity(self.publish_bucket))
+        chunks = []
+        chunk = []
+        publish_count = 0
+        for item in batch_requests:
+            is_publish = item["relative_url"].endswith("/media_publish")
+            if len(chunk) >= chunk_limit or (is_publish and publish_count >= publish_limit):
+                chunks.append(chunk)
+                chunk = []
+                publish_count = 0
+            chunk.append(item)
+            publish_count += is_publish
+        if chunk:
+            chunks.append(chunk)
+
+        results = []
+        for chunk in chunks:
+            batch = [
+                {
+                    "method": item["method"],
+                    "relative_url": f"{self.api_version}/{item['relative_url']}",
+                    "body": urlencode(item.get("params", {}))
+                }
+                for item in chunk
+            ]
+
+            # 배치 안의 요청도 각각 호출 한도에 포함된다
+            buckets = [(self.upstream, len(batch))]
+            publish_count = sum(1 for item in chunk if item["relative_url"].endswith("/media_publish"))
+            if publish_count:
+                buckets.append((self.publish_bucket, publish_count))
+
+            self.logger.info(f"Instagram 배치 요청: {len(batch)}건")
+            try:
+                response = self._graph_request("POST", f"{self.graph_url}/", buckets=buckets, data={
+                    "access_token": self.access_token,
+                    "batch": json.dumps(batch),
+                    "include_headers": "false"
+                })
+                self.logger.info(f"\n배치 응답 상태 코드: {response.status_code}")
+                response.raise_for_status()
+                responses = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # 배치 전체가 실패하면 모든 항목을 실패로 처리
+                self.logger.error(f"\n배치 요청 실패: {str(e)}")
+                results.extend({"success": False, "error": f"배치 요청 실패: {str(e)}"} for _ in chunk)
+                continue
+
+            for i in range(len(chunk)):
+                item = responses[i] if i < len(responses) else None
+                results.append(self._parse_batch_item(item))
+
+        failed = sum(1 for result in results if not result["success"])
+        if failed:
+            self.logger.warning(f"배치 요청 중 {failed}/{len(results)}건 실패")
+        return results
+
+    def _parse_batch_item(self, item):
+        """배치 응답의 개별 항목을 결과 dict로 변환"""
+        # 처리 시간 초과 등으로 응답이 없는 항목은 null로 온다
+        if item is None:
+            return {"success": False, "error": "배치 항목 응답 없음 (시간 초과)"}
+
+        try:
+            body = json.loads(item.get("body") or "{}")
+        except ValueError:
+            body = {}
+
+        if item.get("code") != 200:
+            message = body.get("error", {}).get("message") if isinstance(body.get("error"), dict) else None
+            return {"success": False, "error": message or f"HTTP {item.get('code')}: {item.get('body')}"}
+        return {"success": True, "data": body}
+
+    def _create_carousel_items_batch(self, image_urls):
+        """
+        캐러셀 아이템 여러 개를 배치 요청 한 번으로 생성
+
+        Args:
+            image_urls (list): 이미지 URL 리스트
+
+        Returns:
+            list: 이미지 순서와 같은 순서의 결과 목록 (_execute_batch 참고)
+        """
+        for image_url in image_urls:
+            self.logger.info(f"이미지 URL 확인: {image_url}")
+            if not self._test_image_url(image_url):
+                raise Exception(f"이미지 URL에 접근할 수 없습니다: {image_url}")
+
+        return self._execute_batch([
+            {
+                "method": "POST",
+                "relative_url": f"{self.account_id}/media",
+                "params": {"image_url": image_url, "is_carousel_item": "true"}
+            }
+            for image_url in image_urls
+        ])
+
     def post_image(self, image_paths, caption=None):
         """
         Instagram에 이미지를 포스팅합니다.
@@ -243,14 +374,13 @@ class InstagramAPI:
             if len(image_paths) > 1:
                 self.logger.info(f"캐러셀 이미지 업로드 중... (총 {len(image_paths)}장)")
                 
-                # 각 이미지를 캐러셀 아이템으로 생성
+                # 각 이미지를 캐러셀 아이템으로 생성 (배치 요청 한 번)
                 children_ids = []
-                for i, image_url in enumerate(image_paths, 1):
-                    self.logger.info(f"이미지 {i}/{len(image_paths)} 처리 중...")
-                    response = self._create_carousel_item(image_url)
-                    if "id" not in response:
-                        return {"success": False, "error": f"캐러셀 아이템 {i} 생성 실패"}
-                    children_ids.append(response["id"])
+                item_results = self._create_carousel_items_batch(image_paths)
+                for i, item_result in enumerate(item_results, 1):
+                    if not item_result["success"] or "id" not in item_result["data"]:
+                        return {"success": False, "error": f"캐러셀 아이템 {i} 생성 실패: {item_result.get('error', 'ID 없음')}"}
+                    children_ids.append(item_result["data"]["id"])
                 
                 # 캐러셀 컨테이너 생성
                 self.logger.info("캐러셀 컨테이너 생성 중...")
@@ -289,6 +419,72 @@ class InstagramAPI:
             return {"success": False, "error": f"Instagram 포스팅 중 오류 발생: {error_message}"}
 
 
+    def post_images_batch(self, posts):
+        """
+        여러 게시물을 배치 요청으로 한꺼번에 포스팅 (단일 이미지 게시물)
+
+        컨테이너 생성과 게시를 각각 배치 요청으로 보내며, 일부 항목이 실패해도
+        나머지 항목은 계속 진행한다.
+
+        Args:
+            posts (list): (image_url, caption) 튜플 리스트
+
+        Returns:
+            list: 게시물 순서와 같은 순서의 결과 목록.
+                  각 항목은 {"success": True, "post_id": "..."} 또는 {"success": False, "error": "..."}
+        """
+        results = [None] * len(posts)
+
+        # 서버 기준 게시 한도를 먼저 반영해 한도를 넘는 게시를 미리 대기
+        self.refresh_publishing_quota()
+
+        # 이미지 URL 접근성 테스트
+        pending = []
+        for i, (image_url, caption) in enumerate(posts):
+            if self._test_image_url(image_url):
+                pending.append(i)
+            else:
+                results[i] = {"success": False, "error": f"이미지 URL에 접근할 수 없습니다: {image_url}"}
+
+        # 컨테이너 생성 (배치)
+        self.logger.info(f"미디어 컨테이너 배치 생성 중... (총 {len(pending)}건)")
+        container_results = self._execute_batch([
+            {
+                "method": "POST",
+                "relative_url": f"{self.account_id}/media",
+                "params": {"image_url": posts[i][0], "caption": posts[i][1] or ""}
+            }
+            for i in pending
+        ]) if pending else []
+
+        created = []
+        for i, container_result in zip(pending, container_results):
+            if not container_result["success"] or "id" not in container_result["data"]:
+                results[i] = {"success": False, "error": f"미디어 컨테이너 생성 실패: {container_result.get('error', 'ID 없음')}"}
+            else:
+                created.append((i, container_result["data"]["id"]))
+
+        # 게시 (배치)
+        self.logger.info(f"Instagram에 게시물 배치 발행 중... (총 {len(created)}건)")
+        publish_results = self._execute_batch([
+            {
+                "method": "POST",
+                "relative_url": f"{self.account_id}/media_publish",
+                "params": {"creation_id": creation_id}
+            }
+            for _, creation_id in created
+        ]) if created else []
+
+        for (i, _), publish_result in zip(created, publish_results):
+            if not publish_result["success"] or "id" not in publish_result["data"]:
+                results[i] = {"success": False, "error": f"게시물 발행 실패: {publish_result.get('error', 'ID 없음')}"}
+            else:
+                results[i] = {"success": True, "post_id": publish_result["data"]["id"]}
+
+        success_count = sum(1 for result in results if result["success"])
+        self.logger.info(f"배치 게시 완료: 성공 {success_count}/{len(posts)}")
+        return results
+
 if __name__ == "__main__":
     logger = LoggerUtil().get_logger()
     api = InstagramAPI()
@@ -1,22 +1,48 @@
 import os
-import random
+import io
+import sys
+import argparse
+import subprocess
+import tempfile
 from datetime import datetime
-from image_processor import ImageProcessor
 from database_manager import DatabaseManager
-from instagram_post import InstagramAPI
+from posting_scheduler import PostingScheduler
+from post_history import PostHistory, STAGES
+from prerender_pool import PrerenderPool
+from publish_status import PublishStatus, DEFAULT_BOARD, DEFAULT_INSTAGRAM
+from render_cache import RenderCache
+from render_manifest import RenderManifest
 from dotenv import load_dotenv
+from utils.image_encoder import destination_formats, is_jpeg_url
 from utils.logger_util import LoggerUtil
-from utils.api_util import ApiUtil
+from utils.profile_util import ProfileUtil
+
+# Pillow, requests, OpenCV 등 무거운 모듈은 실제로 필요할 때 불러온다 (cron 1회 실행 시 시작 시간 단축)
 
 load_dotenv()
 
 class WisdomCardGenerator:
-    def __init__(self, output_dir='output'):
+    def __init__(self, output_dir='output', profile=None, db_path='sqlite.db'):
+        """
+        Args:
+            output_dir (str): 카드 저장 디렉토리 (프로젝트 기준 상대 경로 또는 절대 경로)
+            profile (bool): 프로파일링 사용 여부 (기본값: PROFILE 환경 변수)
+            db_path (str): SQLite DB 경로 (부하 테스트 등에서 별도 DB 사용 시 지정)
+        """
         self.output_dir = output_dir
-        self.image_processor = ImageProcessor()
-        self.db_manager = DatabaseManager()
-        self.instagram_api = InstagramAPI()
-        self.api_util = ApiUtil()
+        self.profiler = ProfileUtil(enabled=profile)
+        self._image_processor = None
+        self._instagram_api = None
+        self._api_util = None
+        self._storage = None
+        self._storage_loaded = False
+        self.db_manager = DatabaseManager(db_path)
+        self.scheduler = PostingScheduler(self.db_manager)
+        self.prerender_pool = PrerenderPool(self)
+        self.render_cache = RenderCache(os.path.join(self.output_dir, '.cache'))
+        self.render_manifest = RenderManifest(self.db_manager, self.render_cache)
+        self.post_history = PostHistory(self.db_manager)
+        self.publish_status = PublishStatus(db_path)
         self.base_url = os.getenv("BASE_URL")
         self.logger = LoggerUtil().get_logger()
         
@@ -47,69 +73,312 @@ class WisdomCardGenerator:
                 os.chmod(img_dir, 0o777)
                 self.logger.info(f"'{img_dir}' 디렉토리 권한을 777로 변경했습니다.")
 
-    def generate_and_post(self):
-        """명언 카드를 생성하고 인스타그램에 포스팅"""
-        # 명언 데이터 가져오기
-        self.wisdom_data = self.db_manager.get_random_wisdom()
-        if not self.wisdom_data:
+    @property
+    def image_processor(self):
+        """카드 렌더러 (첫 사용 시 생성)"""
+        if self._image_processor is None:
+            from image_processor import ImageProcessor
+            self._image_processor = ImageProcessor(font_texts=self.get_font_texts())
+        return self._image_processor
+
+    @property
+    def instagram_api(self):
+        """인스타그램 클라이언트 (첫 사용 시 생성 및 자격 증명 확인)"""
+        if self._instagram_api is None:
+            from instagram_post import InstagramAPI
+            self._instagram_api = InstagramAPI()
+        return self._instagram_api
+
+    @property
+    def api_util(self):
+        """게시판 API 클라이언트 (첫 사용 시 생성)"""
+        if self._api_util is None:
+            from utils.api_util import ApiUtil
+            self._api_util = ApiUtil()
+        return self._api_util
+
+    @property
+    def storage(self):
+        """카드 공개용 스토리지 (STORAGE_BACKEND 미설정 시 None, 첫 사용 시 생성)"""
+        if not self._storage_loaded:
+            from utils.storage import get_storage
+            self._storage = get_storage()
+            self._storage_loaded = True
+        return self._storage
+
+    def publish_to_storage(self, output_path):
+        """
+        카드를 스토리지에 저장하고 공개 URL 반환 (인스타그램이 읽어갈 URL)
+
+        Args:
+            output_path (str): 카드 이미지 경로
+
+        Returns:
+            str: 저장이 완료된 공개 URL, 스토리지 미설정/공개 URL 없음/실패 시 None
+        """
+        from utils.storage import StorageError
+
+        if self.storage is None:
+            return None
+        try:
+            stored = self.storage.put_file(output_path)
+        except (StorageError, OSError) as e:
+            self.logger.error(f"스토리지 저장 실패: {e}")
+            return None
+        return stored["url"] if stored["committed"] else None
+
+    def board_image_destination(self, publish_instagram):
+        """
+        게시판 업로드 이미지를 압축할 목적지
+
+        스토리지가 없으면 인스타그램이 게시판 이미지 URL을 읽어가므로, 인스타그램 게시까지
+        진행할 때는 JPEG만 쓰는 instagram 목적지로 압축한다.
+
+        Args:
+            publish_instagram (bool): 인스타그램 게시까지 진행하는지 여부
+
+        Returns:
+            str: board 또는 instagram
+        """
+        return "instagram" if publish_instagram and self.storage is None else "board"
+
+    def uploaded_board_card(self, wisdom_data):
+        """
+        이전 실행에서 게시판 업로드까지 마치고 인스타그램 게시만 실패한 카드
+
+        Args:
+            wisdom_data (PlanItem): 게시할 명언
+
+        Returns:
+            tuple: 인스타그램 게시에 다시 쓸 수 있으면 (output 기준 카드 경로, 게시판 이미지 URL), 아니면 None
+        """
+        row = self.publish_status.load(wisdom_data.idx).get(DEFAULT_BOARD)
+        if not row or row["status"] != 'done' or not row["file_name"]:
+            return None
+        # 스토리지가 있으면 카드 파일을 다시 올리고, 없으면 인스타그램이 게시판의 JPEG URL을 읽어감
+        if self.storage is not None:
+            output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, row["file_name"])
+            if not os.path.exists(output_path):
+                return None
+        elif not row["image_url"] or not is_jpeg_url(row["image_url"]):
+            return None
+        self.logger.info(f"게시판 업로드를 마친 카드입니다 - 인스타그램 게시만 다시 시도합니다 (idx: {wisdom_data.idx})")
+        return row["file_name"], row["image_url"]
+
+    def usable_compressed(self, compressed, destination):
+        """미리 압축해 둔 (이미지 바이트, 포맷)이 목적지 포맷이 아니면 None (다시 압축하도록)"""
+        if compressed and compressed[1] in destination_formats(destination):
+            return compressed
+        return None
+
+    def get_font_texts(self):
+        """FONT_SUBSET=1이면 명언 목록에 쓰인 텍스트 반환 (서브셋 폰트용), 아니면 None"""
+        if os.getenv("FONT_SUBSET", "0") == "1":
+            return self.db_manager.get_wisdom_texts()
+        return None
+
+    def blocked_upstream(self, publish_instagram=False):
+        """
+        회로가 열려 있는 업스트림 이름 (작업을 선점하기 전에 확인해 대기열에 남겨둠)
+
+        Args:
+            publish_instagram (bool): 인스타그램 게시까지 진행하는 경우 Graph API도 확인
+
+        Returns:
+            str: 차단된 업스트림 이름 (board, instagram), 없으면 None
+        """
+        names = ["board", "instagram"] if publish_instagram else ["board"]
+        for name in names:
+            if self.api_util.circuit_breaker.is_open(name):
+                return name
+        return None
+
+    def generate_and_post(self, publish_instagram=False):
+        """
+        명언 카드를 생성해 게시판에 업로드 (publish_instagram이면 인스타그램 게시까지 진행)
+
+        Args:
+            publish_instagram (bool): 업로드 후 인스타그램 게시까지 진행할지 여부
+
+        Returns:
+            bool: 성공 여부
+        """
+        # 업스트림이 죽어 있으면 렌더링하지 않고 작업을 대기열에 남겨둠
+        blocked = self.blocked_upstream(publish_instagram)
+        if blocked:
+            self.logger.warning(f"[{blocked}] 회로 차단 중 - 작업을 대기열에 남겨두고 종료합니다.")
+            return False
+
+        # 게시 계획에서 다음 명언/이미지 가져오기
+        items = self.scheduler.claim_next()
+        if not items:
             return False
+        self.wisdom_data = items[0]
+
+        # 처리하는 동안 임대를 연장해 다른 워커가 가져가지 않도록 함
+        attempt = self.post_history.start(self.wisdom_data.idx, "single")
+        with self.scheduler.heartbeat(items):
+            with self.profiler.session("card", idx=self.wisdom_data.idx, portrait=self.wisdom_data.image_path) as tags:
+                # 게시판 업로드 후 인스타그램 게시만 실패했던 명언은 게시판에 다시 올리지 않음
+                uploaded = self.uploaded_board_card(self.wisdom_data) if publish_instagram else None
+                if uploaded:
+                    attempt.file_name, attempt.image_url = uploaded
+                    success = self.scheduler.mark_rendered(self.wisdom_data)
+                else:
+                    success = self._generate_and_post_item(self.wisdom_data.image_path, attempt, publish_instagram)
+                    self.post_history.record(attempt, success)
+                    if success and publish_instagram:
+                        self.publish_status.record(self.wisdom_data.idx, DEFAULT_BOARD, attempt.file_name, {
+                            "success": True, "image_url": attempt.image_url, "remote_id": attempt.remote_id
+                        })
+                if success and publish_instagram:
+                    success = self._publish_item_to_instagram(attempt)
+                tags['success'] = success
+        if success:
+            self.scheduler.complete(self.wisdom_data)
+            self.prerender_pool.discard(self.wisdom_data.plan_seq)
+            # 다음 게시분은 백그라운드에서 미리 렌더링
+            self.start_background_refill()
+        else:
+            self.scheduler.release(self.wisdom_data)
+        return success
+
+    def start_background_refill(self):
+        """
+        사전 렌더링 풀 보충을 별도 프로세스로 실행 (현재 실행의 종료를 기다리게 하지 않음)
+
+        보충 프로세스는 이 생성기와 같은 DB/output 디렉토리를 사용하며, 풀이 이미 차 있으면 실행하지 않는다.
+        """
+        if self.prerender_pool.size <= 0 or self.prerender_pool.is_full():
+            return
+        try:
+            subprocess.Popen(
+                [
+                    sys.executable, os.path.abspath(__file__), "--refill",
+                    "--db", self.db_manager.db_path,
+                    "--output", self.output_dir
+                ],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError as e:
+            self.logger.warning(f"사전 렌더링 풀 보충 프로세스 실행 실패: {e}")
+
+    def _generate_and_post_item(self, image_path, attempt, publish_instagram=False):
+        """
+        self.wisdom_data 명언으로 카드를 생성하고 업로드
+
+        Args:
+            image_path (str): 인물 이미지 경로
+            attempt (PostAttempt): 단계별 소요 시간과 결과를 기록할 게시 시도
+            publish_instagram (bool): 인스타그램 게시까지 진행하는 경우 (게시판 이미지를 JPEG로 올리고,
+                                      DB 갱신은 인스타그램 게시 후에 진행)
+        """
 
         # 데이터 출력
         self.logger.info("=== 조회된 데이터 ===")
-        self.logger.info(f"idx: {self.wisdom_data['idx']}")
-        self.logger.info(f"영문 이름: {self.wisdom_data['name_en']}")
-        self.logger.info(f"한글 이름: {self.wisdom_data['name_kr']}")
-        self.logger.info(f"명언(한글): {self.wisdom_data['wisdom_kr']}")
-        self.logger.info(f"명언(영문): {self.wisdom_data['wisdom_en']}")
+        self.logger.info(f"idx: {self.wisdom_data.idx}")
+        self.logger.info(f"영문 이름: {self.wisdom_data.name_en}")
+        self.logger.info(f"한글 이름: {self.wisdom_data.name_kr}")
+        self.logger.info(f"명언(한글): {self.wisdom_data.wisdom_kr}")
+        self.logger.info(f"명언(영문): {self.wisdom_data.wisdom_en}")
         self.logger.info("==================")
 
-        # 이미지 선택 및 생성
-        image_path = self._get_random_image(self.wisdom_data['name_en'])
-        if not image_path:
-            return False
-        self.logger.info(f"선택된 이미지: {image_path}")
-
         # 저자 정보 포매팅
-        author = f"{self.wisdom_data['name_kr']} {self.wisdom_data['name_en']}"
-
-        # 카드 생성
-        self.logger.info("이미지 생성 중...")
-        img = self.image_processor.create_card(
-            image_path, 
-            self.wisdom_data['wisdom_kr'],
-            author
-        )
+        author = self.wisdom_data.author
 
-        # 파일 저장
-        output_filename = self._save_image(img)
-        if not output_filename:
-            return False
+        # 미리 렌더링된 카드가 있으면 업로드만 진행
+        destination = self.board_image_destination(publish_instagram)
+        prepared = self.prerender_pool.take(self.wisdom_data.plan_seq)
+        if prepared:
+            output_filename, compressed = prepared
+            compressed = self.usable_compressed(compressed, destination)
+        else:
+            # 이미지 확인
+            if not os.path.exists(image_path):
+                attempt.error = f"이미지를 찾을 수 없습니다: {image_path}"
+                self.logger.error(attempt.error)
+                return False
+            self.logger.info(f"선택된 이미지: {image_path}")
+
+            # 카드 생성 및 저장
+            with attempt.stage("render"):
+                output_filename = self._render_card(self.wisdom_data, image_path, author)
+            if not output_filename:
+                attempt.error = "카드 생성 실패"
+                return False
+            compressed = None
 
+        attempt.file_name = output_filename
         output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, output_filename)
         self.logger.info(f"이미지 저장 완료: {output_path}")
 
+        # 임대를 잃었으면 다른 워커가 게시할 수 있으므로 업로드하지 않음
+        if not self.scheduler.mark_rendered(self.wisdom_data):
+            attempt.error = "게시 계획 임대 만료"
+            return False
+
+        # 업로드 크기를 기록하기 위해 압축은 업로드 전에 따로 진행
+        if compressed is None:
+            try:
+                with attempt.stage("compress"):
+                    compressed = self.api_util._compress_image(output_path, destination)
+            except Exception as e:
+                attempt.error = f"이미지 처리 실패: {output_path} - {e}"
+                return False
+        attempt.bytes = len(compressed[0])
+
         # API를 통해 이미지 업로드
-        upload_result = self.api_util.upload_wisdom_card(
-            image_path=output_path,
-            author=author,
-            wisdom_kr=self.wisdom_data['wisdom_kr'],
-            wisdom_en=self.wisdom_data['wisdom_en'],
-            name_kr=self.wisdom_data['name_kr'],
-            name_en=self.wisdom_data['name_en']
-        )
+        with attempt.stage("upload"):
+            upload_result = self.api_util.upload_wisdom_card(
+                image_path=output_path,
+                author=author,
+                wisdom_kr=self.wisdom_data.wisdom_kr,
+                wisdom_en=self.wisdom_data.wisdom_en,
+                name_kr=self.wisdom_data.name_kr,
+                name_en=self.wisdom_data.name_en,
+                compressed=compressed
+            )
 
         if not upload_result["success"]:
+            attempt.error = upload_result['error']
             self.logger.error(f"이미지 업로드 실패: {upload_result['error']}")
             return False
+        attempt.image_url = upload_result.get("image_url")
+        attempt.remote_id = upload_result.get("post_id")
+        if publish_instagram:
+            return True
 
         # DB 업데이트
-        if not self.db_manager.update_wisdom_file(self.wisdom_data['idx'], output_filename):
+        if not self.db_manager.update_wisdom_file(self.wisdom_data.idx, output_filename):
+            attempt.error = "DB 업데이트 실패"
             self.logger.error("DB 업데이트 실패")
             return False
 
         self.logger.info("✨ 명언 카드 생성 및 업로드가 완료되었습니다!")
         return True
 
+    def _publish_item_to_instagram(self, attempt):
+        """
+        게시판에 업로드한 카드를 인스타그램에 게시 (게시 이력은 인스타그램 목적지로 따로 기록)
+
+        Args:
+            attempt (PostAttempt): 게시판 업로드 시도 (파일명과 게시판 이미지 URL 사용)
+
+        Returns:
+            bool: 게시 및 DB 갱신 성공 여부
+        """
+        publish_attempt = attempt.fork(self.instagram_api.upstream)
+        with publish_attempt.stage("publish"):
+            success = self._post_to_instagram(attempt.image_url, attempt.file_name)
+        error = None if success else "인스타그램 포스팅 실패"
+        self.post_history.record(publish_attempt, success, error)
+        self.publish_status.record(self.wisdom_data.idx, DEFAULT_INSTAGRAM, attempt.file_name, {"success": success, "error": error})
+        return success
+
     def _post_to_instagram(self, image_url, output_filename):
         """
         인스타그램에 이미지를 포스팅하고 DB를 업데이트
@@ -122,9 +391,18 @@ class WisdomCardGenerator:
             bool: 포스팅 성공 여부
         """
         try:
-            caption = f"""{self.wisdom_data['name_kr']}의 투자 명언
+            caption = self._build_caption(self.wisdom_data)
 
-#MQ #MoneyQuotient #{self.wisdom_data['name_kr'].replace(" ", "")} #{self.wisdom_data['name_en'].replace(" ", "")} #투자명언 #주식명언 #투자대가 #재테크 #경제공부 #주식 #투자"""
+            # 스토리지에 올린 카드는 저장 완료가 보장되므로 URL 접근성 테스트 없이 게시
+            output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, output_filename)
+            storage_url = self.publish_to_storage(output_path)
+            if storage_url:
+                image_url = storage_url
+                self.instagram_api.mark_committed(image_url)
+            elif not image_url or not is_jpeg_url(image_url):
+                # 게시판 이미지가 WebP 등으로 올라간 경우 (board_image_destination(True)로 압축해야 함)
+                self.logger.error(f"❌ 인스타그램은 JPEG 이미지 URL만 게시할 수 있습니다: {image_url}")
+                return False
 
             self.logger.info("인스타그램 포스팅 시도 중...")
             result = self.instagram_api.post_image(image_url, caption)
@@ -132,7 +410,7 @@ class WisdomCardGenerator:
             if result["success"]:
                 self.logger.info(f"✨ 인스타그램 포스팅 완료! (Post ID: {result['post_id']})")
                 # DB 업데이트
-                if self.db_manager.update_wisdom_file(self.wisdom_data['idx'], output_filename):
+                if self.db_manager.update_wisdom_file(self.wisdom_data.idx, output_filename):
                     self.logger.info("DB 업데이트 완료")
                     return True
             else:
@@ -143,51 +421,376 @@ class WisdomCardGenerator:
             self.logger.error(f"❌ 인스타그램 포스팅 중 오류 발생: {e}")
             return False
 
-    def _get_random_image(self, name_en):
-        image_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', name_en)
+    def generate_and_post_many(self, count, publish_instagram=False):
+        """
+        여러 장의 명언 카드를 비동기 파이프라인으로 동시에 생성/업로드
+
+        Args:
+            count (int): 처리할 카드 수
+            publish_instagram (bool): 업로드 후 인스타그램 게시까지 진행할지 여부
+
+        Returns:
+            list: 카드별 처리 결과 dict 목록
+        """
+        import asyncio
+        from async_pipeline import AsyncWisdomPipeline
+
+        pipeline = AsyncWisdomPipeline(self, publish_instagram=publish_instagram)
+        with self.profiler.session("batch", count=count) as tags:
+            results = asyncio.run(pipeline.run(count))
+            tags['idx_list'] = [result['idx'] for result in results]
+        return results
+
+    def generate_and_post_stream(self, count):
+        """
+        대량 배치를 메모리 사용량이 일정한 스트리밍 파이프라인으로 처리
+
+        Args:
+            count (int): 처리할 카드 수
+
+        Returns:
+            dict: {"total": 처리 수, "success": 성공 수}
+        """
+        from streaming_batch import StreamingBatch
+
+        total = 0
+        success_count = 0
+        for result in StreamingBatch(self).run(count):
+            total += 1
+            if result["success"]:
+                success_count += 1
+            else:
+                self.logger.error(f"카드 처리 실패 (idx: {result['idx']}): {result['error']}")
+        return {"total": total, "success": success_count}
+
+    def generate_and_post_fanout(self, count):
+        """
+        카드마다 한 번만 렌더링/압축해 설정된 모든 게시판과 인스타그램 계정에 동시에 게시
+
+        Args:
+            count (int): 처리할 카드 수
+
+        Returns:
+            dict: {"total": 처리 수, "success": 모든 목적지에 게시된 수, "destinations": 목적지별 누적 상태}
+        """
+        from fanout_publisher import FanoutPublisher
+
+        publisher = FanoutPublisher(self)
+        self.logger.info(f"게시 목적지: {', '.join(destination['key'] for destination in publisher.destinations)}")
+        total = 0
+        success_count = 0
+        for _ in range(count):
+            result = publisher.publish_next()
+            if result is None:
+                break
+            total += 1
+            if result["success"]:
+                success_count += 1
+        return {"total": total, "success": success_count, "destinations": publisher.summary()}
+
+    def generate_videos(self, count):
+        """
+        게시 계획의 다음 명언 count개를 릴스용 영상 카드(MP4)로 생성 (게시 상태는 바꾸지 않음)
+
+        Args:
+            count (int): 생성할 영상 수
+
+        Returns:
+            list: 생성된 영상 경로 목록
+        """
+        from video_card import VideoCardRenderer
+
+        renderer = VideoCardRenderer(self.image_processor)
+        video_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, 'video', datetime.now().strftime('%Y%m%d'))
+        upcoming = self.scheduler.upcoming(count)
+        if len(upcoming) < count and self.scheduler.extend_plan(count - len(upcoming)):
+            upcoming = self.scheduler.upcoming(count)
+
+        paths = []
+        for item in upcoming:
+            if not os.path.exists(item.image_path):
+                self.logger.error(f"이미지를 찾을 수 없습니다: {item.image_path}")
+                continue
+            author = item.author
+            try:
+                with self.profiler.session("video", idx=item.idx, portrait=item.image_path):
+                    result = renderer.render(item.image_path, item.wisdom_kr, author, os.path.join(video_dir, f"{item.idx}.mp4"))
+            except Exception as e:
+                self.logger.error(f"영상 카드 생성 실패 (idx: {item.idx}): {e}")
+                continue
+            paths.append(result['path'])
+        return paths
+
+    def _render_card(self, wisdom_data, image_path, author, render_fn=None):
+        """
+        카드를 렌더링(또는 렌더 캐시에서 조회)하여 output 디렉토리에 저장
+
+        Args:
+            wisdom_data (WisdomRecord): 명언
+            image_path (str): 인물 이미지 경로
+            author (str): 저자 표기
+            render_fn (callable): (image_path, wisdom_quote, author) -> JPEG 바이트.
+                                  지정하면 이 함수로 렌더링 (예: 워커 프로세스)
+
+        Returns:
+            str: output 디렉토리 기준 상대 경로, 실패 시 None
+        """
+        # 입력이 같으면 렌더 캐시에서 제공
+        cache_key = self.render_cache.make_key(
+            image_path,
+            wisdom_data.wisdom_kr,
+            author,
+            self.image_processor.font_paths,
+            self.image_processor.layout_version
+        )
+        image_bytes = self.render_cache.get(cache_key)
+        if image_bytes is None:
+            self.logger.info("이미지 생성 중...")
+            if render_fn is None:
+                img = self.image_processor.create_card(
+                    image_path, 
+                    wisdom_data.wisdom_kr,
+                    author
+                )
+                image_bytes = self._encode_image(img)
+            else:
+                image_bytes = render_fn(image_path, wisdom_data.wisdom_kr, author)
+            self.render_cache.put(cache_key, image_bytes)
+        else:
+            self.logger.info("렌더 캐시 적중 - 이미지 생성을 건너뜁니다.")
+
+        output_filename = self._save_image(image_bytes)
+        if output_filename:
+            # 레이아웃 변경 시 다시 렌더링할 카드를 찾을 수 있도록 입력 기록
+            self.render_manifest.record(
+                output_filename,
+                wisdom_data,
+                image_path,
+                author,
+                self.image_processor.font_paths,
+                self.image_processor.layout_version
+            )
+        return output_filename
+
+    def rerender(self, stale_only=True, processes=None):
+        """
+        렌더 매니페스트에 기록된 카드를 같은 파일명으로 다시 렌더링 (워커 프로세스에서 병렬 처리)
+
+        Args:
+            stale_only (bool): 레이아웃 버전이나 입력(텍스트/인물 이미지/폰트)이 바뀐 카드만 처리
+            processes (int): 렌더링 워커 프로세스 수 (기본값: RERENDER_PROCESSES 또는 CPU 코어 수)
+
+        Returns:
+            dict: {"total": 대상 수, "success": 성공 수}
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from portrait_store import PortraitStore, init_render_worker, render_card_bytes
+
+        font_paths = self.image_processor.font_paths
+        layout_version = self.image_processor.layout_version
+        entries = self.render_manifest.entries(stale_only=stale_only, font_paths=font_paths, layout_version=layout_version)
+        self.logger.info(f"다시 렌더링할 카드: {len(entries)}장")
+        if not entries:
+            return {"total": 0, "success": 0}
+
+        processes = processes or int(os.getenv("RERENDER_PROCESSES", "0")) or os.cpu_count() or 1
+        store = PortraitStore.build(size=self.image_processor.card_size)
+        success_count = 0
         try:
-            image_files = [f for f in os.listdir(image_folder) if f.endswith('.jpg')]
-            if not image_files:
-                self.logger.error(f"이미지를 찾을 수 없습니다: {image_folder}")
-                return None
-            return os.path.join(image_folder, random.choice(image_files))
-        except Exception as e:
-            self.logger.error(f"이미지 선택 중 오류 발생: {e}")
-            return None
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=init_render_worker,
+                initargs=(store.name, self.get_font_texts(), self.image_processor.card_size)
+            ) as pool:
+                futures = {}
+                for entry in entries:
+                    author = entry.author
+                    futures[pool.submit(render_card_bytes, entry.image_path, entry.wisdom_kr, author)] = (entry, author)
 
-    def _save_image(self, img):
+                for future in as_completed(futures):
+                    entry, author = futures[future]
+                    try:
+                        image_bytes = future.result()
+                        self._replace_image(entry.file_name, image_bytes)
+                    except Exception as e:
+                        self.logger.error(f"다시 렌더링 실패: {entry.file_name} - {e}")
+                        continue
+
+                    cache_key = self.render_cache.make_key(entry.image_path, entry.wisdom_kr, author, font_paths, layout_version)
+                    self.render_cache.put(cache_key, image_bytes)
+                    self.render_manifest.record(entry.file_name, entry, entry.image_path, author, font_paths, layout_version)
+                    success_count += 1
+                    self.logger.info(f"다시 렌더링 완료: {entry.file_name} ({', '.join(entry.reasons) or '전체'})")
+        finally:
+            store.close()
+            store.unlink()
+
+        self.logger.info(f"다시 렌더링 완료: {success_count}/{len(entries)}장")
+        return {"total": len(entries), "success": success_count}
+
+    def _replace_image(self, output_filename, image_bytes):
+        """기존 카드 파일을 같은 이름으로 교체 (임시 파일에 쓴 뒤 교체)"""
+        target = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, output_filename)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image_bytes)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _build_caption(self, wisdom_data):
+        """인스타그램 캡션 생성"""
+        return f"""{wisdom_data.name_kr}의 투자 명언
+
+#MQ #MoneyQuotient #{wisdom_data.name_kr.replace(" ", "")} #{wisdom_data.name_en.replace(" ", "")} #투자명언 #주식명언 #투자대가 #재테크 #경제공부 #주식 #투자"""
+
+    def _encode_image(self, img):
+        """카드 이미지를 저장용 JPEG 바이트로 인코딩"""
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=95)
+        return buffer.getvalue()
+
+    def _save_image(self, image_bytes):
+        """
+        카드 이미지를 날짜별 하위 디렉토리에 저장
+
+        파일 번호는 DB의 일자별 카운터에서 발급받고, 임시 파일에 쓴 뒤 하드링크로
+        최종 경로에 연결하므로 여러 프로세스가 동시에 저장해도 덮어쓰지 않는다.
+
+        Args:
+            image_bytes (bytes): 인코딩된 JPEG 데이터
+
+        Returns:
+            str: output 디렉토리 기준 상대 경로 (예: 20240101/20240101_1.jpeg), 실패 시 None
+        """
         try:
             current_date = datetime.now().strftime('%Y%m%d')
-            output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, f"{current_date}.jpeg")
-            
-            # 중복 파일명 처리
-            counter = 1
-            while os.path.exists(output_path):
-                output_path = os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)), 
-                    self.output_dir, 
-                    f"{current_date}_{counter}.jpeg"
-                )
-                counter += 1
+            shard_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.output_dir, current_date)
+            os.makedirs(shard_dir, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(image_bytes)
+
+                # 발급된 번호의 파일이 이미 있으면(카운터 도입 이전 파일 등) 다음 번호 사용
+                for _ in range(100):
+                    seq = self.db_manager.next_output_sequence(current_date)
+                    if seq is None:
+                        return None
+                    filename = f"{current_date}.jpeg" if seq == 0 else f"{current_date}_{seq}.jpeg"
+                    try:
+                        os.link(tmp_path, os.path.join(shard_dir, filename))
+                    except FileExistsError:
+                        continue
+                    return f"{current_date}/{filename}"
 
-            img.save(output_path, 'JPEG', quality=95)
-            return os.path.basename(output_path)
+                self.logger.error("사용 가능한 출력 파일명을 찾지 못했습니다.")
+                return None
+            finally:
+                os.remove(tmp_path)
         except Exception as e:
             self.logger.error(f"이미지 저장 중 오류 발생: {e}")
             return None
 
+def print_stats(post_history, period, days):
+    """
+    게시 이력의 기간별 처리량과 단계별 p95 지연(ms)을 표로 출력
+
+    Args:
+        post_history (PostHistory): 게시 이력
+        period (str): 집계 단위 (day, week)
+        days (int): 최근 며칠을 집계할지
+    """
+    rows = post_history.rollup(period, days)
+    if not rows:
+        print(f"최근 {days}일 동안의 게시 이력이 없습니다.")
+        return
+
+    print(f"{'기간':<12}{'시도':>6}{'성공':>6}{'실패':>6}{'카드':>6}{'MB':>8}" + "".join(f"{'p95 ' + stage:>14}" for stage in STAGES))
+    for row in rows:
+        latencies = "".join(
+            f"{row['p95'][stage]:>14.0f}" if stage in row['p95'] else f"{'-':>14}"
+            for stage in STAGES
+        )
+        print(f"{row['period']:<12}{row['attempts']:>6}{row['success']:>6}{row['failed']:>6}{row['cards']:>6}{row['bytes'] / 1024 / 1024:>8.1f}{latencies}")
+
 def main():
+    parser = argparse.ArgumentParser(description="주식 명언 카드 생성기")
+    parser.add_argument("--batch", type=int, default=0, help="비동기 파이프라인으로 동시에 처리할 카드 수")
+    parser.add_argument("--stream", type=int, default=0, help="대량 배치를 스트리밍 파이프라인으로 처리할 카드 수 (메모리 상한: STREAM_MAX_RSS_MB)")
+    parser.add_argument("--fanout", type=int, default=0, help="카드 N장을 한 번씩만 렌더링해 FANOUT_BOARDS/FANOUT_INSTAGRAM_ACCOUNTS의 모든 목적지에 동시에 게시")
+    parser.add_argument("--publish", action="store_true", help="단일/배치 모드에서 인스타그램 게시까지 진행")
+    parser.add_argument("--video", type=int, default=0, help="게시 계획의 다음 N건을 릴스용 영상 카드(MP4)로 생성 (output/video)")
+    parser.add_argument("--refill", action="store_true", help="사전 렌더링 풀을 보충하고 종료 (PRERENDER_POOL_SIZE장 유지)")
+    parser.add_argument("--profile", action="store_true", help="cProfile/tracemalloc 프로파일을 logs/profile에 저장 (PROFILE=1과 동일)")
+    parser.add_argument("--rerender", action="store_true", help="렌더 매니페스트에 기록된 카드를 다시 렌더링")
+    parser.add_argument("--stale", action="store_true", help="--rerender와 함께 사용: 레이아웃/입력이 바뀐 카드만 다시 렌더링")
+    parser.add_argument("--plan", type=int, default=0, help="게시 계획을 N건 미리 작성하고 종료 (저자/이미지 순환 배치)")
+    parser.add_argument("--import", dest="import_csv", nargs="?", const="", default=None, metavar="CSV",
+                        help="CSV(기본값: wisdom.csv)에 새로 추가된 명언을 임포트 (중복은 건너뛰고 유사 명언은 비공개로 추가)")
+    parser.add_argument("--stats", action="store_true", help="게시 이력(post_history)의 기간별 처리량과 단계별 p95 지연 출력")
+    parser.add_argument("--period", choices=["day", "week"], default="day", help="--stats와 함께 사용: 집계 단위")
+    parser.add_argument("--days", type=int, default=30, help="--stats와 함께 사용: 최근 며칠을 집계할지")
+    parser.add_argument("--db", default="sqlite.db", help="SQLite DB 경로 (프로젝트 기준 상대 경로 또는 절대 경로)")
+    parser.add_argument("--output", default="output", help="카드 저장 디렉토리 (프로젝트 기준 상대 경로 또는 절대 경로)")
+    args = parser.parse_args()
+
     logger = LoggerUtil().get_logger()
+    if args.stats:
+        print_stats(PostHistory(DatabaseManager(args.db)), args.period, args.days)
+        return
+    if args.import_csv is not None:
+        result = DatabaseManager(args.db).import_csv(args.import_csv or None)
+        if result:
+            for flagged in result["flagged"]:
+                logger.warning(f"검토 필요: idx {flagged['idx']} ≈ idx {flagged['duplicate_of']} (유사도 {flagged['similarity']:.2f})")
+        return
+
     logger.info("=== 명언 카드 생성기 시작 ===")
-    generator = WisdomCardGenerator()
+    from utils.rate_limiter import RateLimiter
+    from utils.circuit_breaker import CircuitBreaker
+    # 싱글톤이므로 생성기보다 먼저 --db 경로로 생성 (속도 제한/회로 차단 상태도 같은 DB에 저장)
+    RateLimiter(args.db)
+    CircuitBreaker(args.db)
+    generator = WisdomCardGenerator(output_dir=args.output, profile=True if args.profile else None, db_path=args.db)
     
     try:
-        if generator.generate_and_post():
+        if args.rerender:
+            result = generator.rerender(stale_only=args.stale)
+            logger.info(f"✨ 다시 렌더링 완료: 성공 {result['success']}/{result['total']}")
+        elif args.refill:
+            generator.prerender_pool.refill()
+        elif args.video > 0:
+            paths = generator.generate_videos(args.video)
+            logger.info(f"✨ 영상 카드 생성 완료: {len(paths)}/{args.video}건")
+        elif args.plan > 0:
+            added = generator.scheduler.extend_plan(args.plan)
+            logger.info(f"게시 계획 작성 완료: {added}건 추가")
+        elif args.fanout > 0:
+            result = generator.generate_and_post_fanout(args.fanout)
+            logger.info(f"✨ 다중 목적지 게시 완료: 성공 {result['success']}/{result['total']}")
+            for key, counts in result["destinations"].items():
+                logger.info(f"  {key}: 완료 {counts['done']}, 실패 {counts['failed']}")
+        elif args.stream > 0:
+            result = generator.generate_and_post_stream(args.stream)
+            logger.info(f"✨ 스트리밍 배치 완료: 성공 {result['success']}/{result['total']}")
+        elif args.batch > 0:
+            results = generator.generate_and_post_many(args.batch, publish_instagram=args.publish)
+            success_count = sum(1 for result in results if result["success"])
+            logger.info(f"✨ 배치 처리 완료: 성공 {success_count}/{len(results)}")
+        elif generator.generate_and_post(publish_instagram=args.publish):
             logger.info("✨ 명언 카드 생성 및 포스팅이 완료되었습니다!")
         else:
             logger.error("❌ 명언 카드 생성 또는 포스팅 중 오류가 발생했습니다.")
     except Exception as e:
         logger.error(f"❌ 예상치 못한 오류 발생: {e}")
+    finally:
+        generator.post_history.flush()
     
     logger.info("=== 프로그램 종료 ===")
 
@@ -0,0 +1,102 @@
+import os
+import json
+import tempfile
+from utils.logger_util import LoggerUtil
+
+# 전처리기가 인물 이미지마다 만드는 정사각형 크기 (600은 기존 img/<인물>/<파일> 경로 그대로)
+PYRAMID_SIZES = (300, 600, 1080, 2160)
+BASE_SIZE = 600
+MANIFEST_NAME = 'pyramid.json'
+
+def portrait_key(image_path):
+    """img/<인물>/<파일> 경로를 '<인물>/<파일>' 키로 변환"""
+    return f"{os.path.basename(os.path.dirname(image_path))}/{os.path.basename(image_path)}"
+
+def level_file(key, size):
+    """'<인물>/<파일>' 키의 size 단계 상대 경로 (기본 크기는 원래 경로, 나머지는 img/<인물>/<크기>/<파일>)"""
+    if size == BASE_SIZE:
+        return key
+    name, filename = key.split('/', 1)
+    return f"{name}/{size}/{filename}"
+
+class PortraitPyramid:
+    """
+    인물 이미지 크기별 단계(피라미드) 매니페스트 (img/pyramid.json)
+
+    image_preprocessor가 원본을 한 번 디코딩해 PYRAMID_SIZES 크기를 모두 저장하고 여기에
+    기록한다. 렌더러는 카드 크기와 정확히 같은 단계 파일을 골라 쓰므로 렌더링 중에
+    인물 이미지를 리사이즈하지 않는다.
+
+    매니페스트 형식: {"<인물>/<파일>": {"source": 원본 파일명, "levels": {"300": "<인물>/300/<파일>", ...}}}
+    """
+
+    def __init__(self, img_dir=None):
+        """
+        Args:
+            img_dir (str): 인물별 이미지 디렉토리 (기본값: 프로젝트의 img)
+        """
+        if img_dir is None:
+            img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+        self.img_dir = img_dir
+        self.manifest_path = os.path.join(img_dir, MANIFEST_NAME)
+        self.logger = LoggerUtil().get_logger()
+        self._entries = None
+        self._mtime = None
+
+    @property
+    def entries(self):
+        """매니페스트 항목 (파일이 바뀌면 다시 읽음, 없으면 빈 dict)"""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return self._entries
+        if self._entries is None or mtime != self._mtime:
+            try:
+                with open(self.manifest_path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"인물 이미지 피라미드 매니페스트 읽기 실패: {e}")
+                self._entries = {}
+            self._mtime = mtime
+        return self._entries
+
+    def resolve(self, image_path, size):
+        """
+        인물 이미지의 size 단계 파일 경로
+
+        Args:
+            image_path (str): img/<인물>/<파일> 경로 (기본 크기 이미지)
+            size (int): 필요한 정사각형 크기
+
+        Returns:
+            str: 단계 파일 경로, 매니페스트에 없거나 파일이 없으면 None (기본 크기는 image_path)
+        """
+        if size == BASE_SIZE:
+            return image_path
+        entry = self.entries.get(portrait_key(image_path))
+        level = entry and entry.get('levels', {}).get(str(size))
+        if not level:
+            return None
+        path = os.path.join(self.img_dir, *level.split('/'))
+        return path if os.path.exists(path) else None
+
+    def update(self, new_entries):
+        """
+        매니페스트 항목 추가/교체 (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            new_entries (dict): '<인물>/<파일>' 키별 항목
+        """
+        entries = dict(self.entries)
+        entries.update(new_entries)
+        fd, tmp_path = tempfile.mkstemp(dir=self.img_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._entries, self._mtime = None, None
@@ -0,0 +1,165 @@
+import io
+import os
+import json
+import struct
+from multiprocessing import shared_memory
+from PIL import Image
+from portrait_pyramid import PortraitPyramid, BASE_SIZE, portrait_key as _portrait_key
+from utils.logger_util import LoggerUtil
+
+# 공유 메모리 앞부분: 인덱스(JSON) 길이(8바이트) + 인덱스, 픽셀 데이터는 64바이트 정렬
+HEADER_FORMAT = '<Q'
+ALIGNMENT = 64
+
+def _align(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+def _data_start(index_length):
+    """인덱스 길이로부터 픽셀 데이터 영역 시작 위치 계산"""
+    return _align(struct.calcsize(HEADER_FORMAT) + index_length)
+
+class PortraitStore:
+    """
+    전처리된 인물 이미지를 한 번만 디코딩해 공유 메모리에 올려두는 저장소
+
+    부모 프로세스가 build()로 img/<인물>/*.jpg를 RGBA 픽셀로 디코딩해 하나의 공유 메모리
+    블록에 배치하고, 렌더링 워커는 attach(name)으로 붙어 복사 없이 이미지 뷰를 얻는다.
+    워커 수가 늘어도 워커별 디코딩 비용과 메모리가 늘지 않는다.
+    """
+
+    def __init__(self, shm, index, data_start, owner=False):
+        self.shm = shm
+        self.index = index
+        self.data_start = data_start
+        self.owner = owner
+        self.name = shm.name
+        self.logger = LoggerUtil().get_logger()
+
+    @classmethod
+    def build(cls, img_dir=None, size=BASE_SIZE):
+        """
+        인물 이미지를 모두 디코딩해 공유 메모리 저장소 생성
+
+        Args:
+            img_dir (str): 인물별 이미지 디렉토리 (기본값: 프로젝트의 img)
+            size (int): 올릴 피라미드 단계 크기 (해당 단계가 없는 이미지는 기본 이미지를 올림)
+
+        Returns:
+            PortraitStore: 생성한 프로세스가 소유하는 저장소 (사용 후 close(), unlink() 필요)
+        """
+        if img_dir is None:
+            img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+
+        # 1단계: 헤더만 읽어 크기를 구하고 인덱스 작성 (데이터 영역 기준 상대 오프셋)
+        portrait_paths = []
+        for name in sorted(os.listdir(img_dir)):
+            author_dir = os.path.join(img_dir, name)
+            if name == 'source' or not os.path.isdir(author_dir):
+                continue
+            for filename in sorted(os.listdir(author_dir)):
+                if filename.endswith('.jpg'):
+                    portrait_paths.append(os.path.join(author_dir, filename))
+
+        # 키는 기본 이미지 경로 기준, 픽셀은 카드 크기와 같은 단계 파일에서 읽음
+        pyramid = PortraitPyramid(img_dir)
+        sources = {path: pyramid.resolve(path, size) or path for path in portrait_paths}
+
+        index = {}
+        offset = 0
+        for path in portrait_paths:
+            with Image.open(sources[path]) as img:
+                dims = img.size
+            index[_portrait_key(path)] = {"offset": offset, "size": list(dims)}
+            offset += _align(dims[0] * dims[1] * 4)
+
+        index_bytes = json.dumps(index).encode('utf-8')
+        data_start = _data_start(len(index_bytes))
+
+        # 2단계: 한 장씩 디코딩해 바로 공유 메모리에 기록
+        shm = shared_memory.SharedMemory(create=True, size=max(1, data_start + offset))
+        header_size = struct.calcsize(HEADER_FORMAT)
+        struct.pack_into(HEADER_FORMAT, shm.buf, 0, len(index_bytes))
+        shm.buf[header_size:header_size + len(index_bytes)] = index_bytes
+        for path in portrait_paths:
+            start = data_start + index[_portrait_key(path)]["offset"]
+            with Image.open(sources[path]) as img:
+                pixels = img.convert('RGBA').tobytes()
+            shm.buf[start:start + len(pixels)] = pixels
+
+        store = cls(shm, index, data_start, owner=True)
+        store.logger.info(f"인물 이미지 공유 메모리 저장소 생성: {len(index)}장, {shm.size/1024/1024:.1f}MB ({shm.name})")
+        return store
+
+    @classmethod
+    def attach(cls, name):
+        """
+        다른 프로세스가 만든 저장소에 연결 (Python 3.12 이하에서는 소유 프로세스의 자식 프로세스에서 사용)
+
+        Args:
+            name (str): 공유 메모리 이름 (PortraitStore.name)
+
+        Returns:
+            PortraitStore: 읽기 전용으로 사용할 저장소
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python 3.12 이하에는 track 인자가 없다. 소유 프로세스의 자식(워커)은 같은
+            # resource tracker를 공유하므로 중복 등록되어도 소유 프로세스의 unlink로 정리된다.
+            shm = shared_memory.SharedMemory(name=name)
+
+        header_size = struct.calcsize(HEADER_FORMAT)
+        (index_length,) = struct.unpack_from(HEADER_FORMAT, shm.buf, 0)
+        index = json.loads(bytes(shm.buf[header_size:header_size + index_length]).decode('utf-8'))
+        return cls(shm, index, _data_start(index_length), owner=False)
+
+    def get(self, image_path):
+        """
+        인물 이미지의 RGBA 뷰 반환 (공유 메모리를 직접 참조하는 읽기 전용 이미지)
+
+        Args:
+            image_path (str): img/<인물>/<파일> 경로
+
+        Returns:
+            PIL.Image.Image: RGBA 이미지, 저장소에 없으면 None
+        """
+        entry = self.index.get(_portrait_key(image_path))
+        if entry is None:
+            return None
+        width, height = entry["size"]
+        start = self.data_start + entry["offset"]
+        view = self.shm.buf[start:start + width * height * 4]
+        return Image.frombuffer('RGBA', (width, height), view, 'raw', 'RGBA', 0, 1)
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+
+# 렌더링 워커 프로세스 전역 상태 (ProcessPoolExecutor initializer에서 설정)
+_worker_processor = None
+
+def init_render_worker(store_name, font_texts=None, card_size=None):
+    """
+    렌더링 워커 초기화: 공유 메모리 저장소에 연결하고 ImageProcessor 생성
+
+    Args:
+        store_name (str): PortraitStore 공유 메모리 이름
+        font_texts (list): 서브셋 폰트용 텍스트 (ImageProcessor 참고)
+        card_size (int): 카드 한 변 크기(px) (ImageProcessor 참고)
+    """
+    global _worker_processor
+    from image_processor import ImageProcessor
+
+    store = PortraitStore.attach(store_name)
+    _worker_processor = ImageProcessor(font_texts=font_texts, portrait_store=store, card_size=card_size)
+
+def render_card_bytes(image_path, wisdom_quote, author):
+    """워커 프로세스에서 카드를 렌더링하고 JPEG 바이트로 반환"""
+    img = _worker_processor.create_card(image_path, wisdom_quote, author)
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=95)
+    return buffer.getvalue()
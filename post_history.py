@@ -0,0 +1,238 @@
+import os
+import time
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from utils.logger_util import LoggerUtil
+
+# 시도마다 소요 시간을 기록하는 단계 (total은 시도 시작부터 기록 시점까지)
+STAGES = ("render", "compress", "upload", "publish", "total")
+
+# 집계 단위별 strftime 형식
+PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+}
+
+class PostAttempt:
+    """
+    게시 시도 한 건 (목적지 하나)의 기록
+
+    stage()로 단계별 소요 시간을 측정하고, 결과 정보(bytes, file_name, image_url, remote_id, error)를
+    채운 뒤 PostHistory.record()로 남긴다.
+    """
+
+    def __init__(self, wisdom_idx, mode, destination="board"):
+        """
+        Args:
+            wisdom_idx (int): 명언 번호
+            mode (str): 실행 방식 (single, batch, stream, fanout)
+            destination (str): 목적지 (board, instagram, board:<이름> 등)
+        """
+        self.wisdom_idx = wisdom_idx
+        self.mode = mode
+        self.destination = destination
+        self.attempt_at = datetime.now()
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.bytes = None
+        self.file_name = None
+        self.image_url = None
+        self.remote_id = None
+        self.error = None
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 소요 시간을 단계 시간(ms)에 더함"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def fork(self, destination):
+        """같은 카드의 다른 목적지 시도 (시작 시각, 렌더링/압축 시간, 파일 정보 공유)"""
+        attempt = PostAttempt(self.wisdom_idx, self.mode, destination)
+        attempt.attempt_at = self.attempt_at
+        attempt.started = self.started
+        attempt.timings = {name: ms for name, ms in self.timings.items() if name in ("render", "compress")}
+        attempt.file_name = self.file_name
+        return attempt
+
+class PostHistory:
+    """
+    게시 시도별 결과와 단계별 소요 시간 기록 (SQLite post_history 테이블)
+
+    기록은 메모리에 모았다가 batch_size건마다(또는 flush()/프로세스 종료 시) 한 트랜잭션으로
+    넣는다. rollup()은 일/주 단위 처리량과 단계별 p95 지연을 SQL 윈도 함수로 바로 계산한다.
+    """
+
+    def __init__(self, db_manager, batch_size=None):
+        """
+        Args:
+            db_manager (DatabaseManager): wisdom_list가 있는 DB 관리자
+            batch_size (int): 한 번에 넣을 기록 수 (기본값: POST_HISTORY_BATCH 또는 50)
+        """
+        self.db_path = db_manager.db_path
+        self.batch_size = batch_size or int(os.getenv("POST_HISTORY_BATCH", "50"))
+        self.logger = LoggerUtil().get_logger()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._initialize_table()
+        # 배치가 차기 전에 끝나는 cron 1회 실행 등에서도 기록이 남도록 종료 시 반영
+        atexit.register(self.flush)
+
+    def _initialize_table(self):
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS post_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                wisdom_idx INTEGER NOT NULL,
+                attempt_at TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                destination TEXT NOT NULL,
+                status TEXT NOT NULL,
+                render_ms REAL,
+                compress_ms REAL,
+                upload_ms REAL,
+                publish_ms REAL,
+                total_ms REAL,
+                bytes INTEGER,
+                file_name TEXT,
+                image_url TEXT,
+                remote_id TEXT,
+                error TEXT
+            )
+            ''')
+            # 기간별 집계(attempt_at 범위 조회)와 명언별 이력 조회용
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_post_history_attempt_at
+            ON post_history (attempt_at, status)
+            ''')
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_post_history_wisdom
+            ON post_history (wisdom_idx, attempt_at)
+            ''')
+            conn.commit()
+
+    def start(self, wisdom_idx, mode, destination="board"):
+        """게시 시도 기록 시작"""
+        return PostAttempt(wisdom_idx, mode, destination)
+
+    def record(self, attempt, success, error=None):
+        """
+        게시 시도 결과 기록 (batch_size건이 모이면 DB에 반영)
+
+        Args:
+            attempt (PostAttempt): 게시 시도
+            success (bool): 성공 여부
+            error (str): 실패 사유 (기본값: attempt.error)
+        """
+        timings = dict(attempt.timings, total=(time.perf_counter() - attempt.started) * 1000)
+        row = (
+            attempt.wisdom_idx,
+            attempt.attempt_at.strftime('%Y-%m-%d %H:%M:%S'),
+            attempt.mode,
+            attempt.destination,
+            'success' if success else 'failed',
+            *[timings.get(stage) for stage in STAGES],
+            attempt.bytes,
+            attempt.file_name,
+            attempt.image_url,
+            None if attempt.remote_id is None else str(attempt.remote_id),
+            None if success else (error or attempt.error),
+        )
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 기록을 한 트랜잭션으로 반영"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.executemany(f"""
+                    INSERT INTO post_history (
+                        wisdom_idx, attempt_at, mode, destination, status,
+                        {", ".join(f"{stage}_ms" for stage in STAGES)},
+                        bytes, file_name, image_url, remote_id, error
+                    ) VALUES ({", ".join("?" * (10 + len(STAGES)))})
+                """, rows)
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 이력 기록 오류 ({len(rows)}건): {e}")
+
+    def rollup(self, period="day", days=30):
+        """
+        기간별 처리량과 단계별 p95 지연 집계
+
+        Args:
+            period (str): 집계 단위 (day, week)
+            days (int): 최근 며칠을 집계할지
+
+        Returns:
+            list: 기간 순서대로 {"period", "attempts", "success", "failed", "cards", "bytes",
+                  "p95": {단계: ms}} 목록 (p95는 해당 단계를 거친 모든 시도 기준, 최근접 순위 방식)
+        """
+        self.flush()
+        params = {
+            "format": PERIOD_FORMATS[period],
+            "since": (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        samples = " UNION ALL ".join(
+            f"SELECT period, '{stage}' AS stage, {stage}_ms AS ms FROM recent WHERE {stage}_ms IS NOT NULL"
+            for stage in STAGES
+        )
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT strftime(:format, attempt_at) AS period,
+                           COUNT(*),
+                           SUM(status = 'success'),
+                           SUM(status = 'failed'),
+                           COUNT(DISTINCT CASE WHEN status = 'success' THEN wisdom_idx END),
+                           SUM(CASE WHEN status = 'success' THEN bytes END)
+                    FROM post_history
+                    WHERE attempt_at >= :since
+                    GROUP BY period
+                    ORDER BY period
+                """, params)
+                rows = {
+                    row[0]: {
+                        "period": row[0], "attempts": row[1], "success": row[2], "failed": row[3],
+                        "cards": row[4], "bytes": row[5] or 0, "p95": {}
+                    }
+                    for row in cursor.fetchall()
+                }
+
+                cursor.execute(f"""
+                    WITH recent AS (
+                        SELECT strftime(:format, attempt_at) AS period, {", ".join(f"{stage}_ms" for stage in STAGES)}
+                        FROM post_history
+                        WHERE attempt_at >= :since
+                    ),
+                    samples AS ({samples}),
+                    ranked AS (
+                        SELECT period, stage, ms,
+                               ROW_NUMBER() OVER (PARTITION BY period, stage ORDER BY ms) AS rank,
+                               COUNT(*) OVER (PARTITION BY period, stage) AS total
+                        FROM samples
+                    )
+                    SELECT period, stage, ms FROM ranked
+                    WHERE rank = (95 * total + 99) / 100
+                """, params)
+                for row_period, stage, ms in cursor.fetchall():
+                    rows[row_period]["p95"][stage] = ms
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 이력 집계 오류: {e}")
+            return []
+        return list(rows.values())
@@ -0,0 +1,361 @@
+import os
+import random
+import socket
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from database_manager import LEASE_DEADLINE_SQL
+from wisdom_snapshot import PlanItem
+from utils.logger_util import LoggerUtil
+
+# 게시 항목 조회 공통 쿼리 (계획만 조회하고 명언 텍스트는 메모리 스냅샷에서 채움)
+ITEM_QUERY = """
+    SELECT p.seq, p.image_file, p.wisdom_idx, p.name_en
+    FROM posting_plan p
+    JOIN wisdom_list w ON w.idx = p.wisdom_idx
+"""
+
+# 게시 순서 (실패했던 항목은 아직 시도하지 않은 항목 뒤로). idx_posting_plan_status_retry_seq 인덱스의
+# 식과 같아야 정렬 없이 인덱스 순서대로 읽다가 LIMIT에서 멈춘다.
+ITEM_ORDER = "ORDER BY p.attempts > 0, p.seq"
+
+class PostingScheduler:
+    """
+    게시 계획(posting_plan)을 미리 계산해두고 순서대로 꺼내주는 스케줄러
+
+    저자는 최근 author_window개 항목에 나온 저자를, 인물 이미지는 같은 저자의 최근
+    portrait_window장을 피하도록 순환 배치한다.
+
+    계획은 순서만 정하고, 작업 선점은 wisdom_list의 status/lease_owner/lease_expires로 관리한다.
+    claim_next()는 UPDATE ... RETURNING 한 문장으로 명언을 임대하므로 여러 프로세스(또는 DB 파일을
+    공유하는 여러 호스트)가 동시에 꺼내도 겹치지 않고, 워커가 죽어 임대가 만료되면 다른 워커가
+    다시 가져간다. 처리 중에는 heartbeat()로 임대를 연장한다.
+
+    실패한 항목(release())은 시도 횟수를 늘리고 retry_backoff초 × 2^(시도 횟수-1) 동안 쉬었다가
+    아직 시도하지 않은 항목들 뒤에서 다시 시도하며, max_attempts번 실패하면 계획에서 failed로
+    빼 둔다. 한 명언이 계속 실패해도 다른 명언의 게시를 막지 않는다.
+    """
+
+    def __init__(self, db_manager, author_window=None, portrait_window=None, lease_seconds=None,
+                 max_attempts=None, retry_backoff=None):
+        """
+        Args:
+            db_manager (DatabaseManager): wisdom_list가 있는 DB 관리자
+            author_window (int): 같은 저자가 다시 나오기 전 최소 간격 (기본값: PLAN_AUTHOR_WINDOW 또는 3)
+            portrait_window (int): 같은 저자의 같은 이미지가 다시 나오기 전 최소 간격 (기본값: PLAN_PORTRAIT_WINDOW 또는 2)
+            lease_seconds (int): 선점한 명언의 임대 시간(초) (기본값: CLAIM_LEASE_SECONDS 또는 300)
+            max_attempts (int): 계획에서 빼기 전까지 허용하는 실패 횟수 (기본값: PLAN_MAX_ATTEMPTS 또는 3)
+            retry_backoff (int): 첫 실패 후 다시 시도하기까지 기다릴 시간(초), 실패할 때마다 두 배 (기본값: PLAN_RETRY_BACKOFF 또는 600)
+        """
+        self.db_manager = db_manager
+        self.db_path = db_manager.db_path
+        self.lease_seconds = lease_seconds or int(os.getenv("CLAIM_LEASE_SECONDS", "300"))
+        self.max_attempts = max_attempts or int(os.getenv("PLAN_MAX_ATTEMPTS", "3"))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else int(os.getenv("PLAN_RETRY_BACKOFF", "600"))
+        self.img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+        self.author_window = author_window if author_window is not None else int(os.getenv("PLAN_AUTHOR_WINDOW", "3"))
+        self.portrait_window = portrait_window if portrait_window is not None else int(os.getenv("PLAN_PORTRAIT_WINDOW", "2"))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = LoggerUtil().get_logger()
+        self._initialize_table()
+
+    def _initialize_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS posting_plan (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                wisdom_idx INTEGER NOT NULL UNIQUE,
+                name_en TEXT NOT NULL,
+                image_file TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT
+            )
+            ''')
+            # 재시도 횟수 컬럼이 없는 기존 계획 테이블에 추가
+            cursor.execute("PRAGMA table_info(posting_plan)")
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'attempts' not in columns:
+                cursor.execute("ALTER TABLE posting_plan ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("ALTER TABLE posting_plan ADD COLUMN next_attempt_at TEXT")
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_posting_plan_status_retry_seq
+            ON posting_plan (status, (attempts > 0), seq)
+            ''')
+            # ITEM_ORDER 정렬을 지원하지 못하는 이전 인덱스 제거
+            cursor.execute("DROP INDEX IF EXISTS idx_posting_plan_status_seq")
+            conn.commit()
+
+    def _list_portraits(self, name_en):
+        image_folder = os.path.join(self.img_dir, name_en)
+        try:
+            return sorted(f for f in os.listdir(image_folder) if f.endswith('.jpg'))
+        except OSError:
+            return []
+
+    def extend_plan(self, count=None):
+        """
+        아직 계획되지 않은 명언으로 게시 계획을 이어서 작성
+
+        Args:
+            count (int): 추가할 최대 항목 수, None이면 남은 명언 전부
+
+        Returns:
+            int: 추가된 항목 수
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                # 계획 작성은 한 번에 한 프로세스만 (쓰기 잠금 선점)
+                cursor.execute("BEGIN IMMEDIATE")
+
+                cursor.execute("""
+                    SELECT w.idx, w.name_en
+                    FROM wisdom_list w
+                    LEFT JOIN posting_plan p ON p.wisdom_idx = w.idx
+                    WHERE w.open_yn = 1 AND w.file_name IS NULL AND p.seq IS NULL
+                """)
+                remaining = {}
+                for idx, name_en in cursor.fetchall():
+                    remaining.setdefault(name_en, []).append(idx)
+                if not remaining:
+                    conn.commit()
+                    return 0
+                for indices in remaining.values():
+                    random.shuffle(indices)
+
+                # 기존 계획의 끝부분을 이어받아 간격 유지
+                cursor.execute("SELECT name_en, image_file FROM posting_plan ORDER BY seq DESC LIMIT 100")
+                history = list(reversed(cursor.fetchall()))
+                recent_authors = deque((name for name, _ in history), maxlen=max(1, self.author_window))
+                last_used = {}  # 저자/이미지별 마지막 사용 위치 (LRU 선택용)
+                for position, (name_en, image_file) in enumerate(history):
+                    last_used[name_en] = position
+                    last_used[(name_en, image_file)] = position
+
+                portraits = {name: self._list_portraits(name) for name in remaining}
+                position = len(history)
+                rows = []
+                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                limit = count if count is not None else sum(len(v) for v in remaining.values())
+
+                while len(rows) < limit:
+                    candidates = [name for name, indices in remaining.items() if indices and portraits[name]]
+                    if not candidates:
+                        break
+
+                    # 최근에 나오지 않은 저자 중 남은 명언이 많고 오래 쉬었던 저자 우선
+                    fresh = [name for name in candidates if name not in recent_authors] or candidates
+                    name_en = max(fresh, key=lambda name: (len(remaining[name]), -last_used.get(name, -1), random.random()))
+
+                    # 같은 저자의 최근 이미지를 피해 가장 오래 쓰이지 않은 이미지 선택
+                    author_images = portraits[name_en]
+                    window = min(self.portrait_window, len(author_images) - 1)
+                    recent_images = sorted(author_images, key=lambda f: last_used.get((name_en, f), -1))[len(author_images) - window:] if window > 0 else []
+                    image_choices = [f for f in author_images if f not in recent_images]
+                    image_file = min(image_choices, key=lambda f: (last_used.get((name_en, f), -1), random.random()))
+
+                    rows.append((remaining[name_en].pop(), name_en, image_file, now))
+                    recent_authors.append(name_en)
+                    last_used[name_en] = position
+                    last_used[(name_en, image_file)] = position
+                    position += 1
+
+                cursor.executemany("""
+                    INSERT INTO posting_plan (wisdom_idx, name_en, image_file, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+
+            self.logger.info(f"게시 계획 {len(rows)}건 추가")
+            return len(rows)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 계획 작성 오류: {e}")
+            return 0
+
+    def claim_next(self, limit=1):
+        """
+        게시 계획 순서대로 다음 명언을 임대 (계획이 비어 있으면 자동으로 작성)
+
+        Args:
+            limit (int): 가져올 최대 항목 수
+
+        Returns:
+            list: PlanItem 목록
+        """
+        items = self._claim(limit)
+        if len(items) < limit and self.extend_plan():
+            items.extend(self._claim(limit - len(items)))
+        if not items:
+            self.logger.warning("게시할 항목이 없습니다.")
+        return items
+
+    def _claim(self, limit):
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                # 대기/실패 상태이거나 임대가 만료된 명언만 선점 (한 문장이므로 원자적)
+                cursor.execute(f"""
+                    UPDATE wisdom_list
+                    SET status = 'claimed', lease_owner = ?, lease_expires = {LEASE_DEADLINE_SQL}
+                    WHERE idx IN (
+                        SELECT p.wisdom_idx
+                        FROM posting_plan p
+                        JOIN wisdom_list w ON w.idx = p.wisdom_idx
+                        WHERE p.status = 'pending'
+                          AND (p.next_attempt_at IS NULL OR p.next_attempt_at <= datetime('now'))
+                          AND (w.status IN ('pending', 'failed')
+                               OR (w.status IN ('claimed', 'rendered') AND w.lease_expires < datetime('now')))
+                        {ITEM_ORDER}
+                        LIMIT ?
+                    )
+                    RETURNING idx
+                """, (self.worker_id, self.lease_seconds, limit))
+                claimed = [row[0] for row in cursor.fetchall()]
+                if not claimed:
+                    conn.commit()
+                    return []
+
+                cursor.execute(f"""
+                    {ITEM_QUERY}
+                    WHERE p.wisdom_idx IN ({",".join("?" * len(claimed))})
+                    {ITEM_ORDER}
+                """, claimed)
+                rows = cursor.fetchall()
+                conn.commit()
+
+            return self._to_items(rows)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 항목 선점 오류: {e}")
+            return []
+
+    def mark_rendered(self, item):
+        """
+        렌더링 완료 기록 (업로드 직전 임대가 아직 유효한지 확인하는 용도)
+
+        Returns:
+            bool: 임대를 유지하고 있으면 True, 다른 워커에게 넘어갔으면 False
+        """
+        if self.db_manager.set_wisdom_status(item.idx, 'rendered', self.worker_id):
+            return True
+        self.logger.warning(f"임대가 만료되어 다른 워커가 가져간 명언입니다 (idx: {item.idx})")
+        return False
+
+    def complete(self, item):
+        """게시 완료 처리 (명언 상태는 DatabaseManager.update_wisdom_file에서 uploaded로 변경)"""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.execute(
+                    "UPDATE posting_plan SET status = 'done' WHERE seq = ?",
+                    (item.plan_seq,)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 계획 상태 변경 오류: {e}")
+
+    def release(self, item, failed=True):
+        """
+        명언의 임대를 풀어 다시 시도되도록 함
+
+        Args:
+            item (PlanItem): claim_next()로 받은 항목
+            failed (bool): 처리에 실패한 경우 True (시도 횟수를 늘리고 대기 후 뒤로 미룸, max_attempts번째
+                           실패면 계획에서 뺌), 처리하지 못하고 돌려주는 경우 False (순서 그대로 대기)
+        """
+        if not failed:
+            self.db_manager.set_wisdom_status(item.idx, 'pending', self.worker_id)
+            return
+        # 임대를 이미 잃었으면 다른 워커가 처리 중이므로 시도 횟수를 늘리지 않음
+        if not self.db_manager.set_wisdom_status(item.idx, 'failed', self.worker_id):
+            return
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                # 오른쪽 식의 attempts는 갱신 전 값 (대기 시간 = retry_backoff × 2^(이전 실패 횟수))
+                cursor.execute("""
+                    UPDATE posting_plan
+                    SET attempts = attempts + 1,
+                        next_attempt_at = datetime('now', '+' || (? << attempts) || ' seconds'),
+                        status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END
+                    WHERE seq = ?
+                    RETURNING attempts, status
+                """, (self.retry_backoff, self.max_attempts, item.plan_seq))
+                row = cursor.fetchone()
+                if row:
+                    attempts, status = row
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 계획 재시도 정보 갱신 오류: {e}")
+            return
+        if row and status == 'failed':
+            self.logger.warning(f"{attempts}번 실패한 명언을 게시 계획에서 제외합니다 (idx: {item.idx}, plan_seq: {item.plan_seq})")
+
+    @contextmanager
+    def heartbeat(self, items):
+        """
+        with 블록 동안 백그라운드 스레드가 임대 시간의 1/3마다 임대를 연장
+
+        Args:
+            items (list): claim_next()로 받은 항목 목록
+        """
+        idx_list = [item.idx for item in items]
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(self.lease_seconds / 3):
+                renewed = self.db_manager.renew_leases(idx_list, self.worker_id, self.lease_seconds)
+                lost = [idx for idx in idx_list if idx not in renewed]
+                if lost:
+                    self.logger.debug(f"임대 연장 대상에서 제외된 명언: {lost}")
+                    idx_list[:] = [idx for idx in idx_list if idx in renewed]
+
+        thread = threading.Thread(target=renew, name="lease-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def upcoming(self, limit=10):
+        """
+        아직 게시되지 않고 다른 워커가 처리 중이지 않은 다음 항목들 조회 (미리 렌더링 등 계획 확인용, 상태는 바꾸지 않음)
+
+        Args:
+            limit (int): 최대 조회 개수
+
+        Returns:
+            list: PlanItem 목록
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    {ITEM_QUERY}
+                    WHERE p.status = 'pending' AND w.status IN ('pending', 'failed')
+                      AND (p.next_attempt_at IS NULL OR p.next_attempt_at <= datetime('now'))
+                    {ITEM_ORDER}
+                    LIMIT ?
+                """, (limit,))
+                rows = cursor.fetchall()
+            return self._to_items(rows)
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 계획 조회 오류: {e}")
+            return []
+
+    def _to_items(self, rows):
+        """계획 행 (seq, image_file, wisdom_idx, name_en)을 스냅샷의 명언과 합쳐 PlanItem으로 변환"""
+        items = []
+        for plan_seq, image_file, wisdom_idx, name_en in rows:
+            record = self.db_manager.get_wisdom(wisdom_idx)
+            if record is None:
+                self.logger.warning(f"게시 계획의 명언을 찾을 수 없습니다 (idx: {wisdom_idx})")
+                continue
+            items.append(PlanItem(plan_seq, os.path.join(self.img_dir, name_en, image_file), record))
+        return items
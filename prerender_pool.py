@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from utils.logger_util import LoggerUtil
+
+# 렌더링 중(rendering) 상태로 이 시간 이상 남아 있으면 중단된 작업으로 보고 다시 렌더링
+RENDERING_TIMEOUT = timedelta(minutes=10)
+
+class PrerenderPool:
+    """
+    게시 계획의 다음 카드들을 미리 렌더링/압축해 두는 풀
+
+    refill()이 게시 계획(posting_plan)의 대기 항목 중 앞쪽 size개를 렌더링해 output 디렉토리에
+    저장하고, 업로드용으로 압축한 이미지는 output/.prerender에 보관한다. 상태는 SQLite의
+    prerender_pool 테이블에 기록되므로 게시 시점에는 take()로 꺼내 업로드와 DB 갱신만 하면 된다.
+    """
+
+    def __init__(self, generator, size=None):
+        """
+        Args:
+            generator (WisdomCardGenerator): 렌더링/압축/게시 계획을 제공하는 생성기
+            size (int): 미리 준비해 둘 카드 수 (기본값: PRERENDER_POOL_SIZE 또는 5)
+        """
+        self.generator = generator
+        self.size = size if size is not None else int(os.getenv("PRERENDER_POOL_SIZE", "5"))
+        self.db_path = generator.db_manager.db_path
+        self.output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), generator.output_dir)
+        self.pool_dir = os.path.join(self.output_path, '.prerender')
+        self.logger = LoggerUtil().get_logger()
+        self._initialize_table()
+
+    def _initialize_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prerender_pool (
+                plan_seq INTEGER PRIMARY KEY,
+                wisdom_idx INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                file_name TEXT,
+                upload_file TEXT,
+                upload_format TEXT,
+                updated_at TEXT
+            )
+            ''')
+            conn.commit()
+
+    def refill(self):
+        """
+        게시 계획의 다음 항목들이 모두 준비되도록 부족한 카드를 렌더링
+
+        Returns:
+            int: 새로 준비한 카드 수
+        """
+        scheduler = self.generator.scheduler
+        upcoming = scheduler.upcoming(self.size)
+        if len(upcoming) < self.size and scheduler.extend_plan(self.size - len(upcoming)):
+            upcoming = scheduler.upcoming(self.size)
+        self._cleanup()
+
+        prepared = 0
+        for item in upcoming:
+            if not self._reserve(item):
+                continue
+            try:
+                if self._prepare(item):
+                    prepared += 1
+                else:
+                    self._remove(item.plan_seq)
+            except Exception as e:
+                self.logger.error(f"사전 렌더링 실패 (idx: {item.idx}): {e}")
+                self._remove(item.plan_seq)
+
+        self.logger.info(f"사전 렌더링 풀 보충 완료: {prepared}장 추가")
+        return prepared
+
+    def is_full(self):
+        """
+        게시 계획의 다음 size개가 모두 풀에 있는지 (준비 완료 또는 다른 프로세스가 렌더링 중)
+
+        Returns:
+            bool: 보충할 카드가 없으면 True
+        """
+        upcoming = self.generator.scheduler.upcoming(self.size)
+        if len(upcoming) < self.size:
+            return False
+        plan_seqs = [item.plan_seq for item in upcoming]
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM prerender_pool WHERE plan_seq IN ({','.join('?' * len(plan_seqs))})",
+                    plan_seqs
+                )
+                return cursor.fetchone()[0] == len(plan_seqs)
+        except sqlite3.Error as e:
+            self.logger.error(f"사전 렌더링 풀 조회 오류: {e}")
+            return False
+
+    def _reserve(self, item):
+        """다른 refill 프로세스와 같은 항목을 중복 렌더링하지 않도록 먼저 자리를 잡음"""
+        now = datetime.now()
+        expired = (now - RENDERING_TIMEOUT).strftime('%Y-%m-%d %H:%M:%S')
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM prerender_pool WHERE plan_seq = ? AND status = 'rendering' AND updated_at < ?",
+                (item.plan_seq, expired)
+            )
+            cursor.execute("""
+                INSERT OR IGNORE INTO prerender_pool (plan_seq, wisdom_idx, status, updated_at)
+                VALUES (?, ?, 'rendering', ?)
+            """, (item.plan_seq, item.idx, now.strftime('%Y-%m-%d %H:%M:%S')))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def _prepare(self, item):
+        generator = self.generator
+        author = item.author
+
+        output_filename = generator._render_card(item, item.image_path, author)
+        if not output_filename:
+            return False
+
+        # 업로드용 압축 이미지 보관 (임시 파일에 쓴 뒤 교체)
+        compressed_image, format = generator.api_util._compress_image(os.path.join(self.output_path, output_filename))
+        os.makedirs(self.pool_dir, exist_ok=True)
+        upload_file = f"{item.plan_seq}.{format}"
+        fd, tmp_path = tempfile.mkstemp(dir=self.pool_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed_image)
+            os.replace(tmp_path, os.path.join(self.pool_dir, upload_file))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.execute("""
+                UPDATE prerender_pool
+                SET status = 'ready', file_name = ?, upload_file = ?, upload_format = ?, updated_at = ?
+                WHERE plan_seq = ?
+            """, (output_filename, upload_file, format, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), item.plan_seq))
+            conn.commit()
+
+        self.logger.info(f"사전 렌더링 완료 (idx: {item.idx}): {output_filename}")
+        return True
+
+    def take(self, plan_seq):
+        """
+        미리 준비된 카드 조회
+
+        Args:
+            plan_seq (int): 게시 계획 번호
+
+        Returns:
+            tuple: (output 기준 카드 경로, (압축 이미지 바이트, 포맷)), 준비된 카드가 없으면 None
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT file_name, upload_file, upload_format
+                    FROM prerender_pool
+                    WHERE plan_seq = ? AND status = 'ready'
+                """, (plan_seq,))
+                row = cursor.fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"사전 렌더링 풀 조회 오류: {e}")
+            return None
+
+        if not row:
+            return None
+
+        file_name, upload_file, upload_format = row
+        try:
+            if not os.path.exists(os.path.join(self.output_path, file_name)):
+                raise FileNotFoundError(file_name)
+            with open(os.path.join(self.pool_dir, upload_file), 'rb') as f:
+                compressed_image = f.read()
+        except OSError as e:
+            self.logger.warning(f"사전 렌더링 파일이 없어 다시 렌더링합니다 (plan_seq: {plan_seq}): {e}")
+            self._remove(plan_seq)
+            return None
+
+        self.logger.info(f"사전 렌더링 카드 사용: {file_name}")
+        return file_name, (compressed_image, upload_format)
+
+    def discard(self, plan_seq):
+        """게시가 끝난 카드를 풀에서 제거 (카드 이미지는 output에 남김)"""
+        self._remove(plan_seq)
+
+    def _remove(self, plan_seq):
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM prerender_pool WHERE plan_seq = ? RETURNING upload_file",
+                    (plan_seq,)
+                )
+                row = cursor.fetchone()
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"사전 렌더링 풀 정리 오류: {e}")
+            return
+
+        if row and row[0]:
+            try:
+                os.remove(os.path.join(self.pool_dir, row[0]))
+            except FileNotFoundError:
+                pass
+
+    def _cleanup(self):
+        """다른 경로로 이미 게시된 항목의 풀 데이터 정리"""
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT r.plan_seq FROM prerender_pool r
+                LEFT JOIN posting_plan p ON p.seq = r.plan_seq
+                WHERE p.seq IS NULL OR p.status = 'done'
+            """)
+            finished = [row[0] for row in cursor.fetchall()]
+        for plan_seq in finished:
+            self._remove(plan_seq)
@@ -0,0 +1,124 @@
+import sqlite3
+from datetime import datetime
+from utils.logger_util import LoggerUtil
+
+# 기존 단일 목적지 설정(BASE_URL, INSTAGRAM_ACCOUNT_ID)으로 게시하는 목적지 키
+DEFAULT_BOARD = "board:default"
+DEFAULT_INSTAGRAM = "instagram:default"
+
+class PublishStatus:
+    """
+    명언별/목적지별 게시 결과 (SQLite publish_status 테이블)
+
+    다중 목적지 게시와 인스타그램까지 게시하는 단일/배치 모드가 함께 사용한다. 게시판 업로드는
+    성공했지만 인스타그램 게시가 실패한 명언을 다시 처리할 때, 게시판에 다시 올리지 않고 기록된
+    이미지 URL로 인스타그램 게시만 재시도하는 데 쓴다.
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path (str): SQLite DB 경로
+        """
+        self.db_path = db_path
+        self.logger = LoggerUtil().get_logger()
+        self._initialize_table()
+
+    def _initialize_table(self):
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS publish_status (
+                wisdom_idx INTEGER NOT NULL,
+                destination TEXT NOT NULL,
+                status TEXT NOT NULL,
+                file_name TEXT,
+                image_url TEXT,
+                remote_id TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT,
+                PRIMARY KEY (wisdom_idx, destination)
+            )
+            ''')
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_publish_status_destination
+            ON publish_status (destination, status)
+            ''')
+            conn.commit()
+
+    def load(self, wisdom_idx):
+        """명언의 목적지별 게시 기록 {목적지 키: {"status", "file_name", "image_url"}}"""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT destination, status, file_name, image_url FROM publish_status WHERE wisdom_idx = ?",
+                    (wisdom_idx,)
+                )
+                return {
+                    row[0]: {"status": row[1], "file_name": row[2], "image_url": row[3]}
+                    for row in cursor.fetchall()
+                }
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 상태 조회 오류: {e}")
+            return {}
+
+    def record(self, wisdom_idx, destination_key, file_name, result):
+        """
+        목적지별 게시 결과 기록 (시도 횟수 누적)
+
+        Args:
+            wisdom_idx (int): 명언 번호
+            destination_key (str): 목적지 키 (예: board:default)
+            file_name (str): output 기준 카드 경로
+            result (dict): {"success", "error", "image_url", "remote_id"} 형식의 결과
+        """
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.execute("""
+                    INSERT INTO publish_status
+                        (wisdom_idx, destination, status, file_name, image_url, remote_id, error, attempts, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+                    ON CONFLICT(wisdom_idx, destination) DO UPDATE SET
+                        status = excluded.status,
+                        file_name = excluded.file_name,
+                        image_url = COALESCE(excluded.image_url, publish_status.image_url),
+                        remote_id = COALESCE(excluded.remote_id, publish_status.remote_id),
+                        error = excluded.error,
+                        attempts = publish_status.attempts + 1,
+                        updated_at = excluded.updated_at
+                """, (
+                    wisdom_idx,
+                    destination_key,
+                    'done' if result["success"] else 'failed',
+                    file_name,
+                    result.get("image_url"),
+                    result.get("remote_id"),
+                    None if result["success"] else result.get("error"),
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                ))
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 상태 기록 오류: {e}")
+
+    def summary(self, destination_keys):
+        """
+        목적지별 게시 상태 집계
+
+        Args:
+            destination_keys (list): 결과에 항상 포함할 목적지 키 목록
+
+        Returns:
+            dict: {목적지 키: {"done": 건수, "failed": 건수}}
+        """
+        summary = {key: {"done": 0, "failed": 0} for key in destination_keys}
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT destination, status, COUNT(*) FROM publish_status GROUP BY destination, status")
+                for destination, status, count in cursor.fetchall():
+                    summary.setdefault(destination, {"done": 0, "failed": 0})[status] = count
+        except sqlite3.Error as e:
+            self.logger.error(f"게시 상태 집계 오류: {e}")
+        return summary
@@ -0,0 +1,189 @@
+import os
+import hashlib
+import tempfile
+import threading
+from utils.logger_util import LoggerUtil
+
+# 용량을 넘으면 max_bytes의 이 비율까지 줄여 저장할 때마다 정리하지 않도록 함
+EVICT_LOW_WATER = 0.9
+
+class RenderCache:
+    """
+    입력 내용 기반(content-addressed) 렌더 결과 캐시
+
+    (명언, 저자, 인물 이미지, 폰트, 렌더러 버전)이 같으면 항상 같은 카드가 만들어지므로
+    인코딩된 JPEG 바이트를 입력 해시로 저장해두고 재시도/반복 생성 시 디스크에서 바로 제공한다.
+    전체 용량이 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 max_bytes의 EVICT_LOW_WATER까지
+    삭제한다(LRU). 전체 용량은 첫 저장 때 한 번만 계산하고 이후에는 저장/삭제할 때마다 갱신하므로,
+    디렉토리 전체를 훑는 것은 용량을 넘었을 때뿐이다.
+    """
+
+    def __init__(self, cache_dir='output/.cache', max_bytes=None):
+        # 절대 경로로 변환
+        if not os.path.isabs(cache_dir):
+            self.cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), cache_dir)
+        else:
+            self.cache_dir = cache_dir
+
+        if max_bytes is None:
+            max_bytes = int(os.getenv("RENDER_CACHE_MAX_MB", "256")) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.logger = LoggerUtil().get_logger()
+
+        self._digest_cache = {}
+        self._lock = threading.Lock()
+        self._total_size = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def file_digest(self, path):
+        """
+        파일 내용의 sha256 해시 (경로, 수정 시각, 크기가 같으면 재계산하지 않음)
+
+        Args:
+            path (str): 파일 경로
+
+        Returns:
+            str: 16진수 해시 문자열
+        """
+        stat = os.stat(path)
+        cache_key = (path, stat.st_mtime_ns, stat.st_size)
+        digest = self._digest_cache.get(cache_key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._digest_cache[cache_key] = digest
+        return digest
+
+    def make_key(self, image_path, wisdom_quote, author, font_paths, renderer_version):
+        """
+        렌더링 입력으로부터 캐시 키 생성
+
+        Args:
+            image_path (str): 인물 이미지 경로
+            wisdom_quote (str): 명언 텍스트
+            author (str): 저자 표기
+            font_paths (list): 사용되는 폰트 파일 경로 목록
+            renderer_version (str): 레이아웃/렌더러 버전
+
+        Returns:
+            str: 캐시 키(sha256)
+        """
+        hasher = hashlib.sha256()
+        parts = [
+            str(renderer_version),
+            wisdom_quote,
+            author,
+            os.path.basename(image_path),  # 파일명에 텍스트 위치 정보가 포함됨
+            self.file_digest(image_path),
+        ]
+        parts.extend(self.file_digest(path) for path in font_paths)
+        for part in parts:
+            hasher.update(part.encode('utf-8'))
+            hasher.update(b'\0')
+        return hasher.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.jpeg")
+
+    def get(self, key):
+        """
+        캐시된 카드 이미지 조회
+
+        Args:
+            key (str): make_key()로 생성한 캐시 키
+
+        Returns:
+            bytes: 캐시된 JPEG 데이터, 없으면 None
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # LRU 순서 갱신 (atime은 noatime 마운트에서 갱신되지 않으므로 mtime 사용)
+            os.utime(path, None)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"렌더 캐시 읽기 실패: {path} - {e}")
+            return None
+
+    def put(self, key, data):
+        """
+        카드 이미지를 캐시에 저장하고 용량 초과 시 오래된 항목 정리
+
+        Args:
+            key (str): make_key()로 생성한 캐시 키
+            data (bytes): 인코딩된 JPEG 데이터
+        """
+        path = self._entry_path(key)
+        with self._lock:
+            if self._total_size is None:
+                self._total_size = sum(size for _, size, _ in self._scan())
+        try:
+            try:
+                replaced_size = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except OSError as e:
+            self.logger.warning(f"렌더 캐시 저장 실패: {path} - {e}")
+            return
+
+        with self._lock:
+            self._total_size += len(data) - replaced_size
+            if self._total_size > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """캐시 항목 목록 [(mtime, 크기, 경로)]"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.jpeg'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """오래된 항목부터 삭제해 전체 용량을 max_bytes × EVICT_LOW_WATER 이하로 줄임 (self._lock을 잡은 상태에서 호출)"""
+        # 다른 프로세스가 같은 캐시에 저장했을 수 있으므로 실제 용량을 다시 계산
+        entries = self._scan()
+        total_size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_LOW_WATER
+        if total_size <= self.max_bytes:
+            self._total_size = total_size
+            return
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total_size <= target:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+                removed += 1
+            except FileNotFoundError:
+                continue
+        self._total_size = total_size
+
+        self.logger.info(f"렌더 캐시 정리: {removed}개 항목 삭제 (현재 {total_size/1024/1024:.1f}MB)")
@@ -0,0 +1,144 @@
+import os
+import hashlib
+import sqlite3
+from datetime import datetime
+from utils.logger_util import LoggerUtil
+from wisdom_snapshot import PlanItem
+
+def text_digest(*texts):
+    """카드에 그려지는 텍스트들의 sha256 해시"""
+    hasher = hashlib.sha256()
+    for text in texts:
+        hasher.update(text.encode('utf-8'))
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+class ManifestEntry(PlanItem):
+    """매니페스트에 기록된 카드 (명언 + 카드 파일명과 다시 렌더링할 이유)"""
+    __slots__ = ("file_name", "reasons")
+
+    def __init__(self, file_name, image_path, reasons, record):
+        super().__init__(None, image_path, record)
+        self.file_name = file_name
+        self.reasons = reasons
+
+class RenderManifest:
+    """
+    output의 카드 파일별 렌더링 입력을 기록하는 매니페스트 (SQLite render_manifest 테이블)
+
+    카드마다 텍스트, 인물 이미지, 폰트 파일의 해시와 레이아웃 버전(ImageProcessor.layout_version)을
+    남겨두고, 레이아웃이나 입력이 바뀌었을 때 다시 렌더링해야 하는 카드만 골라낸다.
+    """
+
+    def __init__(self, db_manager, render_cache):
+        """
+        Args:
+            db_manager (DatabaseManager): wisdom_list가 있는 DB 관리자
+            render_cache (RenderCache): 파일 해시 계산에 사용할 렌더 캐시
+        """
+        self.db_manager = db_manager
+        self.db_path = db_manager.db_path
+        self.render_cache = render_cache
+        self.img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+        self.logger = LoggerUtil().get_logger()
+        self._initialize_table()
+
+    def _initialize_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS render_manifest (
+                file_name TEXT PRIMARY KEY,
+                wisdom_idx INTEGER NOT NULL,
+                image_file TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                portrait_hash TEXT NOT NULL,
+                font_hash TEXT NOT NULL,
+                layout_version TEXT NOT NULL,
+                rendered_at TEXT
+            )
+            ''')
+            conn.commit()
+
+    def _font_hash(self, font_paths):
+        return text_digest(*[self.render_cache.file_digest(path) for path in font_paths])
+
+    def record(self, file_name, wisdom_data, image_path, author, font_paths, layout_version):
+        """
+        카드 파일의 렌더링 입력 기록 (같은 파일을 다시 렌더링하면 갱신)
+
+        Args:
+            file_name (str): output 디렉토리 기준 카드 경로
+            wisdom_data (WisdomRecord): 명언
+            image_path (str): 인물 이미지 경로
+            author (str): 저자 표기
+            font_paths (list): 사용된 폰트 파일 경로 목록
+            layout_version (str): 레이아웃/렌더러 버전
+        """
+        try:
+            row = (
+                file_name,
+                wisdom_data.idx,
+                f"{os.path.basename(os.path.dirname(image_path))}/{os.path.basename(image_path)}",
+                text_digest(wisdom_data.wisdom_kr, author),
+                self.render_cache.file_digest(image_path),
+                self._font_hash(font_paths),
+                str(layout_version),
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO render_manifest
+                    (file_name, wisdom_idx, image_file, text_hash, portrait_hash, font_hash, layout_version, rendered_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, row)
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"렌더 매니페스트 기록 오류: {file_name} - {e}")
+
+    def entries(self, stale_only=False, font_paths=None, layout_version=None):
+        """
+        매니페스트 항목을 현재 입력과 비교해 조회
+
+        Args:
+            stale_only (bool): 입력이나 레이아웃이 바뀐 항목만 조회
+            font_paths (list): 현재 폰트 파일 경로 목록
+            layout_version (str): 현재 레이아웃/렌더러 버전
+
+        Returns:
+            list: ManifestEntry 목록 (명언 텍스트는 메모리 스냅샷에서 가져옴)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT file_name, image_file, text_hash, portrait_hash, font_hash, layout_version, wisdom_idx
+                FROM render_manifest
+                ORDER BY file_name
+            """)
+            rows = cursor.fetchall()
+
+        current_font_hash = self._font_hash(font_paths) if font_paths else None
+        result = []
+        for file_name, image_file, text_hash, portrait_hash, font_hash, version, wisdom_idx in rows:
+            record = self.db_manager.get_wisdom(wisdom_idx)
+            if record is None:
+                continue
+            image_path = os.path.join(self.img_dir, *image_file.split('/'))
+            reasons = []
+            if layout_version is not None and version != str(layout_version):
+                reasons.append('layout')
+            if text_digest(record.wisdom_kr, record.author) != text_hash:
+                reasons.append('text')
+            if current_font_hash is not None and font_hash != current_font_hash:
+                reasons.append('font')
+            try:
+                if self.render_cache.file_digest(image_path) != portrait_hash:
+                    reasons.append('portrait')
+            except OSError:
+                self.logger.warning(f"인물 이미지가 없어 다시 렌더링할 수 없습니다: {file_name} ({image_file})")
+                continue
+
+            if stale_only and not reasons:
+                continue
+            result.append(ManifestEntry(file_name, image_path, reasons, record))
+        return result
@@ -0,0 +1,245 @@
+import io
+import os
+import gc
+import queue
+import threading
+from utils.logger_util import LoggerUtil
+
+# 생산 스레드 종료 표시
+_DONE = object()
+
+def current_rss():
+    """
+    현재 프로세스의 RSS(바이트), 확인할 수 없는 플랫폼이면 None
+
+    /proc/self/statm을 읽으므로 리눅스에서만 실제 값을 돌려준다.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class MemoryCeilingExceeded(Exception):
+    """대기열을 비우고 GC를 돌려도 RSS가 상한을 넘는 경우"""
+    pass
+
+class StreamingBatch:
+    """
+    대량 배치를 제너레이터 단계로 흘려보내는 메모리 제한 파이프라인
+
+    명언 행 → 렌더링/인코딩(생산 스레드) → 압축/업로드/DB 갱신(소비 쪽)으로 한 장씩 흘려보내며,
+    두 단계 사이의 대기열 크기(queue_size)로 미리 만들어 둘 카드 수를 제한한다.
+    생산 스레드는 다음 카드를 렌더링하기 전에 RSS를 확인해 max_rss_mb를 넘으면 대기열이
+    빌 때까지 기다리고, 그래도 넘으면 배치를 중단한다. 각 단계는 다음 단계로 넘긴 뒤
+    이미지/바이트 참조를 바로 놓으므로 처리량과 무관하게 메모리 사용량이 일정하다.
+    """
+
+    def __init__(self, generator, queue_size=None, max_rss_mb=None, render_only=False):
+        """
+        Args:
+            generator (WisdomCardGenerator): 렌더링/업로드/DB 설정을 제공하는 생성기
+            queue_size (int): 렌더링을 마치고 업로드를 기다릴 수 있는 최대 카드 수 (기본값: STREAM_QUEUE_SIZE 또는 4)
+            max_rss_mb (int): 프로세스 RSS 상한(MB) (기본값: STREAM_MAX_RSS_MB 또는 512)
+            render_only (bool): 렌더링/인코딩/압축까지만 수행 (파일 저장, 업로드, DB 갱신 없음, 벤치마크용)
+        """
+        self.generator = generator
+        self.queue_size = queue_size or int(os.getenv("STREAM_QUEUE_SIZE", "4"))
+        self.max_rss = (max_rss_mb or int(os.getenv("STREAM_MAX_RSS_MB", "512"))) * 1024 * 1024
+        self.render_only = render_only
+        self.logger = LoggerUtil().get_logger()
+
+    def claimed_rows(self, count):
+        """게시 계획에서 queue_size개씩 필요할 때만 명언을 임대해 하나씩 내보냄"""
+        remaining = count
+        while remaining > 0:
+            # 업스트림 회로가 열리면 더 선점하지 않고 남은 작업은 대기열에 남겨둠
+            blocked = self.generator.blocked_upstream()
+            if blocked:
+                self.logger.warning(f"[{blocked}] 회로 차단 중 - 스트리밍 배치를 멈추고 남은 작업은 대기열에 남겨둡니다.")
+                return
+            items = self.generator.scheduler.claim_next(min(self.queue_size, remaining))
+            if not items:
+                return
+            remaining -= len(items)
+            for position, item in enumerate(items):
+                try:
+                    yield item
+                except GeneratorExit:
+                    # 배치가 중간에 멈추면 아직 넘기지 않은 명언의 임대를 바로 반납
+                    for unused in items[position + 1:]:
+                        self.generator.scheduler.release(unused, failed=False)
+                    raise
+
+    def run(self, count=None, rows=None):
+        """
+        배치 실행 (결과를 하나씩 내보내는 제너레이터)
+
+        Args:
+            count (int): 게시 계획에서 가져와 처리할 카드 수
+            rows (iterable): 직접 지정한 PlanItem 목록, 지정하면 count 무시
+
+        Yields:
+            dict: 카드별 처리 결과
+        """
+        if rows is None:
+            rows = self.claimed_rows(count or 0)
+
+        rendered = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(rows, rendered, stop), name="stream-render", daemon=True)
+        producer.start()
+
+        processed = 0
+        try:
+            while True:
+                entry = rendered.get()
+                if entry is _DONE:
+                    break
+                item, payload, error, attempt = entry
+                entry = None
+                result = self._consume(item, payload, error, attempt)
+                payload = None
+                processed += 1
+                if processed % 100 == 0:
+                    rss = current_rss()
+                    self.logger.info(f"스트리밍 배치 진행: {processed}장 (RSS {rss / 1024 / 1024:.0f}MB)" if rss else f"스트리밍 배치 진행: {processed}장")
+                yield result
+        finally:
+            # 소비 쪽이 중간에 멈춰도 생산 스레드가 대기열에서 막히지 않도록 정리
+            stop.set()
+            while producer.is_alive() or not rendered.empty():
+                try:
+                    entry = rendered.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if entry is not _DONE:
+                    self._abandon(entry[0])
+            producer.join()
+
+    def _produce(self, rows, rendered, stop):
+        try:
+            for item in rows:
+                # 이미 받은 명언은 처리하지 않고 멈추더라도 임대를 반납
+                if stop.is_set():
+                    self._abandon(item)
+                    return
+                try:
+                    self._wait_for_memory(rendered)
+                except MemoryCeilingExceeded:
+                    self._abandon(item)
+                    raise
+                attempt = self.generator.post_history.start(item.idx, "stream")
+                try:
+                    with attempt.stage("render"):
+                        payload = self._render(item)
+                    error = None
+                except Exception as e:
+                    payload = None
+                    error = str(e)
+                # 대기열이 가득 차 있으면 여기서 멈춰 렌더링 속도를 업로드 속도에 맞춤 (backpressure)
+                while not stop.is_set():
+                    try:
+                        rendered.put((item, payload, error, attempt), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                else:
+                    self._abandon(item)
+                payload = None
+        except MemoryCeilingExceeded as e:
+            self.logger.error(f"스트리밍 배치 중단: {e}")
+        except Exception as e:
+            self.logger.error(f"스트리밍 배치 입력 처리 중 오류 발생: {e}")
+        finally:
+            if hasattr(rows, 'close'):
+                rows.close()
+            while True:
+                try:
+                    rendered.put(_DONE, timeout=0.5)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        break
+
+    def _abandon(self, item):
+        """처리하지 못한 명언의 임대 반납"""
+        if not self.render_only:
+            self.generator.scheduler.release(item, failed=False)
+
+    def _wait_for_memory(self, rendered):
+        """RSS가 상한을 넘으면 GC 후 대기열이 빌 때까지 기다리고, 그래도 넘으면 예외 발생"""
+        rss = current_rss()
+        if rss is None or rss <= self.max_rss:
+            return
+        gc.collect()
+        while rendered.qsize() > 0 and current_rss() > self.max_rss:
+            threading.Event().wait(0.05)
+        rss = current_rss()
+        if rss > self.max_rss:
+            raise MemoryCeilingExceeded(f"RSS {rss / 1024 / 1024:.0f}MB > 상한 {self.max_rss / 1024 / 1024:.0f}MB")
+
+    def _render(self, item):
+        """카드 렌더링 (render_only면 인코딩된 바이트, 아니면 저장된 파일명 반환)"""
+        generator = self.generator
+        author = item.author
+        if self.render_only:
+            img = generator.image_processor.create_card(item.image_path, item.wisdom_kr, author)
+            try:
+                return generator._encode_image(img)
+            finally:
+                img.close()
+        return generator._render_card(item, item.image_path, author)
+
+    def _consume(self, item, payload, error, attempt):
+        generator = self.generator
+        if self.render_only:
+            if error or not payload:
+                return {"idx": item.idx, "success": False, "error": error or "이미지 저장 실패"}
+            compressed_image, _ = generator.api_util._compress_image(io.BytesIO(payload))
+            return {"idx": item.idx, "success": True, "size": len(compressed_image)}
+
+        result = self._upload(item, payload, error, attempt)
+        generator.post_history.record(attempt, result["success"], result.get("error"))
+        return result
+
+    def _upload(self, item, payload, error, attempt):
+        """저장된 카드를 압축/업로드하고 게시 계획 상태 반영 (단계별 시간은 attempt에 기록)"""
+        generator = self.generator
+        if error or not payload:
+            generator.scheduler.release(item)
+            return {"idx": item.idx, "success": False, "error": error or "이미지 저장 실패"}
+
+        output_filename = payload
+        attempt.file_name = output_filename
+        output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), generator.output_dir, output_filename)
+        if not generator.scheduler.mark_rendered(item):
+            return {"idx": item.idx, "success": False, "error": "임대 만료"}
+
+        try:
+            with attempt.stage("compress"):
+                compressed = generator.api_util._compress_image(output_path)
+        except Exception as e:
+            generator.scheduler.release(item)
+            return {"idx": item.idx, "success": False, "error": f"이미지 처리 실패: {output_path} - {e}"}
+        attempt.bytes = len(compressed[0])
+
+        with attempt.stage("upload"):
+            upload_result = generator.api_util.upload_wisdom_card(
+                image_path=output_path,
+                author=item.author,
+                wisdom_kr=item.wisdom_kr,
+                wisdom_en=item.wisdom_en,
+                name_kr=item.name_kr,
+                name_en=item.name_en,
+                compressed=compressed
+            )
+        compressed = None
+        attempt.image_url = upload_result.get("image_url")
+        attempt.remote_id = upload_result.get("post_id")
+        if not upload_result["success"] or not generator.db_manager.update_wisdom_file(item.idx, output_filename):
+            generator.scheduler.release(item)
+            return {"idx": item.idx, "success": False, "error": upload_result.get("error", "DB 업데이트 실패")}
+
+        generator.scheduler.complete(item)
+        return {"idx": item.idx, "success": True, "file_name": output_filename, "image_url": upload_result["image_url"]}
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from database_manager import DatabaseManager, text_trigrams, trigram_similarity
+from utils.logger_util import LoggerUtil
+
+def synthetic_library(count, seed=1):
+    """
+    서로 다른 가상 명언 count개 (한글/영문 단어 2만 개에서 Zipf 분포로 뽑아 실제 문장처럼 흔한 단어가 반복됨)
+    """
+    rnd = random.Random(seed)
+    syllables = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+    words_kr = [''.join(rnd.choices(syllables, k=rnd.randint(2, 4))) for _ in range(20000)]
+    words_en = [''.join(rnd.choices('abcdefghijklmnopqrstuvwxyz', k=rnd.randint(3, 9))) for _ in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(20000)]
+    return [
+        (
+            ' '.join(rnd.choices(words_kr, weights=weights, k=rnd.randint(6, 14))),
+            ' '.join(rnd.choices(words_en, weights=weights, k=rnd.randint(8, 18)))
+        )
+        for _ in range(count)
+    ]
+
+def pairwise_best(rows, wisdom_kr, wisdom_en):
+    """비교용: 모든 명언과 일일이 유사도 계산"""
+    grams_kr = text_trigrams(wisdom_kr)
+    grams_en = text_trigrams(wisdom_en)
+    return max(
+        max(trigram_similarity(grams_kr, text_trigrams(kr)), trigram_similarity(grams_en, text_trigrams(en)))
+        for kr, en in rows
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="유사 명언 검색 벤치마크 (FTS5 trigram 색인과 전체 비교 방식 비교)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 20000], help="가상 명언 수 (여러 개 지정 가능)")
+    parser.add_argument("--probes", type=int, default=30, help="검색할 유사 명언 수 (기존 명언의 끝을 조금 바꿔 만듦)")
+    parser.add_argument("--pairwise", action="store_true", help="전체 비교 방식도 측정 (probes 중 5개)")
+    args = parser.parse_args()
+
+    # 임시 DB 생성 로그는 출력하지 않음
+    LoggerUtil().get_logger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix='wisdom_dedup_') as work_dir:
+        for count in args.rows:
+            db_path = os.path.join(work_dir, f'{count}.db')
+            db = DatabaseManager(db_path)
+            library = synthetic_library(count)
+            with sqlite3.connect(db_path) as conn:
+                conn.executemany(
+                    "INSERT INTO wisdom_list (name_en, name_kr, wisdom_en, wisdom_kr) VALUES ('bench', '벤치', ?, ?)",
+                    [(en, kr) for kr, en in library]
+                )
+                conn.commit()
+
+                rnd = random.Random(count)
+                probes = [(kr[:-2] + "다", en) for kr, en in rnd.sample(library, args.probes)]
+                cursor = conn.cursor()
+                started = time.perf_counter()
+                found = sum(
+                    any(match["wisdom_en"] == en for match in db.find_similar_wisdoms(kr, en, cursor=cursor))
+                    for kr, en in probes
+                )
+                elapsed = (time.perf_counter() - started) / len(probes)
+            print(f"명언 {count}개: FTS5 색인 {elapsed * 1000:.1f}ms/건 (원본 검출 {found}/{len(probes)})")
+
+            if args.pairwise:
+                started = time.perf_counter()
+                for kr, en in probes[:5]:
+                    pairwise_best(library, kr, en)
+                pairwise = (time.perf_counter() - started) / 5
+                print(f"  전체 비교: {pairwise * 1000:.1f}ms/건 ({pairwise / elapsed:.0f}배)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import re
+import sys
+import json
+import threading
+import itertools
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_faults import FaultInjector
+
+# 업로드 본문에서 첫 이미지 파트의 파일 확장자
+IMAGE_FILENAME = re.compile(rb'name="image\[0\]"; filename="[^"]*\.(\w+)"')
+
+IMAGE_CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+class FakeBoardAPI:
+    """
+    로컬 테스트용 가짜 게시판 API 서버
+
+    POST /api/board-content(multipart)를 받아 업로드된 이미지 URL을 응답하고, 그 URL로 오는
+    HEAD/GET(인스타그램 게시 전 접근성 확인)에 응답한다. faults는 게시글 등록 요청에,
+    image_faults는 이미지 URL 요청에 지연과 500/429 응답을 주입한다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, faults=None, image_faults=None):
+        self.faults = faults or FaultInjector()
+        self.image_faults = image_faults or FaultInjector()
+        self.request_counts = Counter()
+        # 이미지 URL별 요청 수 (접근성 확인 재시도 집계용)
+        self.image_requests = Counter()
+        self.bytes_received = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _record_upload(self, size):
+        with self._lock:
+            self.request_counts['board-content'] += 1
+            self.bytes_received += size
+            return next(self._ids)
+
+    def _count(self, key, image_path=None):
+        with self._lock:
+            self.request_counts[key] += 1
+            if image_path:
+                self.image_requests[image_path] += 1
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_image(self):
+                fault = api.image_faults.apply()
+                if fault is not None:
+                    self.send_response(fault[0])
+                    for key, value in fault[2].items():
+                        self.send_header(key, value)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                extension = self.path.rsplit('.', 1)[-1].lower()
+                self.send_response(200)
+                self.send_header('Content-Type', IMAGE_CONTENT_TYPES.get(extension, 'image/jpeg'))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_HEAD(self):
+                path = urlparse(self.path).path
+                api._count('HEAD', path)
+                self._send_image()
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                api._count('GET', path)
+                self._send_image()
+
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                # 본문은 크기와 첫 이미지의 확장자만 확인하고 버림 (이미지 URL 확장자를 업로드한 포맷에 맞춤)
+                remaining = length
+                extension = "jpg"
+                head = b""
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, 65536))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    if len(head) < 65536:
+                        head += chunk
+                match = IMAGE_FILENAME.search(head)
+                if match:
+                    extension = match.group(1).decode('ascii').lower()
+
+                if parsed.path.rstrip('/') != '/api/board-content':
+                    api._count('unknown')
+                    self._send_json(404, {"success": False, "message": f"Unknown path: {parsed.path}"})
+                    return
+
+                post_id = api._record_upload(length)
+                fault = api.faults.apply()
+                if fault is not None:
+                    self._send_json(*fault)
+                    return
+                self._send_json(200, {
+                    "success": True,
+                    "message": "게시글이 등록되었습니다.",
+                    "data": {"id": post_id, "image_urls": [f"{api.url}/storage/board/{post_id}.{extension}"]}
+                })
+
+        return Handler
@@ -0,0 +1,56 @@
+import time
+import random
+import threading
+from collections import Counter
+
+class FaultInjector:
+    """
+    가짜 API 서버 공용 지연/오류/요청 한도 응답 주입기
+
+    요청마다 latency ± jitter 만큼 지연한 뒤, rate_limit_rate 확률로 429(Retry-After 포함),
+    error_rate 확률로 500을 응답하도록 결정한다. 주입한 응답 수는 injected에 집계된다.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1, seed=None):
+        """
+        Args:
+            latency (float): 요청당 기본 지연(초)
+            jitter (float): 지연에 더할 무작위 편차의 최대값(초)
+            error_rate (float): 500 응답 확률 (0~1)
+            rate_limit_rate (float): 429 응답 확률 (0~1)
+            retry_after (int): 429 응답의 Retry-After(초)
+            seed (int): 재현용 난수 시드
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.injected = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self):
+        """
+        지연을 적용하고 주입할 오류 응답 결정
+
+        Returns:
+            tuple: 주입할 (상태 코드, 응답 dict, 추가 헤더), 정상 처리하면 None
+        """
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+            roll = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.injected[429] += 1
+            body = {"success": False, "message": "Too Many Requests", "error": {"message": "Application request limit reached", "code": 4}}
+            return 429, body, {"Retry-After": str(self.retry_after)}
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.injected[500] += 1
+            body = {"success": False, "message": "Internal Server Error", "error": {"message": "An unexpected error has occurred.", "code": 2}}
+            return 500, body, {}
+        return None
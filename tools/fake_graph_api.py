@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import threading
+import itertools
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_faults import FaultInjector
+
+class FakeGraphAPI:
+    """
+    로컬 테스트용 가짜 Graph API 서버
+
+    /{version}/{account}/media, /{version}/{account}/media_publish, 배치 엔드포인트(POST /),
+    게시 한도 조회(GET content_publishing_limit)와 이미지 URL 확인용 HEAD 요청을 처리한다. fail_image_urls에 포함된 이미지 URL로 컨테이너를
+    만들거나 JPEG가 아닌 이미지 URL을 넘기면 실제 API처럼 오류를 응답한다(부분 실패 재현). faults를 지정하면 API 요청(HEAD 제외)마다
+    지연과 500/429 응답을 주입한다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fail_image_urls=None, faults=None):
+        self.fail_image_urls = set(fail_image_urls or [])
+        self.faults = faults or FaultInjector()
+        self.request_counts = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _next_id(self):
+        with self._lock:
+            return str(next(self._ids))
+
+    def _count(self, key):
+        with self._lock:
+            self.request_counts[key] += 1
+
+    def handle_call(self, path, params):
+        """
+        단일 Graph API 호출 처리
+
+        Returns:
+            tuple: (HTTP 상태 코드, 응답 dict)
+        """
+        if path.endswith('/media_publish'):
+            if not params.get('creation_id'):
+                return 400, {"error": {"message": "creation_id is required", "code": 100}}
+            return 200, {"id": f"post_{self._next_id()}"}
+
+        if path.endswith('/media'):
+            # 실제 Graph API처럼 JPEG가 아닌 이미지 URL은 거부
+            image_url = params.get('image_url') or ''
+            if image_url in self.fail_image_urls or not urlparse(image_url).path.lower().endswith(('.jpg', '.jpeg')):
+                return 400, {"error": {"message": "Only photo or video can be accepted as media type.", "code": 9004}}
+            return 200, {"id": f"container_{self._next_id()}"}
+
+        return 404, {"error": {"message": f"Unknown path: {path}", "code": 803}}
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _inject_fault(self):
+                """주입할 오류가 있으면 응답하고 True 반환"""
+                fault = api.faults.apply()
+                if fault is None:
+                    return False
+                self._send_json(*fault)
+                return True
+
+            def do_HEAD(self):
+                api._count('HEAD')
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                self.end_headers()
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                api._count(parsed.path.rsplit('/', 1)[-1])
+                if self._inject_fault():
+                    return
+                if parsed.path.endswith('/content_publishing_limit'):
+                    with api._lock:
+                        used = api.request_counts['media_publish']
+                    self._send_json(200, {"data": [{"quota_usage": used, "config": {"quota_total": 25, "quota_duration": 86400}}]})
+                    return
+                self._send_json(404, {"error": {"message": f"Unknown path: {parsed.path}", "code": 803}})
+
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length).decode('utf-8')
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                params.update({k: v[0] for k, v in parse_qs(body).items()})
+
+                if parsed.path == '/':
+                    api._count('batch')
+                    if self._inject_fault():
+                        return
+                    responses = []
+                    for item in json.loads(params.get('batch', '[]')):
+                        item_params = {k: v[0] for k, v in parse_qs(item.get('body', '')).items()}
+                        status, result = api.handle_call('/' + item['relative_url'], item_params)
+                        responses.append({"code": status, "body": json.dumps(result)})
+                    self._send_json(200, responses)
+                    return
+
+                api._count(parsed.path.rsplit('/', 1)[-1])
+                if self._inject_fault():
+                    return
+                status, result = api.handle_call(parsed.path, params)
+                self._send_json(status, result)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    from instagram_post import InstagramAPI
+
+    fake = FakeGraphAPI().start()
+    broken_url = f"{fake.url}/broken.jpg"
+    fake.fail_image_urls.add(broken_url)
+    os.environ["INSTAGRAM_GRAPH_URL"] = fake.url
+    os.environ.setdefault("INSTAGRAM_ACCESS_TOKEN", "fake-token")
+    os.environ.setdefault("INSTAGRAM_ACCOUNT_ID", "1234")
+
+    api = InstagramAPI()
+    image_url = f"{fake.url}/card.jpeg"
+
+    print("캐러셀:", api.post_image([image_url, image_url, image_url], "carousel"))
+    print("배치 게시:", api.post_images_batch([
+        (image_url, "첫 번째"),
+        (broken_url, "실패 예정"),
+        (image_url, "세 번째"),
+    ]))
+    print("요청 수:", dict(fake.request_counts))
+    fake.stop()
@@ -0,0 +1,235 @@
+import os
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from fake_faults import FaultInjector
+from fake_board_api import FakeBoardAPI
+from fake_graph_api import FakeGraphAPI
+from stream_bench import synthetic_rows
+
+def percentile(values, pct):
+    """최근접 순위 방식 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def format_latency(label, values):
+    if not values:
+        return f"  {label}: -"
+    return (f"  {label}: p50 {percentile(values, 50) * 1000:7.0f}ms  p95 {percentile(values, 95) * 1000:7.0f}ms  "
+            f"p99 {percentile(values, 99) * 1000:7.0f}ms  max {max(values) * 1000:7.0f}ms")
+
+def prepare_environment(work_dir, board, graph):
+    """실제 서버와 DB 대신 가짜 서버와 임시 DB를 쓰도록 환경 변수 설정 (앱 모듈 임포트 전에 호출)"""
+    os.environ.update({
+        "BASE_URL": board.url,
+        "INSTAGRAM_GRAPH_URL": graph.url,
+        "INSTAGRAM_ACCESS_TOKEN": "load-test-token",
+        "INSTAGRAM_ACCOUNT_ID": "1234",
+        # 클라이언트 측 한도 대신 가짜 서버가 주입하는 429로 한도 상황을 재현
+        "RATE_LIMIT_BOARD": "1000000/1",
+        "RATE_LIMIT_INSTAGRAM": "1000000/1",
+        "RATE_LIMIT_INSTAGRAM_PUBLISH": "1000000/1",
+        # 백그라운드 보충 프로세스와 외부 스토리지는 측정 대상에서 제외
+        "PRERENDER_POOL_SIZE": "0",
+        "STORAGE_BACKEND": "",
+    })
+
+    from utils.rate_limiter import RateLimiter
+    from utils.circuit_breaker import CircuitBreaker
+    # 싱글톤이므로 앱 객체보다 먼저 임시 DB 경로로 생성
+    RateLimiter(os.path.join(work_dir, 'sqlite.db'))
+    return CircuitBreaker(os.path.join(work_dir, 'sqlite.db'))
+
+def seed_wisdoms(db_path, count):
+    """임시 DB의 CSV 명언은 게시 완료로 돌리고, 번호를 붙인 가상 명언 count개를 추가"""
+    with sqlite3.connect(db_path, timeout=30) as conn:
+        conn.execute("UPDATE wisdom_list SET status = 'uploaded'")
+        conn.executemany(
+            "INSERT INTO wisdom_list (name_en, name_kr, wisdom_en, wisdom_kr, reg_date, status) VALUES (?, ?, ?, ?, datetime('now'), 'pending')",
+            [(row.name_en, row.name_kr, row.wisdom_en, row.wisdom_kr) for row in synthetic_rows(count)]
+        )
+        conn.commit()
+
+class LoadTest:
+    """
+    워커 스레드마다 WisdomCardGenerator를 두고 카드 N장을 생성 → 게시판 업로드 → 인스타그램 게시까지 처리하며
+    카드별/단계별 지연을 측정
+    """
+
+    def __init__(self, work_dir, cards, workers, publish=True):
+        self.work_dir = work_dir
+        self.cards = cards
+        self.workers = workers
+        self.publish = publish
+        self.db_path = os.path.join(work_dir, 'sqlite.db')
+        self.output_dir = os.path.join(work_dir, 'output')
+        self.latencies = {"card": [], "board": [], "instagram": []}
+        self.failures = {"board": 0, "instagram": 0, "none": 0}
+        self._remaining = cards
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _generator(self):
+        """스레드별 생성기 (generate_and_post가 현재 명언을 인스턴스에 보관하므로 공유하지 않음)"""
+        generator = getattr(self._local, 'generator', None)
+        if generator is None:
+            import main as app
+
+            generator = app.WisdomCardGenerator(output_dir=self.output_dir, db_path=self.db_path)
+            api_util = generator.api_util
+            upload = api_util.upload_wisdom_card
+
+            # 게시판 업로드 구간 시간과 응답의 이미지 URL 기록
+            def timed_upload(*args, **kwargs):
+                started = time.perf_counter()
+                result = upload(*args, **kwargs)
+                self._local.board = (time.perf_counter() - started, result)
+                return result
+
+            api_util.upload_wisdom_card = timed_upload
+
+            if self.publish:
+                # 인스타그램 게시 구간 시간과 결과 기록 (게시판 이미지 URL을 그대로 넘기므로 JPEG여야 함)
+                instagram_api = generator.instagram_api
+                post_image = instagram_api.post_image
+
+                def timed_post(*args, **kwargs):
+                    started = time.perf_counter()
+                    result = post_image(*args, **kwargs)
+                    self._local.instagram = (time.perf_counter() - started, result)
+                    return result
+
+                instagram_api.post_image = timed_post
+            self._local.generator = generator
+        return generator
+
+    def _take(self):
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    def _record(self, key, value):
+        with self._lock:
+            self.latencies[key].append(value)
+
+    def _fail(self, stage):
+        with self._lock:
+            self.failures[stage] += 1
+
+    def _worker(self):
+        generator = self._generator()
+        while self._take():
+            self._local.board = None
+            self._local.instagram = None
+            started = time.perf_counter()
+            ok = generator.generate_and_post(publish_instagram=self.publish)
+            board = self._local.board
+            if board is None:
+                # 게시 계획이 비었거나 업로드 전에 실패
+                self._fail("none")
+                continue
+            self._record("board", board[0])
+            if not board[1]["success"]:
+                self._fail("board")
+                continue
+
+            if self.publish:
+                instagram = self._local.instagram
+                if instagram is not None:
+                    self._record("instagram", instagram[0])
+                if not ok:
+                    self._fail("instagram")
+                    continue
+            elif not ok:
+                self._fail("board")
+                continue
+            self._record("card", time.perf_counter() - started)
+
+    def run(self):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for future in [pool.submit(self._worker) for _ in range(self.workers)]:
+                future.result()
+        return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 게시판/Graph API 서버로 카드 생성→업로드→게시 처리량과 지연을 측정하는 부하 테스트 (실제 서버와 DB는 사용하지 않음)")
+    parser.add_argument("--cards", type=int, default=50, help="처리할 카드 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 처리할 워커 스레드 수")
+    parser.add_argument("--latency-ms", type=float, default=50, help="가짜 서버 요청당 기본 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="기본 지연에 더할 무작위 편차 최대값(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="게시판/Graph API 요청의 500 응답 확률 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="게시판/Graph API 요청의 429 응답 확률 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--image-error-rate", type=float, default=0.0, help="이미지 URL 접근성 확인(HEAD)의 500 응답 확률 (0~1)")
+    parser.add_argument("--no-publish", action="store_true", help="인스타그램 게시 단계 생략 (게시판 업로드까지만)")
+    parser.add_argument("--seed", type=int, default=None, help="오류 주입 난수 시드")
+    args = parser.parse_args()
+
+    def faults(error_rate, rate_limit_rate, offset):
+        return FaultInjector(
+            latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+            error_rate=error_rate, rate_limit_rate=rate_limit_rate, retry_after=args.retry_after,
+            seed=None if args.seed is None else args.seed + offset
+        )
+
+    board = FakeBoardAPI(
+        faults=faults(args.error_rate, args.rate_limit_rate, 0),
+        image_faults=faults(args.image_error_rate, 0.0, 1)
+    ).start()
+    graph = FakeGraphAPI(faults=faults(args.error_rate, args.rate_limit_rate, 2)).start()
+
+    try:
+        with tempfile.TemporaryDirectory(prefix='wisdom_load_') as work_dir:
+            circuit_breaker = prepare_environment(work_dir, board, graph)
+
+            from database_manager import DatabaseManager
+            DatabaseManager(os.path.join(work_dir, 'sqlite.db'))
+            seed_wisdoms(os.path.join(work_dir, 'sqlite.db'), args.cards)
+
+            test = LoadTest(work_dir, args.cards, args.workers, publish=not args.no_publish)
+            # 카드별 로그는 측정에서 제외 (실패는 단계별로 집계해 출력)
+            logging.getLogger('MQLogger').setLevel(logging.CRITICAL)
+            print(f"부하 테스트: 카드 {args.cards}장, 워커 {args.workers}개, 지연 {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+                  f"500 {args.error_rate:.0%}, 429 {args.rate_limit_rate:.0%}, 이미지 확인 500 {args.image_error_rate:.0%}")
+            elapsed = test.run()
+            circuits = circuit_breaker.get_status()
+    finally:
+        board.stop()
+        graph.stop()
+
+    completed = len(test.latencies["card"])
+    head_retries = sum(count - 1 for count in board.image_requests.values() if count > 1)
+    print(f"\n완료: {completed}/{args.cards}장 (게시판 실패 {test.failures['board']}, 인스타그램 실패 {test.failures['instagram']}, "
+          f"미처리(회로 차단 등) {test.failures['none']}), {elapsed:.1f}초")
+    print(f"처리량: {completed / elapsed:.2f}장/초")
+    print("지연:")
+    print(format_latency("카드 전체", test.latencies["card"]))
+    print(format_latency("게시판 업로드", test.latencies["board"]))
+    print(format_latency("인스타그램 게시", test.latencies["instagram"]))
+    print("재시도/오류:")
+    print(f"  이미지 URL 확인 재시도 {head_retries}회")
+    print(f"  주입된 응답: 게시판 {dict(board.faults.injected)}, Graph API {dict(graph.faults.injected)}, 이미지 URL {dict(board.image_faults.injected)}")
+    circuit_states = ", ".join(f"{name} {info['state']}" for name, info in circuits.items())
+    print(f"  회로 차단기: {circuit_states or '-'}")
+    print(f"요청 수: 게시판 {dict(board.request_counts)}, Graph API {dict(graph.request_counts)}")
+    print(f"업로드 전송량: {board.bytes_received / 1024:.1f}KB (카드당 {board.bytes_received / 1024 / max(1, board.request_counts['board-content']):.1f}KB)")
+    return 0 if completed == args.cards else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
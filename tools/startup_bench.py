@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정 대상 코드: main 모듈 임포트 + 생성기 생성 (cron 1회 실행의 시작 구간)
+STARTUP_CODE = "import main; main.WisdomCardGenerator()"
+
+def measure_wall_time(code, runs):
+    """새 인터프리터로 code를 runs번 실행한 wall time(초) 목록"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def measure_import_time(code):
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        list: (누적 시간(us), 자체 시간(us), 모듈명) 목록
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # 이름 앞의 공백 수가 임포트 깊이를 나타냄 (구분자 뒤 공백 1칸 제외)
+        entries.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py 시작 시간 벤치마크 (-X importtime 기반)")
+    parser.add_argument("--runs", type=int, default=10, help="wall time 측정 반복 횟수")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 임포트 수")
+    parser.add_argument("--code", default=STARTUP_CODE, help="측정할 파이썬 코드")
+    args = parser.parse_args()
+
+    baseline = measure_wall_time("pass", args.runs)
+    timings = measure_wall_time(args.code, args.runs)
+    entries = measure_import_time(args.code)
+
+    print(f"측정 코드: {args.code}")
+    print(f"인터프리터 기본 시작: 중앙값 {statistics.median(baseline) * 1000:.1f}ms")
+    print(f"시작 시간: 중앙값 {statistics.median(timings) * 1000:.1f}ms, 최소 {min(timings) * 1000:.1f}ms ({args.runs}회)")
+
+    top_level = [entry for entry in entries if not entry[2].startswith(" ")]
+    print(f"최상위 임포트 합계: {sum(entry[0] for entry in top_level) / 1000:.1f}ms")
+    print(f"\n누적 임포트 시간 상위 {args.top}개:")
+    for cumulative_us, self_us, name in sorted(entries, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}ms (자체 {self_us / 1000:6.1f}ms)  {name.strip()}")
+
+if __name__ == "__main__":
+    main()
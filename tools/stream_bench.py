@@ -0,0 +1,88 @@
+import os
+import sys
+import csv
+import time
+import logging
+import argparse
+import itertools
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from streaming_batch import StreamingBatch, current_rss
+from wisdom_snapshot import WisdomRecord, PlanItem
+
+def synthetic_rows(count):
+    """
+    wisdom.csv의 명언과 img/<인물> 이미지를 조합한 가상의 명언 count개를 하나씩 생성
+
+    번호를 붙여 모든 텍스트가 달라지므로 렌더 캐시나 폰트 캐시 적중으로 결과가 왜곡되지 않는다.
+    """
+    with open(os.path.join(ROOT_DIR, 'wisdom.csv'), encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        quotes = [row for row in reader if len(row) == 4]
+
+    img_dir = os.path.join(ROOT_DIR, 'img')
+    portraits = {}
+    for name_en, _, _, _ in quotes:
+        folder = os.path.join(img_dir, name_en)
+        if name_en not in portraits and os.path.isdir(folder):
+            portraits[name_en] = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.jpg'))
+    quotes = [row for row in quotes if portraits.get(row[0])]
+
+    for i, (name_en, name_kr, wisdom_en, wisdom_kr) in enumerate(itertools.islice(itertools.cycle(quotes), count)):
+        images = portraits[name_en]
+        yield PlanItem(None, images[i % len(images)], WisdomRecord(i + 1, name_en, name_kr, f"{wisdom_kr} ({i + 1})", wisdom_en))
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 배치 메모리 벤치마크 (가상 명언으로 렌더링/인코딩/압축, 업로드와 DB 갱신 없음)")
+    parser.add_argument("--count", type=int, default=10000, help="처리할 가상 명언 수")
+    parser.add_argument("--sample", type=int, default=500, help="RSS 측정 간격(장)")
+    parser.add_argument("--warmup", type=int, default=200, help="기준 RSS를 잡기 전 처리할 장 수 (폰트/모듈 로딩 제외)")
+    parser.add_argument("--max-growth-mb", type=float, default=32, help="기준 이후 RSS 증가 허용치(MB), 넘으면 종료 코드 1")
+    args = parser.parse_args()
+
+    if current_rss() is None:
+        print("이 플랫폼에서는 RSS를 측정할 수 없습니다 (/proc/self/statm 필요).")
+        return 2
+
+    import main as app
+
+    generator = app.WisdomCardGenerator()
+    # 카드마다 남는 INFO 로그는 측정에서 제외
+    logging.getLogger('MQLogger').setLevel(logging.WARNING)
+    batch = StreamingBatch(generator, render_only=True)
+
+    baseline = None
+    peak = 0
+    failures = 0
+    processed = 0
+    started = time.perf_counter()
+    for processed, result in enumerate(batch.run(rows=synthetic_rows(args.count)), start=1):
+        if not result["success"]:
+            failures += 1
+        rss = current_rss()
+        if processed == args.warmup:
+            baseline = rss
+        if baseline is not None:
+            peak = max(peak, rss)
+        if processed % args.sample == 0:
+            print(f"{processed:6d}장  RSS {rss / 1024 / 1024:7.1f}MB  ({processed / (time.perf_counter() - started):.1f}장/초)")
+
+    elapsed = time.perf_counter() - started
+    if baseline is None:
+        print(f"처리된 카드({processed}장)가 warmup({args.warmup}장)보다 적습니다.")
+        return 2
+
+    growth = (peak - baseline) / 1024 / 1024
+    print(f"\n처리: {args.count}장 (실패 {failures}장), {elapsed:.1f}초")
+    print(f"기준 RSS({args.warmup}장 후): {baseline / 1024 / 1024:.1f}MB, 최대: {peak / 1024 / 1024:.1f}MB, 증가: {growth:.1f}MB")
+    if growth > args.max_growth_mb:
+        print(f"❌ RSS 증가가 허용치({args.max_growth_mb}MB)를 넘었습니다.")
+        return 1
+    print("✨ RSS가 일정하게 유지되었습니다.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SAMPLE_QUOTE = "주식시장은 인내심 없는 사람의 돈을 인내심 있는 사람에게 옮기는 도구다. 기다리는 사람에게 기회가 온다."
+SAMPLE_AUTHOR = "워렌 버핏 Warren Buffett"
+
+def render_naive(renderer, image_path, quote, author, output_path):
+    """비교용: 프레임마다 확대한 배경 위에 보이는 줄 전체를 PIL로 다시 그려 합성"""
+    import cv2
+    import numpy as np
+    from PIL import Image, ImageDraw
+    from video_card import FADE_SECONDS
+
+    processor = renderer.image_processor
+    base = renderer._zoom_base(image_path)
+    items = processor.layout_text(image_path, quote, author)
+    starts = renderer._reveal_times(len(items))
+    shadow = max(1, round(2 * processor.scale))
+    frame_count = int(round(renderer.fps * renderer.duration))
+
+    writer, _ = renderer._open_writer(output_path, processor.card_size)
+    try:
+        for index in range(frame_count):
+            t = index / renderer.fps
+            img = Image.fromarray(cv2.cvtColor(renderer._background_frame(base, t), cv2.COLOR_BGR2RGB)).convert('RGBA')
+            layer = Image.new('RGBA', img.size, (0, 0, 0, 0))
+            draw = ImageDraw.Draw(layer)
+            for (text, font, (x, y)), start in zip(items, starts):
+                if t <= start:
+                    continue
+                alpha = int(255 * min(1.0, (t - start) / FADE_SECONDS))
+                draw.text((x + shadow, y + shadow), text, fill=(0, 0, 0, alpha), font=font)
+                draw.text((x, y), text, fill=(255, 255, 255, alpha), font=font)
+            img = Image.alpha_composite(img, layer).convert('RGB')
+            writer.write(cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR))
+    finally:
+        writer.release()
+    return frame_count
+
+def main():
+    parser = argparse.ArgumentParser(description="영상 카드 렌더링 벤치마크 (레이어 캐시 방식과 프레임마다 전체를 다시 그리는 방식 비교)")
+    parser.add_argument("--image", default=None, help="인물 이미지 경로 (기본값: img 아래 첫 이미지)")
+    parser.add_argument("--size", type=int, default=None, help="카드 크기(px) (기본값: CARD_SIZE 또는 600)")
+    parser.add_argument("--fps", type=int, default=30, help="초당 프레임 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="영상 길이(초)")
+    parser.add_argument("--naive", action="store_true", help="프레임마다 전체를 다시 그리는 방식도 측정")
+    args = parser.parse_args()
+
+    from image_processor import ImageProcessor
+    from video_card import VideoCardRenderer
+
+    image_path = args.image or sorted(glob.glob(os.path.join(ROOT_DIR, 'img', '*', '*_*.jpg')))[0]
+    processor = ImageProcessor(card_size=args.size)
+    renderer = VideoCardRenderer(processor, fps=args.fps, duration=args.duration)
+
+    with tempfile.TemporaryDirectory(prefix='wisdom_video_') as work_dir:
+        print(f"영상 카드: {processor.card_size}px, {args.fps}fps, {args.duration:.0f}초, 인물 이미지 {image_path}")
+
+        started = time.perf_counter()
+        result = renderer.render(image_path, SAMPLE_QUOTE, SAMPLE_AUTHOR, os.path.join(work_dir, 'layered.mp4'))
+        elapsed = time.perf_counter() - started
+        size_kb = os.path.getsize(result['path']) / 1024
+        print(f"  레이어 캐시: {elapsed:.2f}초 ({result['frames'] / elapsed:.0f}프레임/초, {result['codec']}, {size_kb:.0f}KB)")
+
+        if args.naive:
+            started = time.perf_counter()
+            frames = render_naive(renderer, image_path, SAMPLE_QUOTE, SAMPLE_AUTHOR, os.path.join(work_dir, 'naive.mp4'))
+            naive_elapsed = time.perf_counter() - started
+            print(f"  전체 다시 그리기: {naive_elapsed:.2f}초 ({frames / naive_elapsed:.0f}프레임/초, {naive_elapsed / elapsed:.1f}배)")
+
+if __name__ == "__main__":
+    main()
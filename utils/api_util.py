@@ -1,9 +1,10 @@
 import requests
 from typing import List, Optional
 import os
-from PIL import Image
-import io
 from utils.logger_util import LoggerUtil
+from utils.rate_limiter import RateLimiter
+from utils.circuit_breaker import CircuitBreaker
+from utils.image_encoder import ImageEncoder, destination_formats, replace_extension
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -17,8 +18,13 @@ class ApiError(Exception):
         super().__init__(f"API Error (Status: {status_code}): {message}")
 
 class ApiUtil:
-    def __init__(self):
-        base_url = os.getenv("BASE_URL")
+    def __init__(self, base_url: Optional[str] = None, name: Optional[str] = None):
+        """
+        Args:
+            base_url (str): 게시판 서버 주소 (기본값: BASE_URL 환경 변수)
+            name (str): 목적지 이름 (여러 게시판에 게시할 때 속도 제한/회로 차단 상태를 따로 관리)
+        """
+        base_url = base_url or os.getenv("BASE_URL")
         if not base_url:
             raise EnvironmentError("환경 변수 'BASE_URL'가 설정되어 있지 않습니다.")
 
@@ -30,42 +36,66 @@ class ApiUtil:
         self.max_file_size = 1 * 1024 * 1024  # 1MB
         self.max_width = 800  # 최대 너비
         self.logger = LoggerUtil().get_logger()
+        # 속도 제한 버킷/회로 차단기 이름 (기본 게시판은 board, 그 외는 board:<이름>)
+        self.upstream = f"board:{name}" if name else "board"
+        self.rate_limiter = RateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.timeout = float(os.getenv("BOARD_TIMEOUT", "30"))
+        self.image_encoder = ImageEncoder()
+
+    def _compress_image(self, image_path: str, destination: str = "board"):
+        """
+        이미지 압축 (큰 JPEG는 축소 배율로 디코딩한 뒤 최종 크기로 리사이즈)
+
+        목적지의 후보 포맷(BOARD_IMAGE_FORMATS 등, 기본값 webp,jpeg) 중 max_file_size 이하인
+        가장 작은 결과를 고른다.
+
+        Args:
+            image_path (str | file): 이미지 경로 또는 파일 객체
+            destination (str): 목적지 이름 (board, instagram)
+
+        Returns:
+            tuple: (이미지 바이트, 포맷)
+        """
+        from PIL import Image
+        from utils.image_decode import open_reduced
 
-    def _compress_image(self, image_path: str):
-        """이미지 압축"""
         try:
-            with Image.open(image_path) as img:
+            with open_reduced(image_path, self.max_width) as img:
                 # 이미지 크기 조정
                 if img.width > self.max_width:
                     ratio = self.max_width / img.width
                     new_height = int(img.height * ratio)
                     img = img.resize((self.max_width, new_height), Image.Resampling.LANCZOS)
+
+                result = self.image_encoder.encode(img, destination_formats(destination), self.max_file_size)
+                compressed_image = result["data"]
                 
-                # 이미지 품질 조정
-                buffer = io.BytesIO()
-                format = img.format if img.format else 'PNG'
-                
-                if format == 'PNG':
-                    img.save(buffer, format=format, optimize=True)
-                else:
-                    img.save(buffer, format=format, quality=85, optimize=True)
-                
-                compressed_image = buffer.getvalue()
-                
-                # 압축 후에도 크기가 큰 경우 추가 압축
-                quality = 85
-                while len(compressed_image) > self.max_file_size and quality > 30:
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='JPEG', quality=quality, optimize=True)
-                    compressed_image = buffer.getvalue()
-                    quality -= 10
-                
-                self.logger.info(f"이미지 압축 완료: {image_path} (크기: {len(compressed_image)/1024:.1f}KB)")
-                return compressed_image, format.lower()
+                self.logger.info(f"이미지 압축 완료: {image_path} ({result['format']}, 품질 {result['quality']}, 크기: {len(compressed_image)/1024:.1f}KB)")
+                return compressed_image, result["format"]
         except Exception as e:
             self.logger.error(f"이미지 압축 실패: {image_path} - {str(e)}")
             raise
 
+    def _post_board(self, url: str, **kwargs):
+        """
+        게시판 API POST 요청 (속도 제한, 회로 차단기, 타임아웃 적용)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있어 요청을 보내지 않은 경우 (requests.RequestException 하위 클래스)
+            requests.RequestException: 연결 오류, 타임아웃 등
+        """
+        self.circuit_breaker.before_call(self.upstream)
+        self.rate_limiter.acquire(self.upstream)
+        try:
+            response = requests.post(url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure(self.upstream, str(e))
+            raise
+        self.circuit_breaker.record_response(self.upstream, response.status_code)
+        self.rate_limiter.update_from_headers(self.upstream, response.headers, response.status_code)
+        return response
+
     def create_post(self, title: str, content: str, category: str, writer: str, image_paths: Optional[List[str]] = None):
         """게시글 생성 API 호출"""
         url = f"{self.api_base_url}/board-content"
@@ -79,8 +109,8 @@ class ApiUtil:
                     if os.path.exists(image_path):
                         try:
                             compressed_image, format = self._compress_image(image_path)
-                            # 원본 파일명 사용
-                            original_filename = os.path.basename(image_path)
+                            # 원본 파일명 사용 (확장자는 인코딩한 포맷에 맞춤)
+                            original_filename = replace_extension(os.path.basename(image_path), format)
                             # 각 이미지를 배열로 전송
                             files[f'image[{i}]'] = (original_filename, compressed_image, f'image/{format}')
                             self.logger.debug(f"이미지 {i+1} 추가: {original_filename}")
@@ -120,11 +150,10 @@ class ApiUtil:
                     # 디버그 로그 추가
                     self.logger.debug(f"최종 전송 데이터: {[(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()]}")
                     
-                    response = requests.post(
+                    response = self._post_board(
                         url, 
                         headers=headers,
-                        files=form_data,
-                        timeout=30
+                        files=form_data
                     )
                     
                     # 응답 상태 코드 로깅
@@ -140,7 +169,7 @@ class ApiUtil:
                     "category": category,
                     "writer": writer
                 }
-                response = requests.post(url, headers=self.headers, json=payload)
+                response = self._post_board(url, headers=self.headers, json=payload)
 
             # 응답 확인 및 한글 디코딩
             try:
@@ -175,10 +204,10 @@ class ApiUtil:
             self.logger.error(error_msg)
             raise ApiError(500, error_msg)
 
-    def upload_wisdom_card(self, image_path: str, author: str, wisdom_kr: str, wisdom_en: str, name_kr: str, name_en: str):
+    def build_wisdom_card_request(self, image_path: str, author: str, wisdom_kr: str, wisdom_en: str, name_kr: str, name_en: str, compressed: Optional[tuple] = None, destination: str = "board"):
         """
-        명언 카드 이미지를 API 서버에 업로드
-        
+        명언 카드 업로드 요청의 제목과 form-data 구성
+
         Args:
             image_path (str): 업로드할 이미지 파일 경로
             author (str): 저자 정보
@@ -186,42 +215,38 @@ class ApiUtil:
             wisdom_en (str): 명언 영문 텍스트
             name_kr (str): 저자 한글 이름
             name_en (str): 저자 영문 이름
-            
+            compressed (tuple): 미리 압축해 둔 (이미지 바이트, 포맷), 지정하면 압축을 건너뜀
+            destination (str): 압축 포맷을 고를 목적지 (게시판 URL을 인스타그램이 읽어가면 instagram)
+
         Returns:
-            dict: 성공 시 {"success": True, "image_url": "..."}, 실패 시 {"success": False, "error": "에러 메시지"}
+            tuple: (게시글 제목, {필드명: (파일명 또는 None, 값, [content-type])})
+
+        Raises:
+            ApiError: 이미지 파일이 없거나 처리할 수 없는 경우
         """
-        url = f"{self.api_base_url}/board-content"
-        
-        try:
-            self.logger.info(f"명언 카드 업로드 시작 - 저자: {author}")
-            
-            # 이미지 처리
-            files = {}
-            thumbnail_image = {}
-            if os.path.exists(image_path):
-                try:
-                    compressed_image, format = self._compress_image(image_path)
-                    original_filename = os.path.basename(image_path)
-                    files['image[0]'] = (original_filename, compressed_image, f'image/{format}')
-                    thumbnail_image['thumbnail_image'] = (original_filename, compressed_image, f'image/{format}')
-                    self.logger.debug(f"이미지 추가: {original_filename}")
-                except Exception as e:
-                    error_msg = f"이미지 처리 실패: {image_path} - {str(e)}"
-                    self.logger.error(error_msg)
-                    raise ApiError(400, error_msg)
-            else:
-                error_msg = f"이미지 파일을 찾을 수 없습니다: {image_path}"
+        # 이미지 처리 (본문 이미지와 썸네일은 같은 바이트 객체를 공유)
+        if os.path.exists(image_path):
+            try:
+                compressed_image, format = compressed if compressed else self._compress_image(image_path, destination)
+                image_part = (replace_extension(os.path.basename(image_path), format), compressed_image, f'image/{format}')
+                self.logger.debug(f"이미지 추가: {image_part[0]}")
+            except Exception as e:
+                error_msg = f"이미지 처리 실패: {image_path} - {str(e)}"
                 self.logger.error(error_msg)
                 raise ApiError(400, error_msg)
+        else:
+            error_msg = f"이미지 파일을 찾을 수 없습니다: {image_path}"
+            self.logger.error(error_msg)
+            raise ApiError(400, error_msg)
 
-            # 현재 날짜 가져오기
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            
-            # 게시글 제목 생성
-            title = f"{current_date} {name_kr}의 투자 명언"
+        # 현재 날짜 가져오기
+        current_date = datetime.now().strftime('%Y-%m-%d')
+        
+        # 게시글 제목 생성
+        title = f"{current_date} {name_kr}의 투자 명언"
 
-            # 게시글 내용 생성
-            content = f"""<strong><h3>[{name_kr} ({name_en})의 투자 명언]</h3></strong><br>
+        # 게시글 내용 생성
+        content = f"""<strong><h3>[{name_kr} ({name_en})의 투자 명언]</h3></strong><br>
             <p class="quote">{wisdom_kr}</p><br>
             <p class="quote">{wisdom_en}</p><br>
             <p>
@@ -234,38 +259,107 @@ class ApiUtil:
                 <a href="#">#경제공부</a>
             </p>"""
 
-            # 데이터 구성
-            data = {
-                "title": title,
-                "content": content,
-                "category": "투자명언",
-                "writer": "admin"
-            }
+        # 데이터 구성
+        data = {
+            "title": title,
+            "content": content,
+            "category": "투자명언",
+            "writer": "admin"
+        }
+
+        # 요청 데이터 로깅
+        self.logger.debug(f"API 요청 데이터: {data}")
+        self.logger.debug(f"파일 데이터: image[0], thumbnail_image: {image_part[0]}")
+        
+        # form-data 형식으로 전송
+        form_data = {}
+        for key, value in data.items():
+            form_data[key] = (None, str(value))
+        
+        # 이미지 파일 추가
+        form_data['image[0]'] = image_part
+        form_data['thumbnail_image'] = image_part
+        
+        # 디버그 로그 추가
+        self.logger.debug(f"최종 전송 데이터: {[(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()]}")
+        return title, form_data
+
+    def handle_wisdom_card_response(self, title: str, status_code: int, response_data: dict, response_text: str):
+        """
+        명언 카드 업로드 응답 처리
+
+        Args:
+            title (str): 게시글 제목
+            status_code (int): HTTP 상태 코드
+            response_data (dict): 파싱된 JSON 응답
+            response_text (str): 원본 응답 본문 (오류 메시지용)
+
+        Returns:
+            dict: {"success": True, "image_url": "...", "post_id": 게시글 ID 또는 None, "message": "..."}
+
+        Raises:
+            ApiError: 서버가 실패를 응답한 경우
+        """
+        # 응답 로깅
+        self.logger.debug(f"API 응답: {response_data}")
+        
+        if not response_data.get('success', False):
+            error_msg = f"명언 카드 업로드 실패\n제목: {title}\n응답: {response_text}"
+            self.logger.error(error_msg)
+            raise ApiError(status_code, error_msg)
+
+        self.logger.info(f"명언 카드 업로드 성공 - 제목: {title}")
+        
+        # 이미지 URL 확인
+        image_urls = response_data.get('data', {}).get('image_urls', [])
+        if not image_urls:
+            self.logger.warning("응답에 이미지 URL이 없습니다.")
+        else:
+            self.logger.info(f"이미지 URL: {image_urls[0]}")
+        
+        return {
+            "success": True,
+            "image_url": image_urls[0] if image_urls else None,
+            "post_id": response_data.get('data', {}).get('id'),
+            "message": "이미지가 성공적으로 업로드되었습니다."
+        }
+
+    def upload_wisdom_card(self, image_path: str, author: str, wisdom_kr: str, wisdom_en: str, name_kr: str, name_en: str, compressed: Optional[tuple] = None):
+        """
+        명언 카드 이미지를 API 서버에 업로드
+        
+        Args:
+            image_path (str): 업로드할 이미지 파일 경로
+            author (str): 저자 정보
+            wisdom_kr (str): 명언 한글 텍스트
+            wisdom_en (str): 명언 영문 텍스트
+            name_kr (str): 저자 한글 이름
+            name_en (str): 저자 영문 이름
+            compressed (tuple): 미리 압축해 둔 (이미지 바이트, 포맷), 지정하면 압축을 건너뜀
+            
+        Returns:
+            dict: 성공 시 {"success": True, "image_url": "..."}, 실패 시 {"success": False, "error": "에러 메시지"}
+        """
+        url = f"{self.api_base_url}/board-content"
+        
+        try:
+            self.logger.info(f"명언 카드 업로드 시작 - 저자: {author}")
+            
+            title, form_data = self.build_wisdom_card_request(
+                image_path, author, wisdom_kr, wisdom_en, name_kr, name_en, compressed
+            )
 
             try:
-                # 요청 데이터 로깅
-                self.logger.debug(f"API 요청 데이터: {data}")
-                self.logger.debug(f"파일 데이터: {[f'{k}: {v[0]}' for k, v in files.items()]}")
-                
-                # form-data 형식으로 전송
-                form_data = {}
-                for key, value in data.items():
-                    form_data[key] = (None, str(value))
-                
-                # 이미지 파일 추가
-                form_data.update(files)
-                form_data.update(thumbnail_image)
-                
-                # 디버그 로그 추가
-                self.logger.debug(f"최종 전송 데이터: {[(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()]}")
-                
                 # API 요청
-                response = requests.post(
+                response = self._post_board(
                     url,
                     headers=self.headers,
-                    files=form_data,
-                    timeout=30
+                    files=form_data
                 )
+
+                # 전송이 끝난 이미지 바이트와 인코딩된 요청 본문은 응답 처리 전에 바로 해제
+                form_data.clear()
+                response.request.body = None
                 
                 # 응답 상태 코드 로깅
                 self.logger.debug(f"응답 상태 코드: {response.status_code}")
@@ -274,29 +368,7 @@ class ApiUtil:
                 # 응답 처리
                 response.encoding = 'utf-8'
                 response_data = response.json()
-                
-                # 응답 로깅
-                self.logger.debug(f"API 응답: {response_data}")
-                
-                if not response_data.get('success', False):
-                    error_msg = f"명언 카드 업로드 실패\n제목: {title}\n응답: {response.text}"
-                    self.logger.error(error_msg)
-                    raise ApiError(response.status_code, error_msg)
-
-                self.logger.info(f"명언 카드 업로드 성공 - 제목: {title}")
-                
-                # 이미지 URL 확인
-                image_urls = response_data.get('data', {}).get('image_urls', [])
-                if not image_urls:
-                    self.logger.warning("응답에 이미지 URL이 없습니다.")
-                else:
-                    self.logger.info(f"이미지 URL: {image_urls[0]}")
-                
-                return {
-                    "success": True,
-                    "image_url": image_urls[0] if image_urls else None,
-                    "message": "이미지가 성공적으로 업로드되었습니다."
-                }
+                return self.handle_wisdom_card_response(title, response.status_code, response_data, response.text)
 
             except ValueError as e:
                 error_msg = f"JSON 응답 파싱 실패\n제목: {title}\n응답: {response.text}"
@@ -310,8 +382,8 @@ class ApiUtil:
         except ApiError as e:
             return {"success": False, "error": str(e)}
         finally:
-            if 'files' in locals():
-                files.clear()
+            if 'form_data' in locals():
+                form_data.clear()
 
 if __name__ == "__main__":
     # API 테스트
@@ -0,0 +1,239 @@
+import os
+import time
+import sqlite3
+import threading
+import requests
+from utils.logger_util import LoggerUtil
+
+# 회로 상태: closed(정상) → open(차단) → half_open(시험 요청 1건 허용) → closed 또는 open
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """회로가 열려 있어 요청을 보내지 않은 경우 (기존 RequestException 처리 흐름을 그대로 탐)"""
+
+    def __init__(self, name, retry_in):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"[{name}] 회로 차단 중 - {retry_in:.0f}초 후 다시 시도합니다.")
+
+class CircuitBreaker:
+    """
+    업스트림(게시판 API, Graph API)별 회로 차단기
+
+    ApiUtil과 InstagramAPI가 같은 인스턴스를 공유하며, 상태는 SQLite에 저장되어 cron 실행이나
+    다른 프로세스와도 공유된다. 최근 CIRCUIT_WINDOW초 동안 CIRCUIT_MIN_CALLS건 이상 호출해
+    실패율(연결 오류, 타임아웃, 5xx)이 CIRCUIT_FAILURE_RATE 이상이면 회로를 열고,
+    CIRCUIT_COOLDOWN초 동안은 요청을 보내지 않고 바로 실패시킨다. 대기 후에는 시험 요청
+    1건만 보내 성공하면 닫고 실패하면 다시 연다.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, db_path='sqlite.db'):
+        if cls._instance is None:
+            cls._instance = super(CircuitBreaker, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, db_path='sqlite.db'):
+        if CircuitBreaker._initialized:
+            return
+
+        # 절대 경로로 변환 (루트 디렉토리 기준)
+        if not os.path.isabs(db_path):
+            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.db_path = os.path.join(root_dir, db_path)
+        else:
+            self.db_path = db_path
+
+        self.logger = LoggerUtil().get_logger()
+        self.failure_rate = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+        self.min_calls = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+        self.window = float(os.getenv("CIRCUIT_WINDOW", "60"))
+        self.cooldown = float(os.getenv("CIRCUIT_COOLDOWN", "60"))
+        # 시험 요청이 이 시간 안에 결과를 남기지 못하면 다른 호출자가 다시 시험할 수 있음
+        self.probe_timeout = float(os.getenv("CIRCUIT_PROBE_TIMEOUT", "60"))
+        self._lock = threading.Lock()
+        self._initialize_table()
+
+        CircuitBreaker._initialized = True
+
+    def _connect(self):
+        # 트랜잭션은 BEGIN IMMEDIATE로 직접 관리
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _initialize_table(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS circuit_breaker_state (
+                name TEXT PRIMARY KEY,
+                state TEXT NOT NULL DEFAULT 'closed',
+                window_start REAL NOT NULL,
+                calls INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                opened_at REAL NOT NULL DEFAULT 0,
+                probe_until REAL NOT NULL DEFAULT 0
+            )
+            ''')
+        finally:
+            conn.close()
+
+    def _load_state(self, conn, name, now):
+        """회로 상태를 읽고 집계 구간이 지났으면 호출/실패 수 초기화 (트랜잭션 안에서 호출)"""
+        row = conn.execute(
+            "SELECT state, window_start, calls, failures, opened_at, probe_until FROM circuit_breaker_state WHERE name = ?",
+            (name,)
+        ).fetchone()
+        if row is None:
+            return {"state": CLOSED, "window_start": now, "calls": 0, "failures": 0, "opened_at": 0.0, "probe_until": 0.0}
+
+        state = dict(zip(("state", "window_start", "calls", "failures", "opened_at", "probe_until"), row))
+        if state["state"] == CLOSED and now - state["window_start"] > self.window:
+            state.update(window_start=now, calls=0, failures=0)
+        return state
+
+    def _save_state(self, conn, name, state):
+        conn.execute('''
+            INSERT INTO circuit_breaker_state (name, state, window_start, calls, failures, opened_at, probe_until)
+            VALUES (:name, :state, :window_start, :calls, :failures, :opened_at, :probe_until)
+            ON CONFLICT(name) DO UPDATE SET
+                state = excluded.state,
+                window_start = excluded.window_start,
+                calls = excluded.calls,
+                failures = excluded.failures,
+                opened_at = excluded.opened_at,
+                probe_until = excluded.probe_until
+        ''', dict(state, name=name))
+
+    def _update(self, name, fn):
+        """BEGIN IMMEDIATE 트랜잭션 안에서 상태를 읽어 fn(state, now)로 바꾸고 저장, fn의 반환값 반환"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                state = self._load_state(conn, name, now)
+                result = fn(state, now)
+                self._save_state(conn, name, state)
+                conn.execute("COMMIT")
+                return result
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                # 상태 저장소 오류로 요청 자체를 막지는 않음
+                self.logger.error(f"회로 차단기 상태 갱신 오류: {e}")
+                return None
+            finally:
+                conn.close()
+
+    def before_call(self, name):
+        """
+        요청 전 회로 확인 (열려 있으면 요청을 보내지 않도록 예외 발생)
+
+        Args:
+            name (str): 업스트림 이름 (board, instagram)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 다른 호출자가 시험 요청 중인 경우
+        """
+        def check(state, now):
+            if state["state"] == OPEN:
+                retry_in = state["opened_at"] + self.cooldown - now
+                if retry_in > 0:
+                    return retry_in
+                # 대기 시간이 지나면 이 호출을 시험 요청으로 허용
+                state.update(state=HALF_OPEN, probe_until=now + self.probe_timeout)
+                self.logger.info(f"[{name}] 회로 반개방 - 시험 요청을 보냅니다.")
+                return None
+            if state["state"] == HALF_OPEN:
+                if now < state["probe_until"]:
+                    return state["probe_until"] - now
+                state["probe_until"] = now + self.probe_timeout
+            return None
+
+        retry_in = self._update(name, check)
+        if retry_in is not None:
+            raise CircuitOpenError(name, retry_in)
+
+    def record_success(self, name):
+        """요청 성공 기록 (시험 요청이 성공하면 회로를 닫음)"""
+        def success(state, now):
+            if state["state"] == OPEN:
+                # 회로가 열리기 전에 보낸 요청의 늦은 응답은 무시
+                return
+            if state["state"] == HALF_OPEN:
+                self.logger.info(f"[{name}] 시험 요청 성공 - 회로를 닫습니다.")
+                state.update(state=CLOSED, window_start=now, calls=0, failures=0, opened_at=0.0, probe_until=0.0)
+            state["calls"] += 1
+
+        self._update(name, success)
+
+    def record_failure(self, name, reason=""):
+        """요청 실패 기록 (실패율이 기준을 넘거나 시험 요청이 실패하면 회로를 엶)"""
+        def failure(state, now):
+            if state["state"] == OPEN:
+                return
+            state["calls"] += 1
+            state["failures"] += 1
+            should_open = state["state"] == HALF_OPEN or (
+                state["calls"] >= self.min_calls and state["failures"] / state["calls"] >= self.failure_rate
+            )
+            if should_open:
+                state.update(state=OPEN, opened_at=now, probe_until=0.0, window_start=now, calls=0, failures=0)
+                self.logger.warning(f"[{name}] 회로 차단 - {self.cooldown:.0f}초 동안 요청을 보내지 않습니다. ({reason})")
+
+        self._update(name, failure)
+
+    def record_response(self, name, status_code):
+        """HTTP 응답 기록 (5xx는 실패, 그 외는 업스트림이 응답한 것으로 보고 성공)"""
+        if status_code >= 500:
+            self.record_failure(name, f"HTTP {status_code}")
+        else:
+            self.record_success(name)
+
+    def is_open(self, name):
+        """
+        요청을 보내도 바로 거절될 상태인지 확인 (상태는 바꾸지 않음, 작업 선점 전 확인용)
+
+        Returns:
+            bool: 회로가 열려 있고 대기 시간이 남았거나 다른 호출자가 시험 요청 중이면 True
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            state = self._load_state(conn, name, now)
+        except sqlite3.Error as e:
+            self.logger.error(f"회로 차단기 상태 조회 오류: {e}")
+            return False
+        finally:
+            conn.close()
+        if state["state"] == OPEN:
+            return now < state["opened_at"] + self.cooldown
+        if state["state"] == HALF_OPEN:
+            return now < state["probe_until"]
+        return False
+
+    def get_status(self):
+        """
+        업스트림별 현재 상태 조회
+
+        Returns:
+            dict: {이름: {"state": .., "calls": .., "failures": .., "retry_in": 초}}
+        """
+        now = time.time()
+        status = {}
+        conn = self._connect()
+        try:
+            for (name,) in conn.execute("SELECT name FROM circuit_breaker_state").fetchall():
+                state = self._load_state(conn, name, now)
+                status[name] = {
+                    "state": state["state"],
+                    "calls": state["calls"],
+                    "failures": state["failures"],
+                    "retry_in": max(0.0, state["opened_at"] + self.cooldown - now) if state["state"] == OPEN else 0.0,
+                }
+        finally:
+            conn.close()
+        return status
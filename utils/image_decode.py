@@ -0,0 +1,70 @@
+from PIL import Image
+
+# JPEG DCT 스케일링으로 디코딩 단계에서 줄일 수 있는 배율 (1/2, 1/4, 1/8)
+REDUCED_SCALES = (8, 4, 2)
+
+def reduced_scale(size, target_long_side):
+    """
+    긴 쪽이 target_long_side 이상으로 남는 가장 큰 2의 거듭제곱 축소 배율
+
+    Args:
+        size (tuple): 원본 (너비, 높이)
+        target_long_side (int): 최종 결과의 긴 쪽 길이
+
+    Returns:
+        int: 1, 2, 4, 8 중 하나 (1이면 축소 디코딩 불필요)
+    """
+    long_side = max(size)
+    for scale in REDUCED_SCALES:
+        if long_side // scale >= target_long_side:
+            return scale
+    return 1
+
+def open_reduced(fp, max_width):
+    """
+    이미지를 열되 JPEG이면 너비가 max_width 이상인 가장 작은 배율로 디코딩하도록 설정
+
+    Image.draft는 DCT 단계에서 1/2~1/8로 줄여 디코딩하므로 큰 원본도 전체 해상도로
+    풀지 않는다. 최종 크기 맞춤(LANCZOS 등)은 호출하는 쪽에서 한다. JPEG가 아니면
+    Image.open과 같다.
+
+    Args:
+        fp (str | file): 이미지 경로 또는 파일 객체
+        max_width (int): 최종 결과 너비
+
+    Returns:
+        Image: 열린 이미지 (img.format은 원본 포맷 유지)
+    """
+    img = Image.open(fp)
+    if img.format == 'JPEG' and img.width > max_width:
+        height = max(1, img.height * max_width // img.width)
+        # draft는 요청 크기 이상이 되는 범위에서 가장 작게 줄이므로 최종 리사이즈 품질이 유지됨
+        img.draft(img.mode, (max_width, height))
+    return img
+
+def imread_reduced(path, target_long_side):
+    """
+    OpenCV로 이미지를 읽되 JPEG이면 IMREAD_REDUCED_COLOR_2/4/8로 줄여 디코딩
+
+    헤더만 읽어 원본 크기를 구한 뒤 긴 쪽이 target_long_side 이상으로 남는 배율을 고른다.
+
+    Args:
+        path (str): 이미지 경로
+        target_long_side (int): 최종 결과의 긴 쪽 길이
+
+    Returns:
+        numpy.ndarray: BGR 이미지, 읽을 수 없으면 None
+    """
+    import cv2
+
+    flags = {
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+    try:
+        with Image.open(path) as img:
+            scale = reduced_scale(img.size, target_long_side) if img.format == 'JPEG' else 1
+    except OSError:
+        return None
+    return cv2.imread(path, flags.get(scale, cv2.IMREAD_COLOR))
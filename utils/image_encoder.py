@@ -0,0 +1,137 @@
+import io
+import os
+from urllib.parse import urlparse
+from utils.logger_util import LoggerUtil
+
+# 목적지별 기본 후보 포맷 (앞쪽이 우선, <목적지>_IMAGE_FORMATS 환경 변수로 변경)
+DEFAULT_DESTINATION_FORMATS = {
+    "board": "webp,jpeg",
+    "instagram": "jpeg",
+}
+
+# 인스타그램은 JPEG만 받으므로 설정과 관계없이 고정
+# (스토리지 없이 게시판 이미지 URL을 인스타그램이 읽어가는 경우 게시판 업로드도 이 목적지로 압축)
+FIXED_DESTINATION_FORMATS = {
+    "instagram": ("jpeg",),
+}
+
+FORMAT_EXTENSIONS = {
+    "jpeg": "jpg",
+    "webp": "webp",
+    "avif": "avif",
+}
+
+def available_formats():
+    """현재 Pillow 빌드에서 인코딩할 수 있는 포맷 목록"""
+    from PIL import features
+
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.append("webp")
+    try:
+        if features.check("avif"):
+            formats.append("avif")
+    except ValueError:
+        # AVIF를 모르는 이전 Pillow
+        pass
+    return formats
+
+def destination_formats(destination):
+    """
+    목적지의 후보 포맷 목록 (지원하지 않는 포맷은 제외, 비면 JPEG)
+
+    Args:
+        destination (str): 목적지 이름 (board, instagram 등)
+
+    Returns:
+        tuple: 포맷 이름 목록 (jpeg, webp, avif)
+    """
+    if destination in FIXED_DESTINATION_FORMATS:
+        return FIXED_DESTINATION_FORMATS[destination]
+    configured = os.getenv(f"{destination.upper()}_IMAGE_FORMATS", DEFAULT_DESTINATION_FORMATS.get(destination, "jpeg"))
+    supported = available_formats()
+    formats = tuple(f for f in (part.strip().lower() for part in configured.split(",")) if f in supported)
+    return formats or ("jpeg",)
+
+def is_jpeg_url(url):
+    """URL 경로의 확장자가 JPEG인지 여부 (인스타그램에 넘길 수 있는 이미지 URL 확인용)"""
+    path = urlparse(url).path.lower()
+    return path.endswith(".jpg") or path.endswith(".jpeg")
+
+def replace_extension(file_name, format):
+    """파일명의 확장자를 포맷에 맞게 변경"""
+    return f"{os.path.splitext(file_name)[0]}.{FORMAT_EXTENSIONS.get(format, format)}"
+
+class ImageEncoder:
+    """
+    후보 포맷으로 인코딩해 크기 예산 안에서 가장 작은 결과를 고르는 인코더
+
+    각 포맷을 비슷한 화질의 시작 품질로 인코딩해 max_bytes 이하인 결과 중 가장 작은 것을
+    고른다. 모두 예산을 넘으면 품질을 quality_step씩 낮춰 다시 시도하고, min_quality까지
+    내려도 넘으면 가장 작은 결과를 사용한다. JPEG도 후보에 있으면 JPEG 대비 절감량을 기록한다.
+    """
+
+    # 포맷별로 비슷한 화질이 나오는 시작 품질 (AVIF는 같은 숫자에서 화질이 더 높음)
+    START_QUALITY = {"jpeg": 85, "webp": 85, "avif": 70}
+
+    def __init__(self, min_quality=30, quality_step=10):
+        """
+        Args:
+            min_quality (int): 예산을 맞추기 위해 내릴 수 있는 최저 품질
+            quality_step (int): 한 번에 낮출 품질
+        """
+        self.min_quality = min_quality
+        self.quality_step = quality_step
+        self.logger = LoggerUtil().get_logger()
+
+    def encode_as(self, img, format, quality):
+        """이미지를 지정한 포맷과 품질로 인코딩한 바이트 반환"""
+        buffer = io.BytesIO()
+        if format == "jpeg":
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        elif format == "webp":
+            img.save(buffer, format="WEBP", quality=quality, method=4)
+        elif format == "avif":
+            img.save(buffer, format="AVIF", quality=quality, speed=6)
+        else:
+            raise ValueError(f"지원하지 않는 포맷: {format}")
+        return buffer.getvalue()
+
+    def encode(self, img, formats, max_bytes):
+        """
+        후보 포맷 중 크기 예산을 만족하는 가장 작은 결과 선택
+
+        Args:
+            img (PIL.Image.Image): 인코딩할 이미지
+            formats (iterable): 후보 포맷 (jpeg, webp, avif)
+            max_bytes (int): 크기 예산 (바이트)
+
+        Returns:
+            dict: {"data": 바이트, "format": 포맷, "quality": 품질, "jpeg_size": 같은 단계 JPEG 크기 또는 None}
+        """
+        formats = list(formats)
+        step = 0
+        best = None
+        while True:
+            results = {}
+            for format in formats:
+                quality = max(self.min_quality, self.START_QUALITY.get(format, 85) - step)
+                results[format] = (self.encode_as(img, format, quality), quality)
+
+            format, (data, quality) = min(results.items(), key=lambda item: len(item[1][0]))
+            jpeg = results.get("jpeg")
+            best = {"data": data, "format": format, "quality": quality, "jpeg_size": len(jpeg[0]) if jpeg else None}
+            at_floor = all(q == self.min_quality for _, q in results.values())
+            if len(data) <= max_bytes or at_floor:
+                break
+            step += self.quality_step
+
+        if best["jpeg_size"] and best["format"] != "jpeg":
+            saved = best["jpeg_size"] - len(best["data"])
+            self.logger.info(
+                f"{best['format'].upper()} 선택: {len(best['data'])/1024:.1f}KB "
+                f"(JPEG 대비 {saved/1024:.1f}KB, {saved / best['jpeg_size'] * 100:.0f}% 절감)"
+            )
+        return best
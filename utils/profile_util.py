@@ -0,0 +1,124 @@
+import io
+import os
+import re
+import time
+import pstats
+import cProfile
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from utils.logger_util import LoggerUtil
+
+class ProfileUtil:
+    """
+    카드 생성 실행을 cProfile/tracemalloc으로 감싸 프로파일 파일을 남기는 도구
+
+    세션마다 logs/profile 아래에 다음 두 파일을 만든다.
+    - <이름>.prof: cProfile 원본 (snakeviz, flameprof 등으로 플레임 그래프 확인)
+    - <이름>.txt: 태그(idx, 인물 이미지 등), 소요 시간, 누적 시간 상위 함수, 메모리 할당 상위 위치
+
+    기본값은 비활성이며 PROFILE=1 환경 변수나 main.py --profile로 켠다.
+    """
+
+    def __init__(self, enabled=None, output_dir=None, top=30):
+        """
+        Args:
+            enabled (bool): 프로파일링 사용 여부 (기본값: PROFILE 환경 변수가 1이면 사용)
+            output_dir (str): 프로파일 저장 디렉토리 (기본값: logs/profile)
+            top (int): 리포트에 출력할 상위 항목 수
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("PROFILE", "0") == "1"
+        if output_dir is None:
+            output_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent / 'logs' / 'profile'
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.logger = LoggerUtil().get_logger()
+
+    @contextmanager
+    def session(self, name, trace_memory=True, **tags):
+        """
+        with 블록을 프로파일링 (비활성이면 아무것도 하지 않음)
+
+        cProfile은 호출한 스레드만 측정하므로, 스레드 풀 작업은 작업 함수 안에서
+        별도 세션(trace_memory=False)으로 감싼다. tracemalloc은 프로세스 전체를 추적한다.
+
+        Args:
+            name (str): 세션 이름 (파일명에 사용, 예: card, batch, render)
+            trace_memory (bool): tracemalloc으로 메모리 할당 위치도 기록할지 여부
+            **tags: 리포트와 파일명에 남길 태그 (idx, portrait 등)
+
+        Yields:
+            dict: 태그 dict (블록 안에서 결과 파일명 등 태그를 추가할 수 있음)
+        """
+        if not self.enabled:
+            yield tags
+            return
+
+        # 이미 다른 세션이 tracemalloc을 쓰고 있으면 그 세션에 맡김
+        owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if owns_tracemalloc:
+            tracemalloc.start(25)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield tags
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            snapshot = None
+            peak = None
+            if owns_tracemalloc:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            try:
+                self._write(name, tags, profiler, elapsed, snapshot, peak)
+            except OSError as e:
+                self.logger.error(f"프로파일 저장 실패: {e}")
+
+    def _write(self, name, tags, profiler, elapsed, snapshot, peak):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / self._file_stem(name, tags)
+
+        profiler.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"세션: {name}\n")
+        report.write(f"시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        for key, value in tags.items():
+            report.write(f"{key}: {value}\n")
+        report.write(f"소요 시간: {elapsed * 1000:.1f}ms\n")
+        if peak is not None:
+            report.write(f"최대 추적 메모리: {peak / 1024 / 1024:.1f}MB\n")
+
+        report.write(f"\n=== 누적 시간 상위 {self.top}개 함수 ===\n")
+        stats = pstats.Stats(profiler, stream=report)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(self.top)
+
+        if snapshot is not None:
+            report.write(f"\n=== 메모리 할당 상위 {self.top}개 위치 ===\n")
+            snapshot = snapshot.filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ])
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                report.write(f"{stat}\n")
+
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+
+        self.logger.info(f"프로파일 저장 완료: {base}.prof ({elapsed * 1000:.1f}ms)")
+
+    def _file_stem(self, name, tags):
+        """시각_세션명_idx_인물이미지 형태의 파일명 (파일명에 쓸 수 없는 문자는 _로 치환)"""
+        parts = [datetime.now().strftime('%Y%m%d_%H%M%S_%f'), name]
+        if tags.get('idx') is not None:
+            parts.append(f"idx{tags['idx']}")
+        if tags.get('portrait'):
+            portrait = tags['portrait']
+            parts.append(f"{os.path.basename(os.path.dirname(portrait))}_{os.path.splitext(os.path.basename(portrait))[0]}")
+        return re.sub(r"[^\w.-]+", "_", "_".join(parts))
@@ -0,0 +1,293 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from utils.logger_util import LoggerUtil
+
+# 버킷별 기본 한도 (요청 수, 기간(초)). 환경 변수 RATE_LIMIT_<BUCKET>="횟수/초"로 변경 가능
+DEFAULT_LIMITS = {
+    "instagram": (200, 3600),           # Graph API 호출 (계정당 시간당 200회)
+    "instagram_publish": (25, 86400),   # 콘텐츠 게시 (24시간당 25건)
+    "board": (60, 60),                  # 게시판 API
+}
+
+# 사용량(%)이 이 값을 넘으면 남은 여유에 비례해 보충 속도를 줄인다
+USAGE_SLOWDOWN_THRESHOLD = 80
+
+class RateLimiter:
+    """
+    클라이언트 측 토큰 버킷 속도 제한기
+
+    InstagramAPI와 ApiUtil이 같은 인스턴스를 공유하며, 버킷 상태는 SQLite에 저장되어
+    재시작이나 다른 프로세스와도 공유된다. 응답 헤더(X-App-Usage, X-Business-Use-Case-Usage,
+    X-RateLimit-Remaining, Retry-After)로 서버가 알려주는 사용량을 반영해 속도를 조절한다.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, db_path='sqlite.db'):
+        if cls._instance is None:
+            cls._instance = super(RateLimiter, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, db_path='sqlite.db'):
+        if RateLimiter._initialized:
+            return
+
+        # 절대 경로로 변환 (루트 디렉토리 기준)
+        if not os.path.isabs(db_path):
+            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.db_path = os.path.join(root_dir, db_path)
+        else:
+            self.db_path = db_path
+
+        self.logger = LoggerUtil().get_logger()
+        self.limits = {}
+        for bucket, default in DEFAULT_LIMITS.items():
+            self.limits[bucket] = self._parse_limit(os.getenv(f"RATE_LIMIT_{bucket.upper()}"), default)
+        self._lock = threading.Lock()
+        self._initialize_table()
+
+        RateLimiter._initialized = True
+
+    def _parse_limit(self, value, default):
+        if not value:
+            return default
+        try:
+            count, period = value.split("/")
+            return int(count), float(period)
+        except ValueError:
+            self.logger.warning(f"잘못된 속도 제한 설정: {value} (기본값 {default[0]}/{default[1]} 사용)")
+            return default
+
+    def _connect(self):
+        # 트랜잭션은 BEGIN IMMEDIATE로 직접 관리
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _initialize_table(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limit_state (
+                bucket TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL DEFAULT 0,
+                usage_pct REAL NOT NULL DEFAULT 0
+            )
+            ''')
+        finally:
+            conn.close()
+
+    def _bucket_config(self, bucket):
+        # 목적지별 버킷(instagram:<계정> 등)은 기본 버킷과 같은 한도를 따로 적용
+        count, period = self.limits.get(bucket, self.limits.get(bucket.split(":")[0], (60, 60)))
+        return float(count), count / period
+
+    def capacity(self, bucket):
+        """버킷이 한 번에 내줄 수 있는 최대 토큰 수 (이보다 큰 요청은 나누어 확보해야 함)"""
+        return int(self._bucket_config(bucket)[0])
+
+    def _load_state(self, conn, bucket, now):
+        """버킷 상태를 읽고 경과 시간만큼 토큰 보충 (트랜잭션 안에서 호출)"""
+        capacity, rate = self._bucket_config(bucket)
+        row = conn.execute(
+            "SELECT tokens, updated_at, blocked_until, usage_pct FROM rate_limit_state WHERE bucket = ?",
+            (bucket,)
+        ).fetchone()
+        if row is None:
+            return capacity, now, 0.0, 0.0
+
+        tokens, updated_at, blocked_until, usage_pct = row
+        if usage_pct > USAGE_SLOWDOWN_THRESHOLD:
+            rate *= max(0.1, (100 - usage_pct) / (100 - USAGE_SLOWDOWN_THRESHOLD))
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        return tokens, now, blocked_until, usage_pct
+
+    def _save_state(self, conn, bucket, tokens, updated_at, blocked_until, usage_pct):
+        conn.execute('''
+            INSERT INTO rate_limit_state (bucket, tokens, updated_at, blocked_until, usage_pct)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(bucket) DO UPDATE SET
+                tokens = excluded.tokens,
+                updated_at = excluded.updated_at,
+                blocked_until = excluded.blocked_until,
+                usage_pct = excluded.usage_pct
+        ''', (bucket, tokens, updated_at, blocked_until, usage_pct))
+
+    def acquire(self, bucket, tokens=1, max_wait=None):
+        """
+        토큰을 확보할 때까지 대기
+
+        Args:
+            bucket (str): 버킷 이름 (instagram, instagram_publish, board)
+            tokens (int): 필요한 토큰 수
+            max_wait (float): 최대 대기 시간(초). None이면 무제한
+
+        Returns:
+            bool: 토큰 확보 시 True, max_wait 안에 확보하지 못하면 False
+
+        Raises:
+            ValueError: tokens가 버킷 용량(capacity())보다 큰 경우 (영원히 확보할 수 없음)
+        """
+        capacity, rate = self._bucket_config(bucket)
+        if tokens > capacity:
+            raise ValueError(f"[{bucket}] 요청 토큰 수({tokens})가 버킷 용량({capacity:.0f})보다 큽니다.")
+        deadline = None if max_wait is None else time.time() + max_wait
+
+        while True:
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    available, updated_at, blocked_until, usage_pct = self._load_state(conn, bucket, now)
+                    if now < blocked_until:
+                        wait = blocked_until - now
+                    elif available >= tokens:
+                        self._save_state(conn, bucket, available - tokens, updated_at, blocked_until, usage_pct)
+                        conn.execute("COMMIT")
+                        return True
+                    else:
+                        wait = (tokens - available) / rate
+                    self._save_state(conn, bucket, available, updated_at, blocked_until, usage_pct)
+                    conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    # 상태 저장소 오류로 요청 자체를 막지는 않음
+                    self.logger.error(f"속도 제한 상태 조회 오류: {e}")
+                    return True
+                finally:
+                    conn.close()
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            self.logger.info(f"[{bucket}] 요청 한도 대기: {wait:.1f}초")
+            time.sleep(wait)
+
+    def update_from_headers(self, bucket, headers, status_code=None):
+        """
+        응답 헤더로 서버 측 사용량을 반영
+
+        Args:
+            bucket (str): 버킷 이름
+            headers (Mapping): 응답 헤더
+            status_code (int): HTTP 상태 코드
+        """
+        now = time.time()
+        usage_pct = None
+        block_seconds = 0.0
+
+        # Graph API 앱 사용량: {"call_count": 28, "total_time": 25, "total_cputime": 25}
+        app_usage = self._parse_json_header(headers.get("X-App-Usage"))
+        if isinstance(app_usage, dict):
+            usage_pct = max([float(v) for v in app_usage.values() if isinstance(v, (int, float))] or [0])
+
+        # 비즈니스 사용 사례 사용량: {"<id>": [{"call_count": .., "estimated_time_to_regain_access": 분}]}
+        buc_usage = self._parse_json_header(headers.get("X-Business-Use-Case-Usage"))
+        if isinstance(buc_usage, dict):
+            for entries in buc_usage.values():
+                for entry in entries if isinstance(entries, list) else []:
+                    values = [float(entry.get(k, 0)) for k in ("call_count", "total_cputime", "total_time")]
+                    usage_pct = max([usage_pct or 0] + values)
+                    block_seconds = max(block_seconds, float(entry.get("estimated_time_to_regain_access", 0)) * 60)
+
+        # Laravel 등 일반 API의 한도 헤더
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit() and int(remaining) == 0:
+            block_seconds = max(block_seconds, self._retry_after(headers, default=60))
+
+        if status_code == 429:
+            block_seconds = max(block_seconds, self._retry_after(headers, default=60))
+
+        if usage_pct is None and block_seconds == 0:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                tokens, updated_at, blocked_until, previous_usage = self._load_state(conn, bucket, now)
+                if block_seconds > 0:
+                    blocked_until = max(blocked_until, now + block_seconds)
+                    tokens = 0.0
+                    self.logger.warning(f"[{bucket}] 요청 한도 도달 - {block_seconds:.0f}초 동안 요청을 보류합니다.")
+                self._save_state(
+                    conn, bucket, tokens, updated_at, blocked_until,
+                    usage_pct if usage_pct is not None else previous_usage
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.logger.error(f"속도 제한 상태 갱신 오류: {e}")
+            finally:
+                conn.close()
+
+    def _parse_json_header(self, value):
+        if not value:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def _retry_after(self, headers, default):
+        value = headers.get("Retry-After")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def sync_quota(self, bucket, used, total):
+        """
+        서버가 알려준 사용량/한도로 버킷 잔여 토큰을 맞춤 (예: 콘텐츠 게시 한도 조회 결과)
+
+        Args:
+            bucket (str): 버킷 이름
+            used (int): 현재 기간 사용량
+            total (int): 기간당 한도
+        """
+        now = time.time()
+        capacity, _ = self._bucket_config(bucket)
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                tokens, updated_at, blocked_until, _ = self._load_state(conn, bucket, now)
+                tokens = min(tokens, max(0.0, min(capacity, float(total)) - used))
+                usage_pct = used / total * 100 if total else 0.0
+                self._save_state(conn, bucket, tokens, updated_at, blocked_until, usage_pct)
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.logger.error(f"속도 제한 상태 갱신 오류: {e}")
+            finally:
+                conn.close()
+
+    def get_quota_status(self):
+        """
+        버킷별 현재 상태 조회
+
+        Returns:
+            dict: {버킷: {"tokens": .., "capacity": .., "usage_pct": .., "blocked_for": 초}}
+        """
+        now = time.time()
+        status = {}
+        conn = self._connect()
+        try:
+            for bucket in self.limits:
+                tokens, _, blocked_until, usage_pct = self._load_state(conn, bucket, now)
+                capacity, _ = self._bucket_config(bucket)
+                status[bucket] = {
+                    "tokens": round(tokens, 2),
+                    "capacity": capacity,
+                    "usage_pct": usage_pct,
+                    "blocked_for": max(0.0, blocked_until - now),
+                }
+        finally:
+            conn.close()
+        return status
@@ -0,0 +1,234 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from utils.logger_util import LoggerUtil
+
+load_dotenv()
+
+class StorageError(Exception):
+    """스토리지 저장 관련 커스텀 예외"""
+    pass
+
+def content_key(path, prefix='cards'):
+    """
+    파일 내용의 SHA-256으로 저장 키 생성 (같은 내용은 항상 같은 키 → 중복 저장 방지)
+
+    Args:
+        path (str): 파일 경로
+        prefix (str): 키 앞에 붙일 경로
+
+    Returns:
+        str: 예) cards/ab/ab12...ef.jpeg
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    hex_digest = digest.hexdigest()
+    extension = os.path.splitext(path)[1].lower() or '.bin'
+    return f"{prefix}/{hex_digest[:2]}/{hex_digest}{extension}"
+
+class BaseStorage:
+    """
+    렌더링된 카드를 공개 URL로 제공하는 저장소의 공통 인터페이스
+
+    put_file()은 내용 해시를 키로 저장하므로 같은 카드를 다시 올리면 전송하지 않는다.
+    반환값의 committed가 True이면 저장이 끝나 URL로 바로 읽을 수 있음을 보장한다
+    (인스타그램 게시 전 HEAD 확인을 생략할 수 있음).
+    """
+
+    def __init__(self, public_base_url=None, max_workers=None):
+        """
+        Args:
+            public_base_url (str): 저장된 키 앞에 붙일 공개 URL (기본값: STORAGE_PUBLIC_URL)
+            max_workers (int): put_files()의 동시 업로드 수 (기본값: STORAGE_MAX_WORKERS 또는 4)
+        """
+        public_base_url = public_base_url or os.getenv("STORAGE_PUBLIC_URL")
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self.max_workers = max_workers or int(os.getenv("STORAGE_MAX_WORKERS", "4"))
+        self.logger = LoggerUtil().get_logger()
+
+    def public_url(self, key):
+        """키에 해당하는 공개 URL, 공개 URL이 설정되지 않았으면 None"""
+        if not self.public_base_url:
+            return None
+        return f"{self.public_base_url}/{key}"
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def _write(self, path, key, content_type):
+        raise NotImplementedError
+
+    def put_file(self, path, prefix='cards'):
+        """
+        파일을 내용 해시 키로 저장
+
+        Args:
+            path (str): 저장할 파일 경로
+            prefix (str): 키 앞에 붙일 경로
+
+        Returns:
+            dict: {"key": ..., "url": ..., "committed": True, "deduplicated": bool}
+
+        Raises:
+            StorageError: 저장에 실패한 경우
+        """
+        key = content_key(path, prefix)
+        if self.exists(key):
+            self.logger.info(f"스토리지에 같은 내용이 이미 있어 업로드를 건너뜁니다: {key}")
+            deduplicated = True
+        else:
+            content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            self._write(path, key, content_type)
+            self.logger.info(f"스토리지 저장 완료: {key}")
+            deduplicated = False
+
+        return {
+            "key": key,
+            "url": self.public_url(key),
+            "committed": True,
+            "deduplicated": deduplicated
+        }
+
+    def put_files(self, paths, prefix='cards'):
+        """
+        여러 파일을 동시에 저장
+
+        Args:
+            paths (list): 저장할 파일 경로 목록
+            prefix (str): 키 앞에 붙일 경로
+
+        Returns:
+            list: 파일별 put_file() 결과 (실패한 파일은 {"error": "..."})
+        """
+        def put(path):
+            try:
+                return self.put_file(path, prefix)
+            except (StorageError, OSError) as e:
+                self.logger.error(f"스토리지 저장 실패: {path} - {e}")
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(put, paths))
+
+class LocalStorage(BaseStorage):
+    """
+    로컬 디렉토리 저장소 (웹 서버가 이 디렉토리를 STORAGE_PUBLIC_URL로 제공하는 구성,
+    또는 테스트용 오브젝트 스토리지 대용)
+    """
+
+    def __init__(self, root=None, public_base_url=None, max_workers=None):
+        """
+        Args:
+            root (str): 저장 디렉토리 (기본값: STORAGE_LOCAL_ROOT 또는 output/storage)
+        """
+        super().__init__(public_base_url, max_workers)
+        root = root or os.getenv("STORAGE_LOCAL_ROOT") or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output', 'storage'
+        )
+        self.root = os.path.abspath(root)
+
+    def exists(self, key):
+        return os.path.exists(os.path.join(self.root, key))
+
+    def _write(self, path, key, content_type):
+        target = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # 임시 파일에 복사한 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(path, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f"로컬 스토리지 저장 실패: {key} - {e}")
+
+class S3Storage(BaseStorage):
+    """
+    S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등, boto3 필요)
+
+    큰 파일은 boto3 전송 관리자가 멀티파트로 나눠 병렬 업로드한다.
+    S3는 PUT 완료 후 바로 읽기가 보장되므로 저장 결과는 committed로 표시한다.
+    """
+
+    def __init__(self, bucket=None, endpoint_url=None, public_base_url=None, max_workers=None):
+        """
+        Args:
+            bucket (str): 버킷 이름 (기본값: STORAGE_S3_BUCKET)
+            endpoint_url (str): S3 호환 엔드포인트, MinIO 등 (기본값: STORAGE_S3_ENDPOINT, 없으면 AWS)
+        """
+        super().__init__(public_base_url, max_workers)
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise StorageError("S3 스토리지를 사용하려면 boto3를 설치해주세요.")
+
+        self.bucket = bucket or os.getenv("STORAGE_S3_BUCKET")
+        if not self.bucket:
+            raise StorageError("STORAGE_S3_BUCKET이 설정되지 않았습니다. .env 파일을 확인해주세요.")
+
+        endpoint_url = endpoint_url or os.getenv("STORAGE_S3_ENDPOINT")
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            region_name=os.getenv("STORAGE_S3_REGION"),
+            aws_access_key_id=os.getenv("STORAGE_S3_ACCESS_KEY"),
+            aws_secret_access_key=os.getenv("STORAGE_S3_SECRET_KEY")
+        )
+        part_size = int(os.getenv("STORAGE_S3_PART_MB", "8")) * 1024 * 1024
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=self.max_workers
+        )
+        self._client_error = ClientError
+
+        if not self.public_base_url:
+            base = (endpoint_url or f"https://{self.bucket}.s3.amazonaws.com").rstrip("/")
+            self.public_base_url = f"{base}/{self.bucket}" if endpoint_url else base
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except self._client_error as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise StorageError(f"S3 객체 확인 실패: {key} - {e}")
+
+    def _write(self, path, key, content_type):
+        try:
+            self.client.upload_file(
+                path,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type, "CacheControl": "public, max-age=31536000, immutable"},
+                Config=self.transfer_config
+            )
+        except self._client_error as e:
+            raise StorageError(f"S3 업로드 실패: {key} - {e}")
+
+def get_storage():
+    """
+    STORAGE_BACKEND 환경 변수에 맞는 저장소 생성
+
+    Returns:
+        BaseStorage: 'local' 또는 's3' 저장소, 설정되지 않았으면 None
+    """
+    backend = os.getenv("STORAGE_BACKEND", "").lower()
+    if not backend:
+        return None
+    if backend == 'local':
+        return LocalStorage()
+    if backend == 's3':
+        return S3Storage()
+    raise StorageError(f"지원하지 않는 STORAGE_BACKEND입니다: {backend}")
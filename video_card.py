@@ -0,0 +1,241 @@
+import os
+import tempfile
+from utils.logger_util import LoggerUtil
+from portrait_pyramid import PYRAMID_SIZES
+
+# 기본 영상 설정 (VIDEO_FPS, VIDEO_DURATION 환경 변수로 변경)
+DEFAULT_FPS = 30
+DEFAULT_DURATION = 10.0
+
+# 영상 끝에서의 인물 이미지 확대 배율
+ZOOM_END = 1.08
+
+# 줄별 등장 시점: 첫 줄은 REVEAL_START초에 시작해 FADE_SECONDS초 동안 나타나고,
+# 저자까지 모든 줄이 영상 길이의 REVEAL_WINDOW 비율 안에 나타나도록 간격을 정한다
+REVEAL_START = 0.5
+FADE_SECONDS = 0.5
+REVEAL_WINDOW = 0.6
+MAX_REVEAL_INTERVAL = 0.8
+
+# 시도할 코덱 순서 (H.264 인코더가 없는 OpenCV 빌드는 MPEG-4 Part 2로 저장)
+DEFAULT_FOURCC = "avc1,mp4v"
+
+class TextLayer:
+    """
+    미리 그려 둔 텍스트 한 줄 (그림자 포함)
+
+    카드 좌표의 영역(top, left)과 함께 투과율(transmit)과 더할 색(color)을 저장해,
+    배경 픽셀에 background * transmit + color 로 합성한다.
+    """
+    __slots__ = ("top", "left", "transmit", "color")
+
+    def __init__(self, top, left, transmit, color):
+        self.top = top
+        self.left = left
+        self.transmit = transmit
+        self.color = color
+
+    @property
+    def bottom(self):
+        return self.top + self.transmit.shape[0]
+
+    @property
+    def right(self):
+        return self.left + self.transmit.shape[1]
+
+class VideoCardRenderer:
+    """
+    릴스용 영상 카드 렌더러 (명언 줄별 등장 + 인물 이미지 천천히 확대)
+
+    배경(확대용 큰 인물 이미지)과 텍스트 줄 레이어는 한 번만 만들어 두고, 프레임마다
+    배경을 확대 배율에 맞게 변환한 뒤 텍스트 영역에만 레이어를 합성한다. 다 나타난 줄은
+    누적 레이어에 합쳐 두므로 프레임당 합성 비용은 줄 수와 관계없이 거의 일정하다.
+    텍스트 배치와 그림자는 ImageProcessor.create_card와 같다.
+    """
+
+    def __init__(self, image_processor, fps=None, duration=None):
+        """
+        Args:
+            image_processor (ImageProcessor): 카드 크기, 텍스트 배치, 인물 이미지 피라미드를 제공
+            fps (int): 초당 프레임 수 (기본값: VIDEO_FPS 또는 30)
+            duration (float): 영상 길이(초) (기본값: VIDEO_DURATION 또는 10)
+        """
+        self.image_processor = image_processor
+        self.fps = fps or int(os.getenv("VIDEO_FPS", str(DEFAULT_FPS)))
+        self.duration = duration or float(os.getenv("VIDEO_DURATION", str(DEFAULT_DURATION)))
+        self.fourccs = [code.strip() for code in os.getenv("VIDEO_FOURCC", DEFAULT_FOURCC).split(",") if code.strip()]
+        self.logger = LoggerUtil().get_logger()
+        self._codec_warned = False
+
+    def render(self, image_path, wisdom_quote, author, output_path):
+        """
+        영상 카드를 MP4로 저장 (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            image_path (str): 인물 이미지 경로
+            wisdom_quote (str): 명언
+            author (str): 저자 표기
+            output_path (str): 저장할 .mp4 경로
+
+        Returns:
+            dict: {"path": 저장 경로, "frames": 프레임 수, "codec": 사용한 코덱}
+        """
+        import cv2
+        import numpy as np
+
+        size = self.image_processor.card_size
+        base = self._zoom_base(image_path)
+        layers = self._text_layers(image_path, wisdom_quote, author)
+        starts = self._reveal_times(len(layers))
+
+        # 텍스트가 있는 영역만 합성 (다 나타난 줄은 settled_*에 누적)
+        top = min(layer.top for layer in layers)
+        left = min(layer.left for layer in layers)
+        bottom = max(layer.bottom for layer in layers)
+        right = max(layer.right for layer in layers)
+        settled_transmit = np.ones((bottom - top, right - left, 1), np.float32)
+        settled_color = np.zeros((bottom - top, right - left, 1), np.float32)
+        settled = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix='.mp4')
+        os.close(fd)
+        frame_count = int(round(self.fps * self.duration))
+        writer, codec = self._open_writer(tmp_path, size)
+        try:
+            for index in range(frame_count):
+                t = index / self.fps
+                frame = self._background_frame(base, t)
+
+                # 등장이 끝난 줄은 누적 레이어에 합침
+                while settled < len(layers) and t >= starts[settled] + FADE_SECONDS:
+                    layer = layers[settled]
+                    region = (slice(layer.top - top, layer.bottom - top), slice(layer.left - left, layer.right - left))
+                    settled_color[region] = settled_color[region] * layer.transmit + layer.color
+                    settled_transmit[region] *= layer.transmit
+                    settled += 1
+
+                fading = [
+                    (layers[i], (t - starts[i]) / FADE_SECONDS)
+                    for i in range(settled, len(layers)) if t > starts[i]
+                ]
+                if settled or fading:
+                    view = frame[top:bottom, left:right]
+                    if view.ndim == 2:
+                        view = view[..., None]
+                    region = view.astype(np.float32)
+                    if settled:
+                        region = region * settled_transmit + settled_color
+                    for layer, opacity in fading:
+                        sub = region[layer.top - top:layer.bottom - top, layer.left - left:layer.right - left]
+                        sub *= 1.0 - opacity * (1.0 - layer.transmit)
+                        sub += opacity * layer.color
+                    view[...] = np.clip(region + 0.5, 0, 255).astype(np.uint8)
+
+                writer.write(frame if frame.ndim == 3 else cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+        except Exception:
+            writer.release()
+            os.remove(tmp_path)
+            raise
+        writer.release()
+        os.replace(tmp_path, output_path)
+
+        self.logger.info(f"영상 카드 저장 완료: {output_path} ({frame_count}프레임, {codec})")
+        return {"path": output_path, "frames": frame_count, "codec": codec}
+
+    def _reveal_times(self, count):
+        """줄별 등장 시작 시각(초)"""
+        window = self.duration * REVEAL_WINDOW - REVEAL_START - FADE_SECONDS
+        interval = min(MAX_REVEAL_INTERVAL, max(0.0, window) / max(1, count - 1))
+        return [REVEAL_START + i * interval for i in range(count)]
+
+    def _zoom_base(self, image_path):
+        """
+        확대 끝 배율에서도 원본 해상도로 보이도록 카드보다 ZOOM_END배 큰 어두운 인물 배경
+
+        피라미드에 그보다 큰 단계가 있으면 그 단계를 축소해 쓰고, 없으면 카드 크기 이미지를 확대한다.
+        흑백 인물 이미지는 한 채널로 유지해 프레임마다의 변환/합성 비용을 1/3로 줄인다 (저장할 때만 BGR로 변환).
+        """
+        import cv2
+        import numpy as np
+
+        size = self.image_processor.card_size
+        target = int(round(size * ZOOM_END))
+        source = None
+        for level in PYRAMID_SIZES:
+            if level < target:
+                continue
+            level_path = self.image_processor.pyramid.resolve(image_path, level)
+            if level_path:
+                source = cv2.imread(level_path, cv2.IMREAD_UNCHANGED)
+                if source is not None:
+                    break
+        if source is None:
+            portrait = self.image_processor._open_portrait(image_path)
+            if portrait.mode == 'L':
+                source = np.asarray(portrait)
+            else:
+                source = cv2.cvtColor(np.asarray(portrait.convert('RGB')), cv2.COLOR_RGB2BGR)
+
+        if source.ndim == 3 and source.shape[2] == 4:
+            source = cv2.cvtColor(source, cv2.COLOR_BGRA2BGR)
+        if source.ndim == 3 and (source[..., 0] == source[..., 1]).all() and (source[..., 1] == source[..., 2]).all():
+            source = source[..., 0].copy()
+
+        interpolation = cv2.INTER_AREA if source.shape[1] > target else cv2.INTER_CUBIC
+        base = cv2.resize(source, (target, target), interpolation=interpolation)
+        # 카드와 같은 반투명(alpha 128) 검은 레이어
+        return ((base.astype(np.uint16) * 127 + 127) // 255).astype(np.uint8)
+
+    def _background_frame(self, base, t):
+        """t초의 확대 배율로 배경을 카드 크기로 변환 (소수 픽셀 단위로 움직여 떨림 없음)"""
+        import cv2
+        import numpy as np
+
+        size = self.image_processor.card_size
+        zoom = 1.0 + (ZOOM_END - 1.0) * min(1.0, t / self.duration)
+        # 배율 1에서는 큰 배경 전체, ZOOM_END에서는 가운데 카드 크기 영역이 화면을 채움
+        scale = zoom * size / base.shape[1]
+        offset = (size - base.shape[1] * scale) / 2
+        matrix = np.float32([[scale, 0, offset], [0, scale, offset]])
+        return cv2.warpAffine(base, matrix, (size, size), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    def _text_layers(self, image_path, wisdom_quote, author):
+        """create_card와 같은 배치로 줄별 텍스트 레이어 생성"""
+        import numpy as np
+        from PIL import Image, ImageDraw
+
+        size = self.image_processor.card_size
+        shadow = max(1, round(2 * self.image_processor.scale))
+        layers = []
+        for text, font, (x, y) in self.image_processor.layout_text(image_path, wisdom_quote, author):
+            bbox = font.getbbox(text)
+            # 그리는 좌표가 음수가 되면 소수 위치가 카드와 다르게 반올림되므로 원점보다 앞에서 시작
+            left = max(0, min(int(x), int(x + bbox[0]) - 1))
+            top = max(0, min(int(y), int(y + bbox[1]) - 1))
+            right = min(size, int(x + bbox[2] + shadow) + 2)
+            bottom = min(size, int(y + bbox[3] + shadow) + 2)
+
+            # 그림자와 글자의 커버리지 마스크 (create_card에서 그림자는 불투명한 검은색으로 합성됨)
+            shadow_mask = Image.new('L', (right - left, bottom - top), 0)
+            ImageDraw.Draw(shadow_mask).text((x + shadow - left, y + shadow - top), text, fill=255, font=font)
+            text_mask = Image.new('L', (right - left, bottom - top), 0)
+            ImageDraw.Draw(text_mask).text((x - left, y - top), text, fill=255, font=font)
+
+            shadow_alpha = np.asarray(shadow_mask, np.float32)[..., None] / 255.0
+            text_alpha = np.asarray(text_mask, np.float32)[..., None] / 255.0
+            layers.append(TextLayer(top, left, (1.0 - shadow_alpha) * (1.0 - text_alpha), text_alpha * 255.0))
+        return layers
+
+    def _open_writer(self, path, size):
+        import cv2
+
+        for fourcc in self.fourccs:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), self.fps, (size, size))
+            if writer.isOpened():
+                if fourcc != self.fourccs[0] and not self._codec_warned:
+                    self._codec_warned = True
+                    self.logger.warning(f"{self.fourccs[0]} 코덱을 사용할 수 없어 {fourcc}로 저장합니다 (인스타그램 릴스는 H.264 권장)")
+                return writer, fourcc
+            writer.release()
+        raise RuntimeError(f"영상 인코더를 열 수 없습니다 (시도한 코덱: {', '.join(self.fourccs)})")
@@ -0,0 +1,109 @@
+import sqlite3
+import threading
+from utils.logger_util import LoggerUtil
+
+class WisdomRecord:
+    """
+    명언 한 건 (스냅샷의 레코드는 여러 작업이 공유하므로 읽기 전용으로 사용)
+
+    카드와 캡션에 쓰는 저자 표기(author)는 생성 시 한 번만 만든다.
+    """
+    __slots__ = ("idx", "name_en", "name_kr", "wisdom_kr", "wisdom_en", "open_yn", "author")
+
+    def __init__(self, idx, name_en, name_kr, wisdom_kr, wisdom_en, open_yn=1):
+        self.idx = idx
+        self.name_en = name_en
+        self.name_kr = name_kr
+        self.wisdom_kr = wisdom_kr
+        self.wisdom_en = wisdom_en
+        self.open_yn = open_yn
+        self.author = f"{name_kr} {name_en}"
+
+    def __repr__(self):
+        return f"{type(self).__name__}(idx={self.idx}, name_en={self.name_en!r})"
+
+class PlanItem(WisdomRecord):
+    """게시 계획 항목 (명언 + 계획 번호와 사용할 인물 이미지)"""
+    __slots__ = ("plan_seq", "image_path")
+
+    def __init__(self, plan_seq, image_path, record):
+        """
+        Args:
+            plan_seq (int): 게시 계획 번호 (계획 밖의 항목이면 None)
+            image_path (str): 인물 이미지 경로
+            record (WisdomRecord): 명언
+        """
+        super().__init__(record.idx, record.name_en, record.name_kr, record.wisdom_kr, record.wisdom_en, record.open_yn)
+        self.plan_seq = plan_seq
+        self.image_path = image_path
+
+class WisdomSnapshot:
+    """
+    wisdom_list의 읽기 전용 메모리 스냅샷 (명언 번호 → WisdomRecord)
+
+    전용 연결 하나를 열어 두고 조회할 때마다 PRAGMA data_version으로 다른 연결의 커밋 여부를
+    확인한다. data_version은 DB의 어느 테이블이 바뀌어도 달라지므로(임대, 속도 제한 상태 등),
+    그때는 트리거가 명언 텍스트/공개 여부 변경 시에만 올리는 wisdom_revision 값을 한 번 더 확인해
+    실제로 바뀐 경우에만 다시 읽는다.
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path (str): wisdom_list와 wisdom_revision이 있는 DB 경로
+        """
+        self.db_path = db_path
+        self.logger = LoggerUtil().get_logger()
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._revision = None
+        self._records = {}
+
+    def _refresh(self):
+        """다른 연결에서 명언이 바뀌었으면 다시 읽음 (self._lock을 잡은 상태에서 호출)"""
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            revision = self._conn.execute("SELECT revision FROM wisdom_revision").fetchone()[0]
+            if revision != self._revision:
+                rows = self._conn.execute(
+                    "SELECT idx, name_en, name_kr, wisdom_kr, wisdom_en, open_yn FROM wisdom_list"
+                ).fetchall()
+                self._records = {row[0]: WisdomRecord(*row) for row in rows}
+                self._revision = revision
+            self._data_version = data_version
+        except sqlite3.Error as e:
+            # 확인에 실패하면 기존 스냅샷을 그대로 쓰고 다음 조회에서 다시 확인
+            self.logger.error(f"명언 스냅샷 갱신 오류: {e}")
+            self._data_version = None
+
+    def get(self, idx):
+        """
+        명언 조회
+
+        Args:
+            idx (int): 명언 번호
+
+        Returns:
+            WisdomRecord: 명언, 없으면 None
+        """
+        with self._lock:
+            self._refresh()
+            return self._records.get(idx)
+
+    def records(self):
+        """전체 명언 목록 (idx 순)"""
+        with self._lock:
+            self._refresh()
+            return [self._records[idx] for idx in sorted(self._records)]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._data_version = None